@@ -0,0 +1,73 @@
+"""
+Benchmark: AclMatcher vs. a linear fnmatch scan.
+
+    python benchmarks/bench_acl.py --rules 10000 --checks 100000
+"""
+import argparse
+import random
+import time
+from fnmatch import fnmatchcase
+
+from gap.core.acl import AclMatcher
+
+
+def make_rules(n: int):
+    rules = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            rules.append(f"src/module_{i}/main.py")
+        elif kind == 1:
+            rules.append(f"src/module_{i}/*.py")
+        elif kind == 2:
+            rules.append(f"docs/section_{i}/**")
+        else:
+            rules.append(f"tests/unit_{i}/")
+    rules += ["walkthrough.md", "**/*.lock"]
+    return rules
+
+
+def make_paths(n: int, rules: int):
+    rng = random.Random(0)
+    paths = []
+    for _ in range(n):
+        i = rng.randrange(rules * 2)  # ~half outside any rule
+        paths.append(rng.choice([
+            f"src/module_{i}/main.py",
+            f"src/module_{i}/util.py",
+            f"docs/section_{i}/a/b.md",
+            f"tests/unit_{i}/test_x.py",
+            f"build/out_{i}/artifact.bin",
+        ]))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=100000)
+    parser.add_argument("--naive-checks", type=int, default=1000, help="Checks for the fnmatch baseline.")
+    args = parser.parse_args()
+
+    rules = make_rules(args.rules)
+    paths = make_paths(args.checks, args.rules)
+
+    start = time.perf_counter()
+    matcher = AclMatcher(rules)
+    print(f"compile {len(rules)} rules     {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    allowed = sum(1 for p in paths if p in matcher)
+    elapsed = time.perf_counter() - start
+    print(f"AclMatcher {len(paths)} checks {elapsed:8.3f}s  ({len(paths) / elapsed:,.0f}/s, {allowed} allowed)")
+
+    sample = paths[:args.naive_checks]
+    start = time.perf_counter()
+    for p in sample:
+        any(fnmatchcase(p, r) for r in rules)
+    elapsed = time.perf_counter() - start
+    print(f"fnmatch scan {len(sample)} checks {elapsed:8.3f}s  ({len(sample) / elapsed:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: checkpoint verification against a large plan and ledger.
+
+    python benchmarks/bench_checkpoint.py --tasks 2000 --checks 200000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from gap.core.checkpoint import CheckpointVerifier, checkpoint_key
+
+PHASES = ["before_start", "after_completion"]
+
+
+def setup(root: Path, tasks: int):
+    (root / ".gap").mkdir()
+    plan = {f"T-{i}": {"checkpoints": PHASES[: i % 3], "model": "local"} for i in range(tasks)}
+    (root / ".gap/plan.yaml").write_text(yaml.safe_dump({"plan": plan}))
+    steps = {
+        checkpoint_key(f"T-{i}", "before_start"): {"status": "complete", "approver": "user", "timestamp": None}
+        for i in range(0, tasks, 2)
+    }
+    (root / ".gap/status.yaml").write_text(yaml.safe_dump({"steps": steps}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--checks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    checks = [(f"T-{rng.randrange(args.tasks)}", rng.choice(PHASES)) for _ in range(args.checks)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        setup(root, args.tasks)
+        verifier = CheckpointVerifier(root)
+
+        t0 = time.perf_counter()
+        verifier.verify("T-0", "before_start")
+        cold = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        single = sum(1 for task_id, phase in checks if verifier.verify(task_id, phase).allowed)
+        elapsed_single = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        bulk = sum(1 for v in verifier.verify_many(checks) if v.allowed)
+        elapsed_bulk = time.perf_counter() - t0
+        assert bulk == single
+
+        print(f"plan + ledger load: {cold * 1000:8.1f} ms ({args.tasks} tasks)")
+        print(f"verify():           {args.checks / elapsed_single:,.0f} checks/s ({single} allowed)")
+        print(f"verify_many():      {args.checks / elapsed_bulk:,.0f} checks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: proposal vs live diff of a large artifact (`gap gate diff`).
+
+    python benchmarks/bench_diff.py --mb 10 --edits 50 [--difflib]
+"""
+import argparse
+import difflib
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from gap.core.diff import diff_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=10, help="artifact size in MB")
+    parser.add_argument("--edits", type=int, default=50, help="scattered line edits in the proposal")
+    parser.add_argument("--difflib", action="store_true", help="also time difflib.unified_diff (slow)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    lines = []
+    size = 0
+    while size < args.mb * 1024 * 1024:
+        line = f"- R-{len(lines):06d}: THE system SHALL handle case {rng.randint(0, 10 ** 6)}.\n"
+        lines.append(line)
+        size += len(line)
+    edited = list(lines)
+    for _ in range(args.edits):
+        i = rng.randrange(len(edited))
+        edited[i] = edited[i].replace("SHALL", "MUST")
+        edited.insert(rng.randrange(len(edited)), "- NEW: inserted requirement\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        live, proposal, same = Path(tmp, "live.md"), Path(tmp, "proposal.md"), Path(tmp, "same.md")
+        live.write_text("".join(lines))
+        same.write_text("".join(lines))
+        proposal.write_text("".join(edited))
+        print(f"{len(lines)} lines, {live.stat().st_size / 1e6:.1f} MB, {args.edits} edits")
+
+        def timed(label, fn):
+            t0 = time.perf_counter()
+            result = fn()
+            print(f"{label:<32} {(time.perf_counter() - t0) * 1000:8.1f} ms")
+            return result
+
+        timed("identical (hash short-circuit)", lambda: diff_files(live, same))
+        one = list(lines)
+        one[len(one) // 2] = "- CHANGED\n"
+        proposal.write_text("".join(one))
+        timed("one edit (prefix/suffix trim)", lambda: list(diff_files(live, proposal).unified("a", "b")))
+        proposal.write_text("".join(edited))
+        result = timed("scattered edits", lambda: diff_files(live, proposal))
+        output = timed("render hunks", lambda: list(result.unified("a", "b")))
+        print(f"  -> +{result.added} -{result.removed}, {len(output)} output lines")
+
+        if args.difflib:
+            timed("difflib.unified_diff", lambda: list(difflib.unified_diff(lines, edited)))
+
+
+if __name__ == "__main__":
+    main()
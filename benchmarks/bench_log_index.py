@@ -0,0 +1,62 @@
+"""
+Benchmark: `gap log` index build, incremental update and filtered queries.
+
+    python benchmarks/bench_log_index.py --entries 1000000
+"""
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from gap.core.log_index import LogIndex
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<24} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def write_log(path: Path, start: int, count: int):
+    base = datetime(2026, 1, 1)
+    with open(path, "a") as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({
+                "type": "human_interaction" if i % 50 == 0 else "llm_interaction",
+                "task_id": f"T-{i % 200}",
+                "session_id": f"s{i // 100000}",
+                "prompt": "Implement the task within the approved ACL " * 3,
+                "response": "def main():\n    pass\n" * 4,
+                "timestamp": (base + timedelta(milliseconds=i)).isoformat(),
+            }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+        path = log_dir / "bench.log.jsonl"
+        write_log(path, 0, args.entries)
+        print(f"Log: {args.entries} entries, {path.stat().st_size / 1e6:.0f} MB")
+
+        index = LogIndex(log_dir)
+        timed("initial index", index.update)
+        timed("no-op update", index.update)
+        write_log(path, args.entries, 1000)
+        timed("append 1000 + update", index.update)
+
+        timed("query task (all)", lambda: sum(1 for _ in index.query(task_id="T-7")))
+        timed("query type (limit 100)", lambda: list(index.query(type="human_interaction", limit=100)))
+        since = datetime(2026, 1, 1) + timedelta(milliseconds=args.entries // 2)
+        timed("query time window", lambda: list(index.query(since=since, until=since + timedelta(seconds=1))))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
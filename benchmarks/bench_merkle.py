@@ -0,0 +1,49 @@
+"""
+Benchmark: Merkle integrity check of a large artifact tree.
+
+    python benchmarks/bench_merkle.py --files 20000 --fanout 50
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from gap.core.manifest import Step
+from gap.core.merkle import MerkleTree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--fanout", type=int, default=50, help="files per directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(args.files):
+            path = root / f"src/pkg_{i // args.fanout // args.fanout}/sub_{i // args.fanout}/mod_{i}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"value = {i}\n" * 20)
+        step = Step(step="implementation", artifact="src")
+
+        def timed(label, fn):
+            t0 = time.perf_counter()
+            result = fn()
+            print(f"{label:<30} {(time.perf_counter() - t0) * 1000:8.1f} ms")
+            return result
+
+        tree = MerkleTree(root)
+        timed("seal (hash everything)", lambda: tree.seal(step))
+        timed("save", tree.save)
+        tree = timed("load", lambda: MerkleTree.load(root))
+        timed("verify, unchanged", tree.verify)
+        timed("verify --deep, unchanged", lambda: tree.verify(deep=True))
+
+        (root / "src/pkg_1/sub_60/mod_3010.py").write_text("tampered\n")
+        result = timed("verify, one file modified", tree.verify)
+        print(f"  -> modified={result.modified} rehashed={result.rehashed} dirs visited={result.visited}")
+        timed("reseal one change", lambda: tree.seal(step))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: in-process can_write() decisions against a phase ACL.
+
+    python benchmarks/bench_policy.py --decisions 1000000 --paths 5000 --rules 200
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from gap.core.policy import PolicyEngine
+
+MANIFEST = """
+kind: project
+name: bench
+version: 0.1.0
+description: Bench
+flow:
+  - class: alignment
+    steps:
+      - step: requirements
+        artifact: docs/requirements.md
+  - class: execution
+    steps:
+      - step: execution
+        artifact: docs/walkthrough.md
+        needs: [requirements]
+"""
+
+
+def setup(root: Path, rules: int):
+    (root / "manifest.yaml").write_text(MANIFEST)
+    (root / "docs").mkdir()
+    (root / "docs/requirements.md").write_text("# Req")
+    (root / ".gap/acls").mkdir(parents=True)
+    lines = ["allow_write:"]
+    for i in range(rules):
+        lines.append(f'  - "src/pkg_{i}/**/*.py"' if i % 2 else f"  - src/mod_{i}.py")
+    (root / ".gap/acls/execution.yaml").write_text("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--decisions", type=int, default=1_000_000)
+    parser.add_argument("--paths", type=int, default=5000, help="distinct paths checked")
+    parser.add_argument("--rules", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    paths = [
+        f"src/pkg_{rng.randrange(args.rules)}/sub/file_{i}.py" if i % 3 else f"src/mod_{rng.randrange(args.rules)}.py"
+        for i in range(args.paths)
+    ]
+    workload = [paths[rng.randrange(len(paths))] for _ in range(args.decisions)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        setup(root, args.rules)
+        engine = PolicyEngine(root)
+
+        t0 = time.perf_counter()
+        engine.current_phase()
+        cold = time.perf_counter() - t0
+
+        can_write = engine.can_write
+        t0 = time.perf_counter()
+        allowed = sum(1 for p in workload if can_write(p))
+        elapsed = time.perf_counter() - t0
+
+        print(f"snapshot build:     {cold * 1000:8.1f} ms (phase={engine.current_phase()})")
+        print(f"decisions:          {args.decisions} over {args.paths} paths, {allowed} allowed")
+        print(f"throughput:         {args.decisions / elapsed:,.0f} decisions/s ({elapsed / args.decisions * 1e9:.0f} ns each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: ContextManager.generate_repo_map on a synthetic repository.
+
+    python benchmarks/bench_repo_map.py --files 20000
+
+Reports cold (empty cache), warm (nothing changed) and incremental (one file
+touched) timings, plus symbol index sync and query latency.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+
+from gated_agent_tui.agent.context import ContextManager  # noqa: E402
+
+MODULE = '''
+class Service{i}:
+    def __init__(self, name):
+        self.name = name
+
+    def run(self, payload, retries=3):
+        return payload
+
+def helper_{i}(x, y):
+    return x + y
+'''
+
+
+def build_tree(root: Path, files: int, per_dir: int = 50):
+    for i in range(files):
+        d = root / f"pkg_{i // per_dir}"
+        d.mkdir(exist_ok=True)
+        (d / f"mod_{i}.py").write_text(MODULE.format(i=i))
+    # Noise the walk should prune without descending
+    (root / "__pycache__").mkdir()
+    (root / ".gap").mkdir(exist_ok=True)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<14} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_tree(root, args.files)
+        print(f"Repository: {args.files} files")
+
+        repo_map = timed("cold", lambda: ContextManager(root).generate_repo_map())
+        timed("warm", lambda: ContextManager(root).generate_repo_map())
+
+        target = root / "pkg_0/mod_0.py"
+        target.write_text(target.read_text() + "\nclass Extra:\n    def go(self):\n        pass\n")
+        timed("incremental", lambda: ContextManager(root).generate_repo_map())
+
+        cm = ContextManager(root)
+        timed("index sync", cm.sync_index)
+        hits = timed("query", lambda: cm.sync_index().search("Service42 run payload", limit=10))
+        timed("query (hot)", lambda: cm._index.search("helper_7 retries", limit=10))
+
+        print(f"Map size: {len(repo_map) / 1024:.0f} KiB, top hit: {hits[0]['name'] if hits else None}")
+
+
+if __name__ == "__main__":
+    main()
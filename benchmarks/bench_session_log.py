@@ -0,0 +1,58 @@
+"""
+Benchmark: SessionLog throughput vs. the previous open/append/close per entry.
+
+    python benchmarks/bench_session_log.py --entries 100000
+"""
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from gap.core.session_log import SessionLog
+
+ENTRY = {"type": "llm_interaction", "prompt": "Implement T-01 in src/main.py " * 4, "response": "ok " * 50}
+
+
+def naive(root: Path, n: int) -> float:
+    path = root / "naive.log.jsonl"
+    start = time.perf_counter()
+    for _ in range(n):
+        entry = dict(ENTRY)
+        entry["timestamp"] = datetime.now().isoformat()
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    return time.perf_counter() - start
+
+
+def buffered(root: Path, n: int, **kwargs) -> float:
+    log = SessionLog(root, session_id=f"bench_{kwargs.get('fsync', 'interval')}", **kwargs)
+    start = time.perf_counter()
+    for _ in range(n):
+        log.log(ENTRY)
+    log.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.entries
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        rows = [
+            ("open/append/close", naive(root, n)),
+            ("SessionLog fsync=never", buffered(root, n, fsync="never")),
+            ("SessionLog fsync=interval", buffered(root, n, fsync="interval")),
+            ("SessionLog fsync=always", buffered(root, n, fsync="always")),
+            ("SessionLog + rotation", buffered(root, n, fsync="interval", max_bytes=8 * 1024 * 1024)),
+        ]
+        for label, elapsed in rows:
+            print(f"{label:<28} {elapsed:7.2f}s  {n / elapsed:>10,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
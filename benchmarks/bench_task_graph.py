@@ -0,0 +1,59 @@
+"""
+Benchmark: parsing a large tasks.md into a TaskGraph (cold parse vs. cached load).
+
+    python benchmarks/bench_task_graph.py --tasks 50000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core import flow  # noqa: E402
+
+
+def make_tasks(path: Path, count: int):
+    lines = ["# Tasks\n"]
+    for i in range(count):
+        if i % 500 == 0:
+            lines.append(f"\n## Phase {i // 500 + 1}: Block {i // 500}\n")
+        mark = "x" if i % 3 == 0 else " "
+        deps = f" (Depends: T-{i - 1:05d})" if i % 7 and i else ""
+        checkpoint = " (Checkpoint)" if i % 1000 == 999 else ""
+        lines.append(f"- [{mark}] T-{i:05d}: Implement unit {i} (File: src/mod_{i % 400}/unit_{i}.py){deps}{checkpoint}\n")
+        if i % 11 == 0:
+            lines.append(f"    - Files: docs/unit_{i}.md\n")
+    path.write_text("".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tasks.md"
+        make_tasks(path, args.tasks)
+        size = path.stat().st_size / 1e6
+
+        t0 = time.perf_counter()
+        graph = flow.load_task_graph(path)
+        cold = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        flow.load_task_graph(path)
+        warm = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        order = graph.topological_order()
+        topo = time.perf_counter() - t0
+
+        print(f"tasks.md: {args.tasks} tasks, {size:.1f} MB")
+        print(f"cold parse:  {cold * 1000:8.1f} ms ({len(graph)} tasks, {len(graph.checkpoints)} checkpoints)")
+        print(f"cached load: {warm * 1000:8.1f} ms")
+        print(f"topo order:  {topo * 1000:8.1f} ms ({len(order)} tasks)")
+
+
+if __name__ == "__main__":
+    main()
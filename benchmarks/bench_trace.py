@@ -0,0 +1,52 @@
+"""
+Benchmark: per-call cost of tracing instrumentation, disabled vs. enabled.
+
+    python benchmarks/bench_trace.py --calls 1000000
+"""
+import argparse
+import time
+
+from gap.core import trace
+from gap.core.trace import span, traced
+
+
+@traced("bench.decorated")
+def decorated(x):
+    return x + 1
+
+
+def plain(x):
+    return x + 1
+
+
+def with_span(x):
+    with span("bench.span", bytes=x):
+        return x + 1
+
+
+def measure(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    trace.disable()
+    base = measure(plain, args.calls)
+    print(f"plain call:                {base:7.1f} ns")
+    print(f"disabled @traced:          {measure(decorated, args.calls):7.1f} ns")
+    print(f"disabled span():           {measure(with_span, args.calls):7.1f} ns")
+
+    trace.enable()
+    print(f"enabled @traced:           {measure(decorated, args.calls):7.1f} ns")
+    print(f"enabled span():            {measure(with_span, args.calls):7.1f} ns")
+    print(f"events recorded:           {len(trace.get_tracer().events)}")
+
+
+if __name__ == "__main__":
+    main()
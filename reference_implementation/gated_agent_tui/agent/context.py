@@ -1,10 +1,69 @@
 import os
 import ast
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List
+
+from .spec_context import DEFAULT_TOKEN_BUDGET, SpecContextBuilder
+from .symbol_index import SymbolIndex
+
+# Directories never worth descending into (pruned during the walk).
+SKIP_DIRS = {".gap", "__pycache__", "gated_agent_tui", ".git", ".venv", "node_modules"}
+
+# Below this many changed files a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 64
+
+
+def _signature(node) -> str:
+    args = [a.arg for a in node.args.args]
+    if 'self' in args: args.remove('self')
+    return f"def {node.name}({', '.join(args)})"
+
+
+def _summary(node) -> str:
+    doc = ast.get_docstring(node) or ""
+    return " ".join(doc.strip().split("\n\n")[0].split())
+
+
+def parse_source(path: str) -> dict:
+    """
+    Parses one .py file (module level so it pickles for the process pool).
+    Returns the repo-map lines and the symbol records used by the search index.
+    """
+    lines, records = [], []
+    try:
+        with open(path, "r") as f:
+            tree = ast.parse(f.read())
+    except Exception:
+        return {"symbols": lines, "records": records}
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            lines.append(f"  class {node.name}:")
+            records.append({"kind": "class", "name": node.name, "line": node.lineno,
+                            "signature": f"class {node.name}", "docstring": _summary(node)})
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    lines.append(f"    {_signature(item)}")
+                    records.append({"kind": "method", "name": f"{node.name}.{item.name}", "line": item.lineno,
+                                    "signature": _signature(item), "docstring": _summary(item)})
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            records.append({"kind": "function", "name": node.name, "line": node.lineno,
+                            "signature": _signature(node), "docstring": _summary(node)})
+    return {"symbols": lines, "records": records}
+
 
 class ContextManager:
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, spec_token_budget: int = DEFAULT_TOKEN_BUDGET):
         self.root = root
+        self.spec_context = SpecContextBuilder(self.root / "specs", token_budget=spec_token_budget)
+        self.cache_path = self.root / ".gap/cache/repo_map.json"
+        self.index_path = self.root / ".gap/cache/symbols.db"
+        self._symbols: Dict[str, dict] = None
+        self._index: SymbolIndex = None
 
     def read_artifact(self, path: str) -> str:
         p = self.root / path
@@ -13,40 +72,104 @@ class ContextManager:
                 return f.read()
         return ""
 
-    def generate_repo_map(self) -> str:
-        """Scans the project for .py files and extracts signatures using AST."""
-        repo_map = "PROJECT STRUCTURE & API:\n"
-        
+    def iter_source_files(self):
+        """Yields (rel_path, stat) for every .py file, pruning SKIP_DIRS in place."""
         for root, dirs, files in os.walk(self.root):
-            if ".gap" in root or "__pycache__" in root or "gated_agent_tui" in root:
-                continue
-                
-            for file in files:
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for file in sorted(files):
                 if file.endswith(".py"):
-                    path = Path(root) / file
+                    path = os.path.join(root, file)
                     try:
-                        rel_path = path.relative_to(self.root)
-                        repo_map += f"\nFile: {rel_path}\n"
-                        
-                        with open(path, "r") as f:
-                            tree = ast.parse(f.read())
-                            
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.ClassDef):
-                                repo_map += f"  class {node.name}:\n"
-                                for item in node.body:
-                                    if isinstance(item, ast.FunctionDef):
-                                        args = [a.arg for a in item.args.args]
-                                        if 'self' in args: args.remove('self')
-                                        repo_map += f"    def {item.name}({', '.join(args)})\n"
-                            elif isinstance(node, ast.FunctionDef):
-                                # Top level functions (simple heuristic)
-                                if not isinstance(node, ast.ClassDef): 
-                                     pass # AST walking is flat, complex to infer parent easily without node transformer
-                    except Exception:
-                         # repo_map += f"  (Error parsing {file})\n"
-                         pass
-        return repo_map
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield os.path.relpath(path, self.root), st
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if self._symbols is None:
+            self._symbols = {}
+            if self.cache_path.exists():
+                try:
+                    self._symbols = json.loads(self.cache_path.read_text())
+                except (OSError, ValueError):
+                    self._symbols = {}
+        return self._symbols
+
+    def _save_cache(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._symbols))
+        os.replace(tmp, self.cache_path)
+
+    def refresh_symbols(self) -> Dict[str, dict]:
+        """
+        Brings the symbol cache in line with the tree.
+        Only files whose mtime/size changed are re-parsed; large batches go to a process pool.
+        """
+        cache = self._load_cache()
+        current = {}
+        changed = []
+
+        for rel_path, st in self.iter_source_files():
+            entry = cache.get(rel_path)
+            if entry and "records" in entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                current[rel_path] = entry
+            else:
+                current[rel_path] = {"mtime": st.st_mtime_ns, "size": st.st_size}
+                changed.append(rel_path)
+
+        if changed:
+            abs_paths = [str(self.root / p) for p in changed]
+            if len(changed) >= PARALLEL_THRESHOLD:
+                with ProcessPoolExecutor() as pool:
+                    results = list(pool.map(parse_source, abs_paths, chunksize=64))
+            else:
+                results = [parse_source(p) for p in abs_paths]
+            for rel_path, parsed in zip(changed, results):
+                current[rel_path].update(parsed)
+
+        dirty = bool(changed) or len(current) != len(cache)
+        self._symbols = current
+        if dirty:
+            self._save_cache()
+        return current
+
+    def generate_repo_map(self) -> str:
+        """Scans the project for .py files and extracts signatures using AST (cached by mtime/size)."""
+        parts = ["PROJECT STRUCTURE & API:\n"]
+        for rel_path, entry in self.refresh_symbols().items():
+            parts.append(f"\nFile: {rel_path}\n")
+            for line in entry["symbols"]:
+                parts.append(line + "\n")
+        return "".join(parts)
+
+    def sync_index(self) -> SymbolIndex:
+        """Refreshes the symbol cache and applies only the changed files to the search index."""
+        if self._index is None:
+            self._index = SymbolIndex(self.index_path)
+        self._index.sync(self.refresh_symbols())
+        return self._index
+
+    def query_symbols(self, text: str, limit: int = 20, sync: bool = True) -> List[dict]:
+        """
+        Returns the symbols most relevant to `text` (e.g. a task description).
+        With sync=False the index is searched as last synced; callers that ask
+        for many tasks at once sync once up front.
+        """
+        index = self.sync_index() if sync or self._index is None else self._index
+        return index.search(text, limit=limit)
+
+    def symbol_context(self, text: str, limit: int = 20, sync: bool = True) -> str:
+        """Formats query_symbols() results as a compact prompt section."""
+        hits = self.query_symbols(text, limit=limit, sync=sync)
+        if not hits:
+            return ""
+        parts = ["RELEVANT SYMBOLS:\n"]
+        for hit in hits:
+            parts.append(f"{hit['path']}:{hit['line']}  {hit['signature']}\n")
+            if hit["docstring"]:
+                parts.append(f"    {hit['docstring']}\n")
+        return "".join(parts)
 
     def read_all_specs(self) -> str:
         """Reads all Markdown files in the specs/ directory to build global context."""
@@ -58,3 +181,7 @@ class ContextManager:
                 context += f.read_text()
                 context += "\n\n"
         return context
+
+    def build_spec_context(self, query: str, token_budget: int = None) -> str:
+        """Ranks spec chunks against `query` (BM25) and packs the best ones into the token budget."""
+        return self.spec_context.build(query, token_budget=token_budget)
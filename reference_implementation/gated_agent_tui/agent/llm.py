@@ -1,52 +1,245 @@
-import os
-import json
+import random
+import asyncio
+import time
 from pathlib import Path
-from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
 from openai import OpenAI
+from gap.core.session_log import get_session_log
+from gap.core.trace import span
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "qwen/qwen-2.5-coder-32b-instruct"
+
+
+class LLMError(RuntimeError):
+    """Raised by AsyncGatedLLM when a request still fails after all retries."""
+
 
 class GatedLLM:
-    def __init__(self, root: Path, api_key: str):
+    def __init__(self, root: Path, api_key: str, base_url: str = OPENROUTER_URL, model: str = DEFAULT_MODEL):
         self.root = root
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=base_url,
             api_key=api_key
         )
-        self.model = "qwen/qwen-2.5-coder-32b-instruct"
-        
-        # Session Logging
-        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_dir = self.root / ".gap/sessions"
-        self.session_log_file = self.log_dir / f"{self.session_id}.log.jsonl"
+        self.model = model
+
+        # Session Logging (shared with InteractionManager)
+        self.session_log = get_session_log(self.root)
+        self.session_id = self.session_log.session_id
+        self.log_dir = self.session_log.log_dir
+        self.session_log_file = self.session_log.path
 
     def log_session(self, entry):
-        # Lazy creation of log dir
-        if not self.log_dir.exists():
-            self.log_dir.mkdir(parents=True, exist_ok=True)
-            
-        entry['timestamp'] = datetime.now().isoformat()
-        with open(self.session_log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self.session_log.log(entry)
 
     def chat(self, prompt, system="You are a helpful Sovereign Agent."):
         """Simple wrapper for LLM call."""
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            with span("llm.chat", cat="llm", model=self.model) as s:
+                completion = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                s.set(**_usage(completion))
             content = completion.choices[0].message.content
-            
+
             # LOGGING
             self.log_session({
                 "type": "llm_interaction",
                 "prompt": prompt,
                 "response": content
             })
-            
+
             return content
         except Exception as e:
             print(f"Error calling LLM: {e}")
             return "Error generating content."
+
+
+def _usage(completion) -> dict:
+    """Token counts for a trace span (empty when the provider reports none)."""
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return {}
+    return {
+        "tokens": usage.total_tokens,
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+    }
+
+
+class RateLimiter:
+    """Async token bucket: at most `rate` requests per second, bursting up to `burst`."""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncGatedLLM(GatedLLM):
+    """
+    Concurrent variant of GatedLLM for running independent tasks in parallel.
+
+    - One pooled HTTP client (keep-alive connections are reused across requests)
+    - At most `concurrency` requests in flight (semaphore)
+    - Optional per-model rate limits in requests/second (`rate_limits={"model": 2.0}`)
+    - Retries with exponential backoff + jitter on transient failures
+    - Raises LLMError instead of returning a placeholder string
+    """
+    def __init__(
+        self,
+        root: Path,
+        api_key: str,
+        base_url: str = OPENROUTER_URL,
+        model: str = DEFAULT_MODEL,
+        concurrency: int = 4,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 120.0,
+    ):
+        super().__init__(root, api_key, base_url=base_url, model=model)
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limits = rate_limits or {}
+        self._semaphore = None
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._connect()
+
+    def _connect(self):
+        import httpx
+        from openai import AsyncOpenAI
+
+        self.http = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        # Retries are handled here (with our backoff policy), not inside the SDK.
+        self.aclient = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, http_client=self.http, max_retries=0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the pooled connections. The next request reconnects, possibly on another event loop."""
+        await self.aclient.close()
+        await self.http.aclose()
+        # Loop-bound state is rebuilt on the next loop.
+        self._semaphore = None
+        self._limiters = {}
+
+    def _ensure_open(self):
+        if self.http.is_closed:
+            self._connect()
+
+    def _messages(self, prompt, system):
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def _throttle(self, model: str):
+        rate = self.rate_limits.get(model)
+        if not rate:
+            return
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = RateLimiter(rate)
+        await limiter.acquire()
+
+    def _slot(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        import openai
+        if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code in (408, 409, 429)
+
+    async def _retrying(self, call, model: str):
+        attempt = 0
+        while True:
+            await self._throttle(model)
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_transient(e):
+                    raise LLMError(f"LLM request failed after {attempt + 1} attempt(s): {e}") from e
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def achat(self, prompt, system="You are a helpful Sovereign Agent.", model: str = None) -> str:
+        model = model or self.model
+        self._ensure_open()
+        async with self._slot():
+            with span("llm.achat", cat="llm", model=model) as s:
+                completion = await self._retrying(
+                    lambda: self.aclient.chat.completions.create(model=model, messages=self._messages(prompt, system)),
+                    model,
+                )
+                s.set(**_usage(completion))
+        content = completion.choices[0].message.content
+        self.log_session({
+            "type": "llm_interaction",
+            "prompt": prompt,
+            "response": content
+        })
+        return content
+
+    async def astream(self, prompt, system="You are a helpful Sovereign Agent.", model: str = None) -> AsyncIterator[str]:
+        """Yields content deltas as they arrive. Retries only apply before the first token."""
+        model = model or self.model
+        chunks: List[str] = []
+        self._ensure_open()
+        async with self._slot():
+            stream = await self._retrying(
+                lambda: self.aclient.chat.completions.create(
+                    model=model, messages=self._messages(prompt, system), stream=True
+                ),
+                model,
+            )
+            async for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        self.log_session({
+            "type": "llm_interaction",
+            "prompt": prompt,
+            "response": "".join(chunks)
+        })
+
+    async def achat_many(self, prompts: List[str], system="You are a helpful Sovereign Agent.", model: str = None) -> List[str]:
+        """Runs independent prompts concurrently (bounded by `concurrency`), preserving order."""
+        return await asyncio.gather(*(self.achat(p, system=system, model=model) for p in prompts))
@@ -0,0 +1,151 @@
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Chunks longer than this (in estimated tokens) are split further on blank lines.
+MAX_CHUNK_TOKENS = 400
+
+HEADING = re.compile(r"^#{1,6}\s")
+WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token for English/Markdown). No tokenizer needed."""
+    return (len(text) + 3) // 4
+
+
+def tokenize(text: str) -> List[str]:
+    return [w.lower() for w in WORD.findall(text)]
+
+
+class SpecChunk:
+    def __init__(self, spec: str, order: int, text: str):
+        self.spec = spec
+        self.order = order
+        self.text = text
+        self.tokens = estimate_tokens(text)
+        self.terms = Counter(tokenize(text))
+        self.length = sum(self.terms.values())
+
+
+def chunk_markdown(spec: str, content: str) -> List[SpecChunk]:
+    """Splits a spec into heading sections, then oversized sections into paragraph groups."""
+    sections, current = [], []
+    for line in content.splitlines(keepends=True):
+        if HEADING.match(line) and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+
+    chunks = []
+    for section in sections:
+        if estimate_tokens(section) <= MAX_CHUNK_TOKENS:
+            pieces = [section]
+        else:
+            pieces, buf = [], ""
+            for para in re.split(r"(\n\s*\n)", section):
+                if buf and estimate_tokens(buf + para) > MAX_CHUNK_TOKENS:
+                    pieces.append(buf)
+                    buf = ""
+                buf += para
+            if buf:
+                pieces.append(buf)
+        for piece in pieces:
+            if piece.strip():
+                chunks.append(SpecChunk(spec, len(chunks), piece))
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of chunks."""
+    def __init__(self, chunks: List[SpecChunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.avg_len = (sum(c.length for c in chunks) / len(chunks)) if chunks else 0.0
+        df = Counter()
+        for c in chunks:
+            df.update(c.terms.keys())
+        n = len(chunks)
+        self.idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def score(self, query: str) -> List[Tuple[float, SpecChunk]]:
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        scored = []
+        for c in self.chunks:
+            s = 0.0
+            norm = self.k1 * (1 - self.b + self.b * c.length / (self.avg_len or 1))
+            for t in terms:
+                tf = c.terms.get(t)
+                if tf:
+                    s += self.idf[t] * tf * (self.k1 + 1) / (tf + norm)
+            if s > 0:
+                scored.append((s, c))
+        scored.sort(key=lambda x: -x[0])
+        return scored
+
+
+class SpecContextBuilder:
+    """
+    Builds a relevance-ranked, token-budgeted slice of specs/*.md for a task.
+    Specs are chunked and indexed once; the index is rebuilt only when a spec's mtime/size changes.
+    """
+    def __init__(self, specs_dir: Path, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        self.specs_dir = specs_dir
+        self.token_budget = token_budget
+        self._fingerprint: Tuple = ()
+        self._chunks: List[SpecChunk] = []
+        self._index: BM25Index = None
+
+    def _refresh(self):
+        files = sorted(self.specs_dir.glob("*.md")) if self.specs_dir.exists() else []
+        fingerprint = tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in files)
+        if fingerprint == self._fingerprint and self._index is not None:
+            return
+        chunks = []
+        for f in files:
+            for c in chunk_markdown(f.name, f.read_text()):
+                c.order = len(chunks)
+                chunks.append(c)
+        self._chunks = chunks
+        self._index = BM25Index(chunks)
+        self._fingerprint = fingerprint
+
+    def build(self, query: str, token_budget: int = None) -> str:
+        """Returns the best chunks for `query` that fit the budget, in document order."""
+        self._refresh()
+        budget = self.token_budget if token_budget is None else token_budget
+        ranked = [c for _, c in self._index.score(query)]
+        # Unmatched chunks fill any remaining room in document order.
+        seen = {id(c) for c in ranked}
+        ranked += [c for c in self._chunks if id(c) not in seen]
+
+        selected: List[SpecChunk] = []
+        used = 0
+        for c in ranked:
+            cost = c.tokens + 8  # header overhead
+            if used + cost > budget:
+                continue
+            selected.append(c)
+            used += cost
+
+        parts = []
+        last_spec = None
+        for c in sorted(selected, key=lambda c: c.order):
+            if c.spec != last_spec:
+                parts.append(f"--- SPEC: {c.spec} ---\n")
+                last_spec = c.spec
+            parts.append(c.text)
+            if not c.text.endswith("\n"):
+                parts.append("\n")
+        return "".join(parts)
+
+    def stats(self) -> Dict[str, int]:
+        self._refresh()
+        return {"chunks": len(self._chunks), "tokens": sum(c.tokens for c in self._chunks)}
@@ -0,0 +1,100 @@
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols USING fts5(
+    path UNINDEXED,
+    kind UNINDEXED,
+    line UNINDEXED,
+    name,
+    keywords,
+    signature,
+    docstring
+);
+"""
+
+# Column weights for bm25(): name, keywords and signature outrank docstrings.
+RANK = "bm25(symbols, 0, 0, 0, 10.0, 8.0, 4.0, 1.0)"
+
+
+def split_identifier(name: str) -> str:
+    """'GatedLLM.log_session' -> 'gated llm log session' so CamelCase parts are searchable."""
+    parts = re.findall(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+", name)
+    return " ".join(p.lower() for p in parts)
+
+
+def to_match_query(text: str) -> str:
+    """Turns free task text into an FTS5 OR-query of prefix terms."""
+    terms = []
+    for token in re.findall(r"\w+", text):
+        for part in (split_identifier(token) or token.lower()).split():
+            if len(part) > 1 and part not in terms:
+                terms.append(part)
+    return " OR ".join(f'"{t}"*' for t in terms)
+
+
+class SymbolIndex:
+    """
+    On-disk SQLite FTS5 index of the symbols collected by ContextManager.
+    Files are re-indexed only when their mtime/size differ from what was indexed.
+    """
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def sync(self, entries: Dict[str, dict]) -> int:
+        """
+        Applies the current symbol cache (rel_path -> {mtime, size, records}).
+        Returns the number of files (re)indexed or dropped.
+        """
+        indexed = {p: (m, s) for p, m, s in self.conn.execute("SELECT path, mtime, size FROM files")}
+        stale = [p for p in indexed if p not in entries]
+        changed = [p for p, e in entries.items() if indexed.get(p) != (e["mtime"], e["size"])]
+        if not stale and not changed:
+            return 0
+
+        with self.conn:
+            for path in stale + changed:
+                self.conn.execute("DELETE FROM symbols WHERE path = ?", (path,))
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            for path in changed:
+                entry = entries[path]
+                self.conn.executemany(
+                    "INSERT INTO symbols (path, kind, line, name, keywords, signature, docstring) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (path, r["kind"], r["line"], r["name"], split_identifier(r["name"]), r["signature"], r["docstring"])
+                        for r in entry.get("records", [])
+                    ],
+                )
+                self.conn.execute(
+                    "INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                    (path, entry["mtime"], entry["size"]),
+                )
+        return len(stale) + len(changed)
+
+    def search(self, text: str, limit: int = 20) -> List[dict]:
+        """Returns the best matching symbols for free text, most relevant first."""
+        query = to_match_query(text)
+        if not query:
+            return []
+        rows = self.conn.execute(
+            f"SELECT path, kind, line, name, signature, docstring FROM symbols "
+            f"WHERE symbols MATCH ? ORDER BY {RANK} LIMIT ?",
+            (query, limit),
+        )
+        return [
+            {"path": p, "kind": k, "line": int(l), "name": n, "signature": s, "docstring": d}
+            for p, k, l, n, s, d in rows
+        ]
@@ -1,26 +1,36 @@
+import os
+import shutil
+import uuid
 from pathlib import Path
+from typing import Dict, List, Optional, Union
+from gap.core.acl import AccessControlList, normalize_path
+from gap.core.trace import NOOP_SPAN, span
 from ..security.safety import is_safe_path
-from ..security.acl import parse_acl
 
 class FileSystemBridge:
-    def __init__(self, root: Path, acl_whitelist: set = None):
+    def __init__(self, root: Path, acl_whitelist: set = None, acl: AccessControlList = None):
         self.root = root
-        self.acl_whitelist = acl_whitelist or set()
+        # The bridge holds a compiled, versioned ACL snapshot; write checks never read policy from disk.
+        self.acl = acl or AccessControlList(acl_whitelist or ())
 
-    def write_artifact(self, path: str, content: str, allowed_path: str = None) -> bool:
-        """
-        Writes content to path, enforcing Safety and ACL.
-        Returns True if successful, False if blocked.
-        """
+    @property
+    def acl_whitelist(self) -> set:
+        return set(self.acl.rules)
+
+    @acl_whitelist.setter
+    def acl_whitelist(self, rules: set):
+        self.acl = AccessControlList(rules or ())
+
+    def check_write(self, path: str, allowed_path: str = None) -> bool:
+        """Enforces Safety, ACL and the Task Promise for one path. Returns False if blocked."""
         if not is_safe_path(self.root, path):
             print(f"🛑 SECURITY ALERT: Attempted write to unsafe path: {path}")
             return False
-            
+
         # 1. SPEC CHECK (Global Whitelist)
-        if self.acl_whitelist:
-            if Path(path).name not in self.acl_whitelist:
-                 print(f"🛑 ACL VIOLATION: '{Path(path).name}' is NOT in the Approved Access Control List.")
-                 # print(f"   Allowed: {self.acl_whitelist}")
+        if self.acl:
+            if normalize_path(path) not in self.acl:
+                 print(f"🛑 ACL VIOLATION: '{normalize_path(path)}' is NOT in the Approved Access Control List (v{self.acl.version}).")
                  return False
 
         # 2. TASK PROMISE CHECK (Finer grain)
@@ -30,10 +40,201 @@ class FileSystemBridge:
              if target != allowed:
                  print(f"🛑 TASK VIOLATION: Agent tried to write to '{target}' but Task Promise was '{allowed}'")
                  return False
+        return True
 
-        p = self.root / path
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with open(p, "w") as f:
-            f.write(content)
+    def write_artifact(self, path: str, content: str, allowed_path: str = None) -> bool:
+        """
+        Writes content to path, enforcing Safety and ACL.
+        Returns True if successful, False if blocked.
+        """
+        with span("bridge.write_artifact", cat="io", path=path) as s:
+            if not self.check_write(path, allowed_path):
+                s.set(blocked=True)
+                return False
+
+            p = self.root / path
+            p.parent.mkdir(parents=True, exist_ok=True)
+            with open(p, "w") as f:
+                f.write(content)
+            if s is not NOOP_SPAN:
+                s.set(bytes=len(content.encode("utf-8")))
         print(f"   -> Written to {path}")
         return True
+
+    def transaction(self, fsync: bool = True) -> "WriteTransaction":
+        """Starts a staged multi-file write (see WriteTransaction)."""
+        return WriteTransaction(self, fsync=fsync)
+
+
+class WriteTransaction:
+    """
+    All-or-nothing publication of many files.
+
+    Writes are staged under .gap/staging/<id>/ (same filesystem as the project,
+    so publishing is a rename). Each path is validated once, when staged.
+    commit() fsyncs the staged files, then renames them into place, moving any
+    file it replaces into the staging area first. If publishing fails midway,
+    or rollback() is called after commit, the previous tree is restored.
+    close() discards the staging area and makes a commit final.
+
+        with bridge.transaction() as tx:
+            tx.write("src/a.py", code_a, allowed_path="src/a.py")
+            tx.write("src/b.py", code_b)
+        # committed on success, rolled back on exception
+    """
+    def __init__(self, bridge: FileSystemBridge, fsync: bool = True):
+        self.bridge = bridge
+        self.root = bridge.root
+        self.fsync = fsync
+        self.id = uuid.uuid4().hex[:12]
+        self.staging = self.root / ".gap/staging" / self.id
+        self.state = "open"
+        self._staged: Dict[str, Optional[str]] = {}  # rel path -> allowed_path
+        self._rejected: List[str] = []
+        self._acl = bridge.acl
+        self._published: List[str] = []
+        self._backups: Dict[str, Path] = {}
+        self._created_dirs: List[Path] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.rollback()
+        elif self.state == "open":
+            self.commit()
+        self.close()
+        return False
+
+    def _stage_path(self, rel: str) -> Path:
+        return self.staging / "new" / rel
+
+    def write(self, path: str, content: Union[str, bytes], allowed_path: str = None) -> bool:
+        """
+        Validates `path` and stages its content (text, or bytes written as-is).
+        Returns False (and dooms the transaction) if the path is blocked. Later
+        writes to a path replace earlier ones.
+        """
+        if self.state != "open":
+            raise RuntimeError(f"Transaction {self.id} is {self.state}.")
+        if not self.bridge.check_write(path, allowed_path):
+            self._rejected.append(path)
+            return False
+        rel = normalize_path(path)
+        staged = self._stage_path(rel)
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        with open(staged, "wb" if isinstance(content, bytes) else "w") as f:
+            f.write(content)
+        self._staged[rel] = allowed_path
+        return True
+
+    def commit(self) -> bool:
+        """Validates and publishes every staged file. Returns False (nothing published) if any path is blocked."""
+        if self.state != "open":
+            raise RuntimeError(f"Transaction {self.id} is {self.state}.")
+        with span("bridge.commit", cat="io", files=len(self._staged)) as s:
+            committed = self._commit()
+            if s is not NOOP_SPAN and committed:
+                s.set(bytes=sum((self.root / rel).stat().st_size for rel in self._published))
+        return committed
+
+    def _commit(self) -> bool:
+        # 1. Paths were validated when staged; re-check only if the ACL was swapped since.
+        blocked = list(self._rejected)
+        if self.bridge.acl is not self._acl:
+            blocked += [rel for rel, allowed in self._staged.items() if not self.bridge.check_write(rel, allowed)]
+        if blocked:
+            print(f"🛑 Transaction {self.id} rejected: {len(blocked)} blocked path(s). Nothing was written.")
+            self.rollback()
+            return False
+
+        # 2. Durability of staged content (one pass), then directory creation (once per dir)
+        if self.fsync:
+            for rel in self._staged:
+                with open(self._stage_path(rel), "rb") as f:
+                    os.fsync(f.fileno())
+        for parent in sorted({(self.root / rel).parent for rel in self._staged}):
+            self._make_dirs(parent)
+
+        # 3. Publish via atomic renames, keeping the replaced files for rollback
+        try:
+            for rel in self._staged:
+                target = self.root / rel
+                if target.exists():
+                    backup = self.staging / "old" / rel
+                    backup.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(target, backup)
+                    self._backups[rel] = backup
+                # Recorded before the rename, so a failure here still restores the backup.
+                self._published.append(rel)
+                os.replace(self._stage_path(rel), target)
+        except OSError as e:
+            print(f"🛑 Transaction {self.id} failed while publishing ({e}). Rolling back.")
+            self._restore()
+            self.state = "rolled_back"
+            return False
+
+        if self.fsync:
+            for parent in {(self.root / rel).parent for rel in self._published}:
+                self._fsync_dir(parent)
+
+        self.state = "committed"
+        print(f"   -> Published {len(self._published)} file(s) atomically (tx {self.id})")
+        return True
+
+    def rollback(self):
+        """Discards staged writes, or undoes a commit that has not been closed yet."""
+        if self.state == "committed":
+            count = len(self._published)
+            self._restore()
+            print(f"   <- Rolled back {count} file(s) (tx {self.id})")
+        self.state = "rolled_back"
+
+    def close(self):
+        """Drops the staging area (backups included). A committed transaction becomes final."""
+        shutil.rmtree(self.staging, ignore_errors=True)
+        if self.state == "open":
+            self.state = "rolled_back"
+        elif self.state == "committed":
+            self.state = "closed"
+
+    def _restore(self):
+        for rel in reversed(self._published):
+            target = self.root / rel
+            backup = self._backups.get(rel)
+            if backup is not None:
+                os.replace(backup, target)
+            elif target.exists():
+                target.unlink()
+        self._published = []
+        self._backups = {}
+        for d in reversed(self._created_dirs):
+            try:
+                d.rmdir()
+            except OSError:
+                pass
+        self._created_dirs = []
+
+    def _make_dirs(self, path: Path):
+        missing = []
+        p = path
+        while not p.exists():
+            missing.append(p)
+            p = p.parent
+        for d in reversed(missing):
+            d.mkdir()
+            self._created_dirs.append(d)
+
+    @staticmethod
+    def _fsync_dir(path: Path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
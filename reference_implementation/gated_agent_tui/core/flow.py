@@ -1,6 +1,8 @@
+import hashlib
+import heapq
 import re
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 class FlowStep:
     def __init__(self, name, artifact, category):
@@ -11,30 +13,290 @@ class FlowStep:
 
 class Task:
     """Represents an execution task parsed from tasks.md"""
-    def __init__(self, id, file, status="pending", phase_class=None):
+    def __init__(self, id, file, status="pending", phase_class=None, title="", phase=None,
+                 depends_on=None, files=None, checkpoint=False, line=None):
         self.id = id
         self.file = file
         self.status = status
         self.phase_class = phase_class  # 'alignment' or 'execution'
+        self.title = title
+        self.phase = phase              # Heading the task was declared under
+        self.depends_on = list(depends_on or [])
+        self.files = list(files or ([file] if file else []))
+        self.checkpoint = checkpoint    # Pause for the supervisor before this task
+        self.line = line
+
+    def copy(self) -> "Task":
+        clone = Task.__new__(Task)
+        clone.__dict__.update(self.__dict__)
+        clone.depends_on = list(self.depends_on)
+        clone.files = list(self.files)
+        return clone
 
     def __repr__(self):
         return f"Task({self.id}, {self.file}, {self.status}, {self.phase_class})"
 
-def parse_tasks(tasks_path: Path) -> List[Task]:
-    """Simple parser for GAP tasks.md using [ ] and (File: ...) markers."""
+
+class TaskGraphError(ValueError):
+    """Raised for structurally invalid task graphs (dependency cycles)."""
+
+
+# --- tasks.md grammar (line based) ---
+#
+#   ## Phase 1: Bootstrap                                   -> phase of the tasks below
+#   - [ ] T-01: Create entry point (File: src/main.py)
+#   - [x] T-02: Wire config (File: src/config.py) (Depends: T-01)
+#   - [ ] T-03: Ship it (Files: a.py, b.py) (After: T-02) (Checkpoint)
+#       - Depends: T-01                                      -> attaches to T-03
+#
+# Status marks: ' ' pending, 'x' completed, '~' or '/' in_progress, '-' skipped.
+TASK_LINE = re.compile(r"^\s*[-*]\s+\[([ xX~/-])\]\s+(?:\*\*)?([A-Za-z0-9][\w.-]*?):(?:\*\*)?\s*(.*)$")
+HEADING_LINE = re.compile(r"^#{1,6}\s+(.*?)\s*#*\s*$")
+MARKER = re.compile(r"\((File|Files|Depends(?: on)?|After|Checkpoint)(?::\s*([^)]*))?\)", re.IGNORECASE)
+DETAIL_LINE = re.compile(
+    r"^\s+[-*]\s+(?:\*\*)?(File|Files|Depends(?: on)?|After|Checkpoint)(?:\*\*)?\s*:?(?:\*\*)?\s*(.*)$",
+    re.IGNORECASE,
+)
+STATUS_MARKS = {" ": "pending", "x": "completed", "X": "completed", "~": "in_progress", "/": "in_progress", "-": "skipped"}
+
+
+def _split_list(value: str) -> List[str]:
+    return [v.strip().strip("`") for v in re.split(r"[,\s]+", value or "") if v.strip().strip("`")]
+
+
+def _apply_marker(task: Task, key: str, value: str):
+    key = key.lower()
+    if key in ("file", "files"):
+        for f in _split_list(value) if key == "files" else [value.strip().strip("`")]:
+            if f and f not in task.files:
+                task.files.append(f)
+        if task.file is None and task.files:
+            task.file = task.files[0]
+    elif key == "checkpoint":
+        task.checkpoint = True
+    else:  # depends / depends on / after
+        for dep in _split_list(value):
+            if dep not in task.depends_on:
+                task.depends_on.append(dep)
+
+
+def iter_tasks(lines: Iterable[str]) -> Iterator[Task]:
+    """Streams Task objects from tasks.md lines. Detail lines attach to the preceding task."""
+    phase = None
+    current: Optional[Task] = None
+    for number, line in enumerate(lines, 1):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+        first = stripped[0]
+        if first == "#":
+            match = HEADING_LINE.match(stripped)
+            if match:
+                if current:
+                    yield current
+                    current = None
+                phase = match.group(1)
+            continue
+        if first not in "-*":
+            continue
+
+        match = TASK_LINE.match(line)
+        if match:
+            if current:
+                yield current
+            mark, task_id, rest = match.groups()
+            current = Task(task_id, None, status=STATUS_MARKS[mark], phase_class="execution",
+                           phase=phase, line=number)
+            for key, value in MARKER.findall(rest):
+                _apply_marker(current, key, value)
+            current.title = MARKER.sub("", rest).replace("**", "").strip()
+            continue
+
+        if current is not None and line[0] in " \t":
+            detail = DETAIL_LINE.match(line)
+            if detail:
+                _apply_marker(current, detail.group(1), detail.group(2))
+    if current:
+        yield current
+
+
+class TaskGraph:
+    """Tasks in declaration order, indexed by id, with their dependency edges."""
+    def __init__(self, tasks: Iterable[Task] = (), digest: str = None):
+        self.digest = digest
+        self.tasks: Dict[str, Task] = {}
+        self.phases: Dict[Optional[str], List[str]] = {}
+        self.duplicates: List[str] = []
+        for task in tasks:
+            if task.id in self.tasks:
+                self.duplicates.append(task.id)  # first declaration wins
+                continue
+            self.tasks[task.id] = task
+            self.phases.setdefault(task.phase, []).append(task.id)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.tasks.values())
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.tasks
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def copy(self) -> "TaskGraph":
+        graph = TaskGraph(digest=self.digest)
+        graph.tasks = {tid: t.copy() for tid, t in self.tasks.items()}
+        graph.phases = {phase: list(ids) for phase, ids in self.phases.items()}
+        graph.duplicates = list(self.duplicates)
+        return graph
+
+    @property
+    def checkpoints(self) -> List[str]:
+        return [t.id for t in self.tasks.values() if t.checkpoint]
+
+    def pending(self) -> List[Task]:
+        """Tasks still to run (pending or in progress) that name a file, in declaration order."""
+        return [t for t in self.tasks.values() if t.status in ("pending", "in_progress") and t.file]
+
+    def dependents(self) -> Dict[str, List[str]]:
+        reverse: Dict[str, List[str]] = {tid: [] for tid in self.tasks}
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                if dep in reverse:
+                    reverse[dep].append(task.id)
+        return reverse
+
+    def missing_dependencies(self) -> List[Tuple[str, str]]:
+        """(task, dependency) pairs whose dependency is not declared in the file."""
+        return [(t.id, d) for t in self.tasks.values() for d in t.depends_on if d not in self.tasks]
+
+    def topological_order(self) -> List[Task]:
+        """Dependencies first, ties broken by declaration order. Unknown deps are ignored."""
+        position = {tid: i for i, tid in enumerate(self.tasks)}
+        indegree = {tid: 0 for tid in self.tasks}
+        for task in self.tasks.values():
+            indegree[task.id] = sum(1 for d in set(task.depends_on) if d in self.tasks)
+        dependents = self.dependents()
+
+        ready = [(position[tid], tid) for tid, n in indegree.items() if n == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, tid = heapq.heappop(ready)
+            order.append(self.tasks[tid])
+            for child in dependents[tid]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, (position[child], child))
+        if len(order) != len(self.tasks):
+            stuck = sorted((tid for tid, n in indegree.items() if n > 0), key=position.get)
+            raise TaskGraphError(f"Dependency cycle among tasks: {', '.join(stuck[:10])}")
+        return order
+
+
+def partition_independent(tasks: List[Task]) -> List[List[Task]]:
+    """
+    Splits an ordered task list into waves that may run concurrently.
+
+    A task lands in the wave after the latest of (a) its dependencies and (b)
+    the previous task touching any of its files, both counted only if they
+    appear earlier in the list. Tasks within a wave therefore share no files
+    and do not depend on each other, and running the waves in order preserves
+    the sequential result. Linear in tasks + edges.
+    """
+    level: Dict[str, int] = {}
+    last_writer: Dict[str, str] = {}
+    waves: List[List[Task]] = []
+    for task in tasks:
+        files = task.files or ([task.file] if task.file else [])
+        before = [d for d in task.depends_on if d in level]
+        before += [last_writer[f] for f in files if f in last_writer]
+        wave = 1 + max((level[t] for t in before), default=-1)
+        level[task.id] = wave
+        for f in files:
+            last_writer[f] = task.id
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(task)
+    return waves
+
+
+def independent_groups(tasks: List[Task]) -> List[List[Task]]:
+    """
+    Splits tasks into groups that share no files and no dependency edges
+    (connected components), each keeping the original task order. Groups can
+    be executed concurrently; tasks within a group cannot.
+    """
+    parent = {t.id: t.id for t in tasks}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    owner: Dict[str, str] = {}
+    for task in tasks:
+        linked = [d for d in task.depends_on if d in parent]
+        for f in task.files or ([task.file] if task.file else []):
+            if f in owner:
+                linked.append(owner[f])
+            else:
+                owner[f] = task.id
+        for other in linked:
+            parent[find(other)] = find(task.id)
+
+    groups: Dict[str, List[Task]] = {}
+    for task in tasks:
+        groups.setdefault(find(task.id), []).append(task)
+    return list(groups.values())
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# path -> (stat key, digest); digest -> parsed graph (never handed out directly).
+# Only graphs some path currently points at are kept, so edits do not accumulate.
+_stat_cache: Dict[str, Tuple[tuple, str]] = {}
+_graph_cache: Dict[str, TaskGraph] = {}
+
+
+def load_task_graph(tasks_path: Path) -> TaskGraph:
+    """
+    Parses tasks.md into a TaskGraph. Results are cached by content hash (an
+    unchanged stat skips hashing too); callers always get their own copy, so
+    harnesses can update task status freely.
+    """
     if not tasks_path.exists():
-        return []
-        
-    tasks = []
-    content = tasks_path.read_text()
-    
-    # regex to find patterns like: - [ ] T-01: ... (File: src/main.py)
-    pattern = r"- \[ \] ([\w-]+): .*\(File: (.*)\)"
-    matches = re.finditer(pattern, content)
-    
-    for match in matches:
-        t_id = match.group(1)
-        t_file = match.group(2).strip()
-        tasks.append(Task(t_id, t_file))
-        
-    return tasks
+        return TaskGraph()
+    key = str(tasks_path.resolve())
+    st = tasks_path.stat()
+    stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    cached = _stat_cache.get(key)
+    if cached and cached[0] == stat_key and cached[1] in _graph_cache:
+        return _graph_cache[cached[1]].copy()
+
+    digest = _file_digest(tasks_path)
+    graph = _graph_cache.get(digest)
+    if graph is None:
+        with open(tasks_path, encoding="utf-8") as f:
+            graph = TaskGraph(iter_tasks(f), digest=digest)
+        _graph_cache[digest] = graph
+    _stat_cache[key] = (stat_key, digest)
+    if cached and cached[1] != digest and all(d != cached[1] for _, d in _stat_cache.values()):
+        _graph_cache.pop(cached[1], None)
+    return graph.copy()
+
+
+def parse_tasks(tasks_path: Path) -> List[Task]:
+    """Pending tasks from tasks.md (see load_task_graph for the full graph)."""
+    return load_task_graph(tasks_path).pending()
@@ -2,15 +2,23 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List
 from .flow import Task
+from .progress import RunProgress
 
 class Harness(ABC):
     """
     Abstract Base Class for GAP Execution Harnesses.
     Defines the contract for executing tasks within a GAP project.
+
+    Progress is persisted under .gap/runs/; with resume=True, tasks finished by
+    an earlier run (artifact unchanged) are skipped.
     """
-    def __init__(self, root: Path, api_key: str):
+    name = "harness"
+
+    def __init__(self, root: Path, api_key: str, resume: bool = False):
         self.root = root
         self.api_key = api_key
+        self.resume = resume
+        self.progress = RunProgress(root, self.name)
 
     @abstractmethod
     def execute(self, tasks: List[Task], checkpoints: List[str] = None) -> bool:
@@ -23,13 +31,14 @@ class Harness(ABC):
 class HarnessFactory:
     """Factory to create the appropriate harness based on user selection."""
     @staticmethod
-    def create(harness_type: str, root: Path, api_key: str, model: str = None) -> Harness:
+    def create(harness_type: str, root: Path, api_key: str, model: str = None, concurrency: int = 1,
+               resume: bool = False) -> Harness:
         if harness_type == "legacy":
             from .harnesses.legacy import LegacyHarness
-            return LegacyHarness(root, api_key)
+            return LegacyHarness(root, api_key, concurrency=concurrency, resume=resume)
         elif harness_type == "gptme":
             from .harnesses.gptme import GptmeHarness
-            return GptmeHarness(root, api_key, model=model)
+            return GptmeHarness(root, api_key, model=model, resume=resume, workers=concurrency)
         else:
             raise ValueError(f"Unknown harness type: {harness_type}")
 
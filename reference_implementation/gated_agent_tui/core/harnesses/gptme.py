@@ -1,37 +1,144 @@
 import subprocess
 import os
+import shutil
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from ..harness import Harness
-from ..flow import Task
+from ..flow import Task, independent_groups
+from ..bridge import FileSystemBridge
+from gap.core.trace import span, traced
+
+# Default binary inside the reference venv; override with gptme_bin= or $GAP_GPTME_BIN.
+DEFAULT_GPTME_BIN = Path(__file__).parent.parent.parent.parent / ".venv_reference/bin/gptme"
+RING_LINES = 200
+# Never copied into (or audited in) isolated working copies.
+COPY_SKIP = {".git", ".gap", "__pycache__", "node_modules"}
+
+
+def _skipped(name: str) -> bool:
+    return name in COPY_SKIP or name.startswith(".venv")
+
+
+def _snapshot(root: Path) -> Dict[str, Tuple[int, int]]:
+    """rel path -> (mtime_ns, size) for every file outside COPY_SKIP."""
+    files = {}
+    for base, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if not _skipped(d)]
+        for name in names:
+            path = os.path.join(base, name)
+            st = os.stat(path)
+            files[os.path.relpath(path, root).replace(os.sep, "/")] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+class WindowRun:
+    """
+    One gptme process for one execution window. Output goes to a per-window
+    log file and a bounded ring buffer (the last `ring_lines` lines), and is
+    echoed to the terminal only when `live` is set.
+    """
+    def __init__(self, label: str, tasks: List[Task], whitelist: List[str], workdir: Path, log_path: Path,
+                 ring_lines: int = RING_LINES, live: bool = False):
+        self.label = label
+        self.tasks = tasks
+        self.whitelist = whitelist
+        self.workdir = workdir
+        self.log_path = log_path
+        self.live = live
+        self.tail = deque(maxlen=ring_lines)
+        self.lines = 0
+        self.baseline: Dict[str, Tuple[int, int]] = {}
+        self.returncode: Optional[int] = None
+        self.elapsed = 0.0
+
+    def run(self, cmd: List[str], env: Dict[str, str]) -> int:
+        started = time.perf_counter()
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(
+                cmd,
+                cwd=self.workdir,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+            )
+            for line in process.stdout:
+                log.write(line)
+                self.lines += 1
+                self.tail.append(line.rstrip("\n"))
+                if self.live:
+                    sys.stdout.write(line)
+                    sys.stdout.flush()
+            process.wait()
+        self.returncode = process.returncode
+        self.elapsed = time.perf_counter() - started
+        return self.returncode
+
+    def print_tail(self, lines: int = 20):
+        print(f"   --- {self.label}: last {min(lines, len(self.tail))} lines ({self.log_path}) ---")
+        for line in list(self.tail)[-lines:]:
+            print(f"   | {line}")
+
 
 class GptmeHarness(Harness):
     """
     A high-fidelity execution harness that wraps the gptme CLI.
     Provides a live, stateful terminal feed for demonstrations.
+
+    With workers > 1, each checkpoint window is split into independent
+    windows (no shared files or dependencies, see independent_groups) that
+    run concurrently, each in an isolated copy of the project under
+    .gap/windows/<run>/. Their output is captured per window instead of
+    sharing the terminal. The audit rejects any change outside a window's
+    promise. Surviving artifacts are merged back through one bridge
+    transaction per checkpoint window.
     """
-    def __init__(self, root: Path, api_key: str, model: str = None):
-        super().__init__(root, api_key)
+    name = "gptme"
+
+    def __init__(self, root: Path, api_key: str, model: str = None, resume: bool = False, workers: int = 1,
+                 isolate: bool = None, gptme_bin: str = None, ring_lines: int = RING_LINES):
+        super().__init__(root, api_key, resume=resume)
         self.model = model or "openrouter/qwen/qwen-2.5-coder-32b-instruct"
+        self.workers = max(1, workers)
+        self.isolate = self.workers > 1 if isolate is None else isolate
+        self.gptme_bin = gptme_bin or os.environ.get("GAP_GPTME_BIN") or str(DEFAULT_GPTME_BIN)
+        self.ring_lines = ring_lines
+        self.bridge = FileSystemBridge(root)
 
+    @traced("harness.execute", cat="harness")
     def execute(self, tasks: List[Task], checkpoints: List[str] = None, whitelist: List[str] = None) -> bool:
         checkpoints = checkpoints or []
         print(f"\n🔥 Starting STEERABLE (gptme) Execution for {len(tasks)} tasks...")
+        self.progress.start(resume=self.resume)
+        if self.resume:
+            tasks = self.progress.remaining(tasks)
+        run_dir = self.root / ".gap/windows" / self.progress.run_id
 
         # 1. GROUP TASKS BY CHECKPOINTS
         task_chunks = self._chunk_tasks(tasks, checkpoints)
-        
+
         for i, chunk in enumerate(task_chunks):
-            print(f"\n[ EXECUTION WINDOW {i+1}/{len(task_chunks)} ]")
-            
-            # 2. GENERATE MISSION FOR THIS WINDOW ONLY
-            # If we are in Live Alignment, whitelist is forced. Otherwise it's chunk-based.
-            current_whitelist = whitelist if (whitelist and len(task_chunks) == 1) else [t.file for t in chunk]
-            mission_content = self._build_mission_prompt(chunk, whitelist=current_whitelist)
-            mission_path = self.root / ".gap/MISSION.md"
-            mission_path.parent.mkdir(exist_ok=True)
-            mission_path.write_text(mission_content)
+            # Independent windows inside a checkpoint window may run side by side
+            groups = independent_groups(chunk) if self.workers > 1 else [chunk]
+            parallel = f" ({len(groups)} parallel windows)" if len(groups) > 1 else ""
+            print(f"\n[ EXECUTION WINDOW {i+1}/{len(task_chunks)} ]{parallel}")
+
+            runs = []
+            for j, group in enumerate(groups):
+                # 2. GENERATE MISSION FOR THIS WINDOW ONLY
+                # If we are in Live Alignment, whitelist is forced. Otherwise it's chunk-based.
+                single = len(task_chunks) == 1 and len(groups) == 1
+                current_whitelist = whitelist if (whitelist and single) else [t.file for t in group]
+                label = f"w{i+1:03d}" + (f".{j+1}" if len(groups) > 1 else "")
+                workdir = run_dir / label if self.isolate else self.root
+                runs.append(WindowRun(label, group, current_whitelist, workdir, run_dir / f"{label}.log",
+                                      ring_lines=self.ring_lines, live=len(groups) == 1 and not self.isolate))
 
             # 3. CONFIGURE CAPABILITY SANDBOX (Tool Gating)
             # Use schema-driven phase detection instead of path heuristics
@@ -40,67 +147,126 @@ class GptmeHarness(Harness):
             if not is_alignment:
                 # In Execution phase, we allow more tools (this could be further refined by Task ACL)
                 allowed_tools = "save,shell,ipython,browser"
-            
-            print(f"🛡️  CAPABILITY GATE: Allowlist = [{allowed_tools}]")
 
+            print(f"🛡️  CAPABILITY GATE: Allowlist = [{allowed_tools}]")
 
-            # 4. RUN GPTME FOR THIS WINDOW
-            print(f"--- GPTME LIVE FEED (Group: {[t.id for t in chunk]}) ---")
+            # 4. RUN GPTME FOR THESE WINDOWS
+            for run in runs:
+                print(f"--- GPTME {'LIVE FEED' if run.live else 'WINDOW ' + run.label} (Group: {[t.id for t in run.tasks]}) ---")
             try:
-                # We command gptme to execute the MISSION.md and EXIT immediately after completion
-                anchor_command = "Execute the tasks in .gap/MISSION.md. When ALL tasks in that file are finished, type /exit. DO NOT perform any unlisted work."
-                
-                # Use absolute path to gptme binary inside the reference venv
-                gptme_bin = Path(__file__).parent.parent.parent / ".venv_reference/bin/gptme"
-                
-                # Command construction
-                cmd = [str(gptme_bin), "-m", self.model, anchor_command]
-                
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=self.root,
-                    env={
-                        **os.environ, 
-                        "OPENROUTER_KEY": self.api_key,
-                        "TOOL_ALLOWLIST": allowed_tools
-                    },
-                    stdout=sys.stdout,
-                    stderr=sys.stderr,
-                    text=True
-                )
-                process.wait()
-
-                
-                if process.returncode != 0:
-                    print(f"🛑 Execution Window failed.")
-                    return False
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gap-gptme") as pool:
+                    list(pool.map(lambda run: self._run_window(run, allowed_tools), runs))
+            except Exception as e:
+                print(f"🛑 Error running gptme: {e}")
+                self._cleanup(runs)
+                return False
 
-                # 5. THE SOVEREIGN GATE (Pause for User between chunks)
-                last_task = chunk[-1]
-                if last_task.id in checkpoints:
-                    print(f"\n🛑 GAP CHECKPOINT REACHED: {last_task.id}")
-                    print("=" * 50)
-                    print("   Execution paused. Control returned to GAP Ledger.")
-                    print("   Review the output above before proceeding.")
-                    print("=" * 50)
-                    user_choice = input("   [y] Approve & Continue  [n] Abort Execution > ").strip().lower()
-                    if user_choice != 'y':
-                        print("🛑 Execution aborted by user at checkpoint.")
-                        return False
-                    print("✅ Checkpoint approved. Continuing to next window...")
+            failed = [run for run in runs if run.returncode != 0]
+            for run in failed:
+                print(f"🛑 Execution Window {run.label} failed (exit {run.returncode}).")
+                run.print_tail()
+                self.progress.record(run.tasks, "failed")
+            if failed:
+                self._cleanup(runs)
+                return False
 
+            # 5. POST-WINDOW AUDIT (and merge back from isolated copies)
+            with span("gptme.audit", cat="harness", windows=len(runs)):
+                audited = self._merge_windows(runs) if self.isolate else self._audit_chunk(chunk)
+            self._cleanup(runs)
+            if not audited:
+                return False
 
-                # 5. POST-WINDOW AUDIT
-                if not self._audit_chunk(chunk):
+            # 6. THE SOVEREIGN GATE (Pause for User between chunks)
+            last_task = chunk[-1]
+            if last_task.id in checkpoints:
+                print(f"\n🛑 GAP CHECKPOINT REACHED: {last_task.id}")
+                print("=" * 50)
+                print("   Execution paused. Control returned to GAP Ledger.")
+                for run in runs:
+                    if not run.live:
+                        run.print_tail()
+                print("   Review the output above before proceeding.")
+                print("=" * 50)
+                with span("human.ask", cat="human", task_id=last_task.id) as s:
+                    user_choice = input("   [y] Approve & Continue  [n] Abort Execution > ").strip().lower()
+                    s.set(choice=user_choice)
+                if user_choice != 'y':
+                    print("🛑 Execution aborted by user at checkpoint.")
                     return False
+                print("✅ Checkpoint approved. Continuing to next window...")
 
-            except Exception as e:
-                print(f"🛑 Error running gptme: {e}")
+        print("\n🏆 All Execution Windows completed and verified.")
+        return True
+
+    def _run_window(self, run: WindowRun, allowed_tools: str) -> int:
+        if self.isolate:
+            shutil.copytree(self.root, run.workdir, ignore=lambda d, names: [n for n in names if _skipped(n)])
+            run.baseline = _snapshot(run.workdir)
+
+        mission_path = run.workdir / ".gap/MISSION.md"
+        mission_path.parent.mkdir(parents=True, exist_ok=True)
+        mission_path.write_text(self._build_mission_prompt(run.tasks, whitelist=run.whitelist))
+
+        # We command gptme to execute the MISSION.md and EXIT immediately after completion
+        anchor_command = "Execute the tasks in .gap/MISSION.md. When ALL tasks in that file are finished, type /exit. DO NOT perform any unlisted work."
+        cmd = [str(self.gptme_bin), "-m", self.model, anchor_command]
+        env = {
+            **os.environ,
+            "OPENROUTER_KEY": self.api_key,
+            "TOOL_ALLOWLIST": allowed_tools
+        }
+        with span("gptme.window", cat="harness", window=run.label, tasks=[t.id for t in run.tasks]) as s:
+            code = run.run(cmd, env)
+            s.set(exit_code=code, lines=run.lines)
+        print(f"   ⏱️  {run.label} finished in {run.elapsed:.1f}s (exit {code}, log: {run.log_path})")
+        return code
+
+    def _merge_windows(self, runs: List[WindowRun]) -> bool:
+        """Audits every isolated copy, then publishes all promised artifacts in one transaction."""
+        print(f"🛡️  Auditing Window Pedigree...")
+        tx = self.bridge.transaction()
+        for run in runs:
+            after = _snapshot(run.workdir)
+            changed = {p for p, st in after.items() if run.baseline.get(p) != st}
+            deleted = set(run.baseline) - set(after)
+            leaked = sorted((changed | deleted) - set(run.whitelist))
+            if leaked:
+                print(f"   ❌ Window {run.label} broke its promise; touched: {', '.join(leaked[:10])}")
+                self.progress.record(run.tasks, "failed")
+                tx.close()
                 return False
+            for t in run.tasks:
+                if t.file not in after:
+                    print(f"   ❌ Task {t.id} failed: Artifact {t.file} missing.")
+                    self.progress.record([t], "failed")
+                    tx.close()
+                    return False
+            for rel in sorted(changed):
+                content = (run.workdir / rel).read_bytes()  # merged verbatim: artifacts may be binary
+                allowed = next((t.file for t in run.tasks if t.file == rel), None)
+                if not tx.write(rel, content, allowed_path=allowed):
+                    self.progress.record(run.tasks, "failed")
+                    tx.close()
+                    return False
 
-        print("\n🏆 All Execution Windows completed and verified.")
+        committed = tx.commit()
+        tx.close()
+        tasks = [t for run in runs for t in run.tasks]
+        if not committed:
+            self.progress.record(tasks, "failed")
+            return False
+        for t in tasks:
+            t.status = "completed"
+        self.progress.record(tasks, "completed")
         return True
 
+    def _cleanup(self, runs: List[WindowRun]):
+        """Removes isolated working copies (logs are kept next to them)."""
+        if self.isolate:
+            for run in runs:
+                shutil.rmtree(run.workdir, ignore_errors=True)
+
     def _chunk_tasks(self, tasks: List[Task], checkpoints: List[str]) -> List[List[Task]]:
         """Splits tasks into groups based on defined checkpoints."""
         chunks = []
@@ -116,20 +282,21 @@ class GptmeHarness(Harness):
 
     def _audit_chunk(self, chunk: List[Task]) -> bool:
         """Verifies that the window didn't leak or fail its promises."""
-        from ..security.safety import is_safe_path
         print(f"🛡️  Auditing Window Pedigree...")
         for t in chunk:
             p = self.root / t.file
             if not p.exists():
                 print(f"   ❌ Task {t.id} failed: Artifact {t.file} missing.")
+                self.progress.record([t], "failed")
                 return False
             t.status = "completed"
+        self.progress.record(chunk, "completed")
         return True
 
     def _build_mission_prompt(self, tasks: List[Task], whitelist: List[str] = None) -> str:
         """Constructs the grounding prompt for gptme with strict file whitelisting."""
         task_list = "\n".join([f"- [{t.status}] {t.id}: {t.file}" for t in tasks])
-        
+
         # Enforce Singular Promise or Phase Whitelist
         allowed_files = whitelist if whitelist else [t.file for t in tasks]
         whitelist_str = ", ".join(allowed_files)
@@ -1,54 +1,171 @@
+import asyncio
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from ..harness import Harness
-from ..flow import Task
+from ..flow import Task, partition_independent
 from ..bridge import FileSystemBridge
-from ..agent.llm import GatedLLM
-from ..agent.prompts import Prompts
-from ..agent.context import ContextManager
-from ..ui.interaction import InteractionManager
+from gap.core.trace import span, traced
+from ...agent.llm import AsyncGatedLLM, LLMError
+from ...agent.prompts import Prompts
+from ...agent.context import ContextManager
+from ...agent.spec_context import DEFAULT_TOKEN_BUDGET
+from ...ui.interaction import InteractionManager
+
+
+def _task_query(task: Task) -> str:
+    """Retrieval query for a task: what it says it does, where it sits, and what it writes."""
+    return " ".join(part for part in (task.title, task.phase, *task.files) if part)
+
 
 class LegacyHarness(Harness):
     """
     The 'Old Model' execution harness.
     Performs step-by-step task execution with gated checkpoints.
+
+    With concurrency > 1, each checkpoint window is split into waves of tasks
+    that touch disjoint files and do not depend on each other (see
+    partition_independent); the LLM calls of a wave run concurrently through
+    AsyncGatedLLM, which bounds them to `concurrency`, applies its rate limits
+    and retries transient failures. Checkpoints stay barriers: a window is
+    fully published before the next checkpoint prompt.
     """
-    def __init__(self, root: Path, api_key: str):
-        super().__init__(root, api_key)
-        self.llm = GatedLLM(root, api_key)
+    name = "legacy"
+
+    def __init__(self, root: Path, api_key: str, spec_token_budget: int = DEFAULT_TOKEN_BUDGET, concurrency: int = 1,
+                 resume: bool = False):
+        super().__init__(root, api_key, resume=resume)
+        self.concurrency = max(1, concurrency)
+        self.llm = AsyncGatedLLM(root, api_key, concurrency=self.concurrency)
         self.bridge = FileSystemBridge(root)
         self.interaction = InteractionManager(root)
-        self.context_mgr = ContextManager(root)
+        self.context_mgr = ContextManager(root, spec_token_budget=spec_token_budget)
+        self.timings: Dict[str, Dict[str, float]] = {}
 
+    @traced("harness.execute", cat="harness")
     def execute(self, tasks: List[Task], checkpoints: List[str] = None) -> bool:
         checkpoints = checkpoints or []
         print(f"\n🚀 Starting Legacy Execution for {len(tasks)} tasks...")
+        self.timings = {}
+        self.progress.start(resume=self.resume)
+        if self.resume:
+            tasks = self.progress.remaining(tasks)
 
+        # Writes between two checkpoints form one transaction: they are published
+        # together before the human is asked to proceed, or not at all.
+        windows: List[List[Task]] = [[]]
         for task in tasks:
-            print(f"\n--- Task: {task.id} ({task.file}) ---")
-            
-            # 1. Checkpoint Gate
-            if task.id in checkpoints:
-                print(f"🛑 GAP CHECKPOINT: {task.id}")
-                choice = self.interaction.ask_human("checkpoint", f"Execution paused at task: {task.id}. Proceed?")
-                if choice != 'y':
-                    print("❌ Execution halted by user.")
+            if task.id in checkpoints and windows[-1]:
+                windows.append([])
+            windows[-1].append(task)
+
+        # One event loop per run: the LLM client's pooled connections live on it between waves.
+        loop = asyncio.new_event_loop()
+        try:
+            for window in windows:
+                if not window:
+                    continue
+
+                # 1. Checkpoint Gate
+                head = window[0]
+                if head.id in checkpoints:
+                    print(f"🛑 GAP CHECKPOINT: {head.id}")
+                    choice = self.interaction.ask_human("checkpoint", f"Execution paused at task: {head.id}. Proceed?")
+                    if choice != 'y':
+                        print("❌ Execution halted by user.")
+                        return False
+
+                if not self._run_window(loop, window):
                     return False
+        finally:
+            loop.run_until_complete(self.llm.aclose())
+            loop.close()
+
+        self._report_timings()
+        print("\n✅ Legacy Execution Completed.")
+        return True
 
-            # 2. Context & Generation
-            context = self.context_mgr.read_all_specs()
-            prompt = Prompts.execution_task(task, context)
-            
-            print(f"    (Agent is working on {task.file}...)")
-            content = self.llm.chat(prompt)
-
-            # 3. Write Artifact
-            success = self.bridge.write_artifact(task.file, content, allowed_path=task.file)
-            if not success:
-                print(f"🛑 Execution failed at task {task.id} due to security violation.")
+    def _run_window(self, loop: asyncio.AbstractEventLoop, window: List[Task]) -> bool:
+        tx = self.bridge.transaction()
+        waves = partition_independent(window) if self.concurrency > 1 else [[t] for t in window]
+        # Writes are staged until the window is published, so one index sync serves all its tasks.
+        with span("harness.sync_index", cat="harness", tasks=len(window)):
+            self.context_mgr.sync_index()
+
+        for number, wave in enumerate(waves, 1):
+            if len(wave) > 1:
+                print(f"\n⚡ Wave {number}/{len(waves)}: {len(wave)} independent tasks")
+
+            # 2. Context (main thread: the context caches and symbol index are not shared across threads)
+            prompts = {}
+            for task in wave:
+                print(f"\n--- Task: {task.id} ({task.file}) ---")
+                started = time.perf_counter()
+                with span("harness.context", cat="harness", task_id=task.id):
+                    query = _task_query(task)
+                    context = self.context_mgr.build_spec_context(query)
+                    symbols = self.context_mgr.symbol_context(query, sync=False)
+                    if symbols:
+                        context += symbols
+                    prompts[task.id] = Prompts.execution_task(task, context)
+                self.timings[task.id] = {"wave": number, "context": time.perf_counter() - started}
+
+            # 3. Generation (concurrent within the wave)
+            try:
+                results = loop.run_until_complete(self._generate_wave(wave, prompts))
+            except LLMError as e:
+                print(f"🛑 Execution failed: {e}. Nothing from this checkpoint window was published.")
+                tx.rollback()
+                tx.close()
+                self.progress.record(window, "failed")
                 return False
-            
+
+            # 4. Stage Artifacts in task order (validated and published with the checkpoint window)
+            for task in wave:
+                content, elapsed = results[task.id]
+                self.timings[task.id]["generate"] = elapsed
+                if not tx.write(task.file, content, allowed_path=task.file):
+                    print(f"🛑 Execution failed at task {task.id} due to security violation.")
+                    tx.rollback()
+                    tx.close()
+                    self.progress.record(window, "failed")
+                    return False
+
+        return self._publish(tx, window)
+
+    async def _generate_wave(self, wave: List[Task], prompts: Dict[str, str]) -> Dict[str, tuple]:
+        """task id -> (content, seconds). Every call is awaited before the first failure is raised."""
+        results = await asyncio.gather(*(self._generate(t, prompts[t.id]) for t in wave), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return {t.id: r for t, r in zip(wave, results)}
+
+    async def _generate(self, task: Task, prompt: str):
+        print(f"    (Agent is working on {task.file}...)")
+        started = time.perf_counter()
+        with span("harness.task", cat="harness", task_id=task.id, file=task.file):
+            content = await self.llm.achat(prompt)
+        return content, time.perf_counter() - started
+
+    def _publish(self, tx, window: List[Task]) -> bool:
+        """Commits one checkpoint window; tasks are only marked completed once their files are on disk."""
+        committed = tx.commit()
+        tx.close()
+        if not committed:
+            print("🛑 Execution failed: checkpoint window was rolled back.")
+            self.progress.record(window, "failed")
+            return False
+        for task in window:
             task.status = "completed"
-            
-        print("\n✅ Legacy Execution Completed.")
+        self.progress.record(window, "completed")
         return True
+
+    def _report_timings(self):
+        if not self.timings:
+            return
+        print(f"\n⏱️  Task timings (concurrency={self.concurrency}):")
+        print(f"   {'Task':<16} {'Wave':>4} {'Context':>9} {'Generate':>9}")
+        for task_id, t in self.timings.items():
+            print(f"   {task_id:<16} {t['wave']:>4} {t['context']:>8.2f}s {t.get('generate', 0.0):>8.2f}s")
+            self.llm.log_session({"type": "task_timing", "task_id": task_id, **t})
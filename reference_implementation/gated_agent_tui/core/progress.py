@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from .flow import Task
+
+
+def hash_file(path: Path) -> Optional[str]:
+    try:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+    except OSError:
+        return None
+
+
+def _artifacts(entry: dict) -> Dict[str, dict]:
+    """rel path -> {sha256, mtime_ns, size}; entries written before multi-file tasks name a single `file`."""
+    if "artifacts" in entry:
+        return entry["artifacts"]
+    if entry.get("file"):
+        return {entry["file"]: {k: entry.get(k) for k in ("sha256", "mtime_ns", "size")}}
+    return {}
+
+
+class RunProgress:
+    """
+    Persisted per-harness progress: `.gap/runs/<harness>.progress.jsonl`.
+
+    One JSON line per task outcome (task id, outcome, and the sha256 of every
+    artifact the task writes); the latest line for a task wins. A resumed run
+    skips tasks whose last outcome is 'completed' and whose artifacts all still
+    have the recorded hashes, so an interrupted execution phase restarts where
+    it stopped instead of paying for every task again. A fresh run re-executes
+    everything and overwrites the outcomes it produces; the file is compacted
+    to one line per task on start.
+    """
+    def __init__(self, root: Path, harness: str):
+        self.root = root
+        self.path = root / ".gap/runs" / f"{harness}.progress.jsonl"
+        self.run_id = None
+        self.records: Dict[str, dict] = {}
+
+    def load(self) -> Dict[str, dict]:
+        self.records = {}
+        if not self.path.exists():
+            return self.records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if entry.get("type") == "task":
+                    self.records[entry["task_id"]] = entry
+        return self.records
+
+    def start(self, resume: bool = False):
+        """Opens a run: loads and compacts previous outcomes, then appends a run marker."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.load()
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self.records.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, self.path)
+        self.run_id = uuid.uuid4().hex[:12]
+        self._append([{"type": "run", "run_id": self.run_id, "resumed": resume}])
+
+    def is_done(self, task: Task) -> bool:
+        """True if the task completed before and every artifact it writes is present and unchanged."""
+        entry = self.records.get(task.id)
+        if not entry or entry.get("outcome") != "completed":
+            return False
+        artifacts = _artifacts(entry)
+        if set(artifacts) != set(task.files):
+            return False
+        return all(self._unchanged(rel, recorded) for rel, recorded in artifacts.items())
+
+    def _unchanged(self, rel: str, recorded: dict) -> bool:
+        path = self.root / rel
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if recorded.get("mtime_ns") == st.st_mtime_ns and recorded.get("size") == st.st_size:
+            return True
+        return hash_file(path) == recorded.get("sha256")
+
+    def remaining(self, tasks: List[Task]) -> List[Task]:
+        """Filters out finished tasks (marking them completed) and reports what was skipped."""
+        todo = []
+        for task in tasks:
+            if self.is_done(task):
+                task.status = "completed"
+                print(f"⏭️  Skipping {task.id} ({task.file}): completed in a previous run, artifact unchanged.")
+            else:
+                todo.append(task)
+        return todo
+
+    def record(self, tasks: List[Task], outcome: str):
+        """Appends one outcome line per task and fsyncs once for the batch."""
+        entries = []
+        for task in tasks:
+            entry = {
+                "type": "task",
+                "run_id": self.run_id,
+                "task_id": task.id,
+                "file": task.file,
+                "outcome": outcome,
+                "artifacts": {},
+            }
+            if outcome == "completed":
+                for rel in task.files:
+                    path = self.root / rel
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue  # missing artifacts fail is_done() on resume
+                    entry["artifacts"][rel] = {"sha256": hash_file(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+            entries.append(entry)
+            self.records[task.id] = entry
+        self._append(entries)
+
+    def _append(self, entries: List[dict]):
+        stamp = datetime.now().isoformat()
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps({**entry, "timestamp": stamp}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
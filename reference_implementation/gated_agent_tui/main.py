@@ -3,6 +3,8 @@ import sys
 import argparse
 from pathlib import Path
 from .ui.menu import Dashboard
+from gap.core.session_log import get_session_log
+from gap.core.trace import enable as enable_tracing, trace_target
 
 def main():
     parser = argparse.ArgumentParser(
@@ -25,6 +27,25 @@ def main():
         "--model",
         help="Model identifier (e.g., 'openrouter/qwen/qwen-2.5-coder-32b-instruct')"
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Independent tasks (reference) or windows (gptme) run concurrently (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip tasks completed by a previous execution run whose artifacts are unchanged"
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="",
+        default=trace_target(os.environ.get("GAP_TRACE")),
+        metavar="PATH",
+        help="Record execution spans; writes Chrome trace JSON (default: .gap/traces/<session>.trace.json) and prints a summary"
+    )
     
     args = parser.parse_args()
     
@@ -38,9 +59,18 @@ def main():
         print("Error: OPENROUTER_KEY not set.")
         sys.exit(1)
         
-    dashboard = Dashboard(root, api_key, driver=args.driver, model=args.model)
+    dashboard = Dashboard(root, api_key, driver=args.driver, model=args.model, jobs=args.jobs, resume=args.resume)
 
-    dashboard.main_loop()
+    tracer = enable_tracing() if args.trace is not None else None
+    try:
+        dashboard.main_loop()
+    finally:
+        if tracer:
+            trace_path = Path(args.trace) if args.trace else \
+                root / ".gap/traces" / f"{get_session_log(root).session_id}.trace.json"
+            tracer.write_chrome_trace(trace_path)
+            print(f"\n📈 Trace Summary\n{tracer.format_summary()}")
+            print(f"   Chrome trace written to {trace_path}")
 
 if __name__ == "__main__":
     main()
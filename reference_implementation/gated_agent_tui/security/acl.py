@@ -1,25 +1,20 @@
 from pathlib import Path
+import hashlib
 import re
 import yaml
+from typing import Dict, Optional, Tuple
+from gap.core.acl import AccessControlList
 
-def parse_acl(root: Path) -> set:
-    """
-    Extracts ACL YAML from specs/tasks.md.
-    Returns a set of allowed filenames.
-    """
-    p = root / "specs/tasks.md"
-    if not p.exists():
-        return set()
-        
-    with open(p, "r") as f:
-        content = f.read()
-    
-    # Extract YAML block under ## Access Control
-    # Pattern looks for ## Access Control\n```yaml\n(content)\n```
-    pattern = r"## Access Control\s+```yaml\n(.*?)\n```"
-    match = re.search(pattern, content, re.DOTALL)
-    
+ACL_PATTERN = re.compile(r"## Access Control\s+```yaml\n(.*?)\n```", re.DOTALL)
+
+# SYSTEM ARTIFACTS (Implicitly Whitelisted)
+SYSTEM_ARTIFACTS = {"walkthrough.md"}
+
+
+def extract_acl_rules(content: str) -> set:
+    """Extracts the allow_write list from the YAML block under ## Access Control."""
     allowed_files = set()
+    match = ACL_PATTERN.search(content)
     if match:
         yaml_str = match.group(1)
         try:
@@ -29,8 +24,64 @@ def parse_acl(root: Path) -> set:
                 print(f"🔒 ACL Loaded: {len(allowed_files)} file(s) whitelisted.")
         except Exception as e:
             print(f"⚠️ Failed to parse ACL: {e}")
-    
-    # SYSTEM ARTIFACTS (Implicitly Whitelisted)
-    allowed_files.add("walkthrough.md")
-    
-    return allowed_files
+    return allowed_files | SYSTEM_ARTIFACTS
+
+
+class AclLoader:
+    """
+    Loads the ACL from specs/tasks.md and caches it.
+    A stat() (mtime/size) decides whether the file may have changed; the content
+    hash decides whether the policy actually changed. Only then is it re-parsed
+    and a new AccessControlList version issued.
+    """
+    def __init__(self, root: Path):
+        self.path = root / "specs/tasks.md"
+        self._stat: Optional[Tuple[int, int]] = None
+        self._acl: Optional[AccessControlList] = None
+
+    def load(self) -> AccessControlList:
+        try:
+            st = self.path.stat()
+            stat_key = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stat_key = None
+
+        if self._acl is not None and stat_key == self._stat:
+            return self._acl
+
+        if stat_key is None:
+            digest, rules = None, set()
+        else:
+            raw = self.path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if self._acl is not None and digest == self._acl.digest:
+                self._stat = stat_key
+                return self._acl
+            rules = extract_acl_rules(raw.decode("utf-8"))
+
+        version = self._acl.version + 1 if self._acl is not None else 1
+        self._acl = AccessControlList(rules, version=version, digest=digest)
+        self._stat = stat_key
+        return self._acl
+
+
+_loaders: Dict[str, AclLoader] = {}
+
+
+def get_acl_loader(root: Path) -> AclLoader:
+    key = str(Path(root).resolve())
+    loader = _loaders.get(key)
+    if loader is None:
+        loader = _loaders[key] = AclLoader(root)
+    return loader
+
+
+def parse_acl(root: Path) -> set:
+    """
+    Extracts ACL YAML from specs/tasks.md.
+    Returns a set of allowed filenames (cached until the spec changes).
+    """
+    p = root / "specs/tasks.md"
+    if not p.exists():
+        return set()
+    return set(get_acl_loader(root).load().rules)
@@ -1,30 +1,28 @@
-import json
-from datetime import datetime
 from pathlib import Path
+from gap.core.session_log import get_session_log
+from gap.core.trace import span
 
 class InteractionManager:
     def __init__(self, root: Path):
         self.root = root
         
-        # Session Logging
-        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_dir = self.root / ".gap/sessions"
-        self.session_log_file = self.log_dir / f"{self.session_id}.log.jsonl"
+        # Session Logging (shared with GatedLLM)
+        self.session_log = get_session_log(self.root)
+        self.session_id = self.session_log.session_id
+        self.log_dir = self.session_log.log_dir
+        self.session_log_file = self.session_log.path
 
     def log(self, entry):
-        if not self.log_dir.exists():
-            self.log_dir.mkdir(parents=True, exist_ok=True)
-            
-        entry['timestamp'] = datetime.now().isoformat()
-        with open(self.session_log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        self.session_log.log(entry)
 
     def ask_human(self, task_id, context=""):
-        print(f"\n✋ GAP INTERRUPTION: Authorization Required for '{task_id}'")
-        if context:
-            print(f"   Context: {context}")
-        print(f"   >> Approve? (y/n)")
-        choice = input("   > ").strip().lower()
+        with span("human.ask", cat="human", task_id=task_id) as s:
+            print(f"\n✋ GAP INTERRUPTION: Authorization Required for '{task_id}'")
+            if context:
+                print(f"   Context: {context}")
+            print(f"   >> Approve? (y/n)")
+            choice = input("   > ").strip().lower()
+            s.set(choice=choice)
         
         self.log({
             "type": "human_interaction",
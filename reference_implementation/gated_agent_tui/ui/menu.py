@@ -1,22 +1,25 @@
 import sys
 import os
 from pathlib import Path
-from ..core.flow import FlowStep, Task, parse_tasks
+from ..core.flow import FlowStep, Task, TaskGraphError, load_task_graph
 from ..core.state import load_manifest, get_ledger, CheckpointStrategy, StepStatus
 from ..agent.llm import GatedLLM
 from ..agent.context import ContextManager
 from ..agent.prompts import Prompts
 from ..core.bridge import FileSystemBridge
 from ..core.harness import HarnessFactory
+from gap.core.policy import get_policy_engine
 from .interaction import InteractionManager
 
 
 class Dashboard:
-    def __init__(self, root: Path, api_key: str, driver: str = "reference", model: str = None):
+    def __init__(self, root: Path, api_key: str, driver: str = "reference", model: str = None, jobs: int = 1, resume: bool = False):
         self.root = root
         self.api_key = api_key
         self.driver = driver  # 'reference' or 'gptme'
         self.model = model
+        self.jobs = jobs
+        self.resume = resume
         self.llm = GatedLLM(root, api_key)
         self.context_mgr = ContextManager(root)
         self.io = FileSystemBridge(root)
@@ -33,13 +36,10 @@ class Dashboard:
                 (root / ".gap").mkdir(exist_ok=True)
             self.ledger = get_ledger(root, self.manifest)
         
-        # Load ACL (Lazy)
-        from ..security.acl import parse_acl
-        self.io.acl_whitelist = parse_acl(root)
-        
-        # Load ACL (Lazy)
-        from ..security.acl import parse_acl
-        self.io.acl_whitelist = parse_acl(root)
+        # Load ACL (cached; re-parsed only when specs/tasks.md changes)
+        from ..security.acl import get_acl_loader
+        self.acl_loader = get_acl_loader(root)
+        self.io.acl = self.acl_loader.load()
 
     def main_loop(self):
         driver_label = "🔥 GPTme (Live)" if self.driver == "gptme" else "📋 Reference (Classic)"
@@ -234,7 +234,15 @@ class Dashboard:
         
         # 1. Parse Tasks from the Alignment Artifact
         tasks_path = self.root / "specs/tasks.md"
-        tasks = parse_tasks(tasks_path)
+        graph = load_task_graph(tasks_path)
+        try:
+            runnable = {t.id for t in graph.pending()}
+            tasks = [t for t in graph.topological_order() if t.id in runnable]
+        except TaskGraphError as e:
+            print(f"🛑 {e}")
+            return
+        for task_id, dep in graph.missing_dependencies():
+            print(f"⚠️  Task {task_id} depends on unknown task {dep}.")
         
         if not tasks:
             print("🛑 No tasks found in specs/tasks.md. Have you completed Alignment?")
@@ -247,12 +255,16 @@ class Dashboard:
         driver_label = "🔥 GPTme" if self.driver == "gptme" else "📋 Reference"
         print(f"🚀 Using Driver: {driver_label}")
         
-        harness = HarnessFactory.create(h_type, self.root, self.api_key, model=self.model)
+        harness = HarnessFactory.create(h_type, self.root, self.api_key, model=self.model, concurrency=self.jobs,
+                                        resume=self.resume)
         
-        # 3. Load Checkpoints from Manifest
-        checkpoints = []
-        if self.manifest.checkpoints:
-            checkpoints = self.manifest.checkpoints.after_tasks
+        # 3. Load Checkpoints (task list markers + project law with session exceptions)
+        checkpoints = list(graph.checkpoints)
+        resolver = get_policy_engine(self.root, self.manifest_path).resolver
+        policy = resolver.resolve().policy
+        if policy.session_id:
+            print(f"⚖️  Session '{policy.session_id}' exceptions in force: mode={policy.mode}, checkpoints={policy.checkpoint_strategy}")
+        checkpoints += [t for t in resolver.checkpoints([t.id for t in tasks]) if t not in checkpoints]
         
         # 4. Execute
         success = harness.execute(tasks, checkpoints=checkpoints)
@@ -262,9 +274,8 @@ class Dashboard:
         else:
              print("\n⚠️ Execution failed or was halted.")
 
-        # Reload ACL
-        from ..security.acl import parse_acl
-        self.io.acl_whitelist = parse_acl(self.root)
+        # Reload ACL (no-op unless the spec changed)
+        self.io.acl = self.acl_loader.load()
 
         
     def run_phase_verification(self):
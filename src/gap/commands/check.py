@@ -1,21 +1,26 @@
 import typer
 from pathlib import Path
-from gap.core.manifest import load_manifest
+from gap.core.inheritance import resolve_manifest
 from gap.core.state import StepStatus
 from gap.core.factory import get_ledger
 from gap.core.validator import ManifestValidator
+from gap.core.traceability import TraceabilityAuditor
+from gap.core.merkle import MerkleTree
+from gap.core.journal import JournalVerifier
 
 app = typer.Typer(help="Verify protocol compliance.")
 
 @app.command("status")
 def status(
-    path: Path = typer.Argument(..., help="Path to manifest.yaml")
+    path: Path = typer.Argument(..., help="Path to manifest.yaml"),
+    verify: bool = typer.Option(False, "--verify", help="Confirm approved artifacts are unchanged (.gap/merkle.json)."),
+    deep: bool = typer.Option(False, "--deep", help="Re-verify the whole ledger chain and, with --verify, rehash every file."),
 ):
     """
     Check the status of a GAP Project.
     """
     try:
-        manifest = load_manifest(path)
+        manifest = resolve_manifest(path)
         root = path.parent
         ledger = get_ledger(root, manifest)
         state = ledger.get_status(manifest)
@@ -56,6 +61,49 @@ def status(
         typer.secho(f"Error: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+    chain_ok = _verify_chain(path.parent, deep)
+    if verify:
+        _verify_integrity(path.parent, deep)
+    if not chain_ok:
+        raise typer.Exit(code=1)
+
+
+def _verify_chain(root: Path, full: bool) -> bool:
+    report = JournalVerifier(root).verify(full=full)
+    if not report.exists:
+        return True
+    if report.ok:
+        typer.secho(f"🔗 Ledger chain: intact — {report.total} entries, head {report.head[:12]} "
+                    f"({report.checked} newly verified)", fg=typer.colors.GREEN)
+        return True
+    typer.secho("⛓️‍💥 Ledger chain: TAMPERED", fg=typer.colors.RED)
+    for error in report.errors:
+        typer.secho(f"   └─ {error}", fg=typer.colors.RED)
+    return False
+
+
+def _verify_integrity(root: Path, deep: bool):
+    tree = MerkleTree.load(root)
+    if tree.root_hash is None:
+        typer.echo("🔐 Integrity: no sealed artifacts yet (sealed by 'gap gate approve' / 'gap scribe create').")
+        return
+
+    result = tree.verify(deep=deep)
+    if tree.stale_stats:
+        tree.save()
+
+    typer.echo("-" * 40)
+    if result.intact:
+        typer.secho(f"🔐 Integrity: intact — root {result.expected[:12]} ({result.files} files, {result.rehashed} rehashed)",
+                    fg=typer.colors.GREEN)
+        return
+
+    typer.secho(f"🔓 Integrity: CHANGED — root {result.expected[:12]} → {(result.actual or 'empty')[:12]}", fg=typer.colors.RED)
+    for label, paths in (("modified", result.modified), ("added", result.added), ("removed", result.removed)):
+        for p in paths:
+            typer.secho(f"   {label:<8} {p}", fg=typer.colors.RED)
+    raise typer.Exit(code=1)
+
 
 @app.command("manifest")
 def check_manifest(
@@ -66,7 +114,7 @@ def check_manifest(
     Detects circular dependencies, missing references, and other configuration errors.
     """
     try:
-        manifest = load_manifest(path)
+        manifest = resolve_manifest(path)
         validator = ManifestValidator()
         errors = validator.validate(manifest)
         
@@ -90,3 +138,49 @@ def check_manifest(
     except Exception as e:
         typer.secho(f"Error: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
+
+
+@app.command("trace")
+def check_trace(
+    path: Path = typer.Argument(..., help="Path to manifest.yaml"),
+    full: bool = typer.Option(False, "--full", help="Recheck every block instead of only those affected by changes."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update .gap/cache/trace.json."),
+):
+    """
+    Audit traceability: Tasks -> Design Properties -> Requirements.
+    Fails on citations of unknown IDs; orphaned intent is reported as a warning.
+    Only blocks affected by artifact changes since the last audit are rechecked.
+    """
+    try:
+        manifest = resolve_manifest(path)
+    except Exception as e:
+        typer.secho(f"Error: {e}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    auditor = TraceabilityAuditor(path.parent, manifest, use_cache=not no_cache)
+    violations = auditor.audit(full=full)
+    stats = auditor.stats
+    errors = [v for v in violations if v.severity == "error"]
+
+    for v in violations:
+        color = typer.colors.RED if v.severity == "error" else typer.colors.YELLOW
+        typer.secho(f"  • {v.message}", fg=color)
+
+    if stats["incremental"] and (auditor.new or auditor.resolved):
+        typer.echo(f"🔁 Since last audit: {len(auditor.new)} new, {len(auditor.resolved)} resolved")
+        for v in auditor.new:
+            typer.secho(f"   + {v.message}", fg=typer.colors.RED if v.severity == "error" else typer.colors.YELLOW)
+        for v in auditor.resolved:
+            typer.secho(f"   - {v.message}", fg=typer.colors.GREEN)
+
+    mode = "incremental" if stats["incremental"] else "full"
+    summary = (f"{stats['files']} artifacts ({stats['tokenized']} re-indexed), {stats['ids']} IDs, "
+               f"{stats['citations']} citations; {mode} check of {stats['rechecked']} blocks in "
+               f"{stats['seconds'] * 1000:.0f} ms")
+    if errors:
+        typer.secho(f"❌ Traceability audit failed: {len(errors)} errors, {len(violations) - len(errors)} warnings", fg=typer.colors.RED)
+        typer.echo(f"   {summary}")
+        raise typer.Exit(code=1)
+
+    typer.secho(f"✅ Traceability intact ({len(violations)} warnings)", fg=typer.colors.GREEN)
+    typer.echo(f"   {summary}")
@@ -0,0 +1,80 @@
+import typer
+import json
+from pathlib import Path
+from typing import List
+
+from gap.core.checkpoint import CheckpointVerifier, Verdict
+
+app = typer.Typer(help="Runtime execution gates.")
+
+MESSAGES = {
+    "approved": "✅ Pass: '{phase}' checkpoint for {task_id} approved by {approver}.",
+    "not_required": "🟢 Proceeding: No '{phase}' checkpoint required for {task_id}.",
+    "pending": "🛑 Checkpoint Reached: {task_id} at phase '{phase}'",
+    "unplanned": "🛑 Blocked: Task '{task_id}' is not authorized in the Plan envelope.",
+    "no_plan": "🛑 Blocked: No plan.yaml found. Cannot authorize execution.",
+    "invalid_plan": "🛑 Blocked: Invalid plan.yaml format: {detail}",
+}
+
+
+def _parse_checks(targets: List[str], phase: str) -> List[tuple]:
+    """`T-1` uses --phase; `T-1:after_completion` names its own phase."""
+    checks = []
+    for target in targets:
+        task_id, sep, task_phase = target.partition(":")
+        checks.append((task_id, task_phase if sep and task_phase else phase))
+    return checks
+
+
+def _report(verdict: Verdict):
+    color = typer.colors.GREEN if verdict.allowed else typer.colors.RED
+    typer.secho(MESSAGES[verdict.reason].format(**verdict._asdict()), fg=color)
+    if verdict.reason == "pending":
+        typer.secho("   Action Required by Supervisor:", fg=typer.colors.YELLOW)
+        typer.secho(f"   $ gap checkpoint approve {verdict.task_id} --phase {verdict.phase}", fg=typer.colors.YELLOW)
+
+
+@app.command("verify")
+def verify(
+    targets: List[str] = typer.Argument(..., help="Task ids (e.g. 'T-1'), optionally with a phase ('T-1:after_completion')."),
+    phase: str = typer.Option("before_start", "--phase", "-p", help="The checkpoint phase (e.g. 'before_start', 'after_completion')"),
+    manifest_path: Path = typer.Option(Path("manifest.yaml"), "--manifest", "-m", help="Path to manifest.yaml"),
+    raw: bool = typer.Option(False, "--json", help="Print one JSON verdict per line."),
+):
+    """
+    Check if the Agent is allowed to proceed past checkpoints.
+    Any number of task/phase pairs is answered in one call.
+    Exits with code 0 (all Allowed) or 1 (any Blocked).
+    """
+    verifier = CheckpointVerifier(manifest_path.parent, manifest_path=manifest_path)
+    verdicts = verifier.verify_many(_parse_checks(targets, phase))
+
+    for verdict in verdicts:
+        if raw:
+            typer.echo(json.dumps(verdict._asdict()))
+        else:
+            _report(verdict)
+
+    if not all(v.allowed for v in verdicts):
+        raise typer.Exit(code=1)
+
+
+@app.command("approve")
+def approve(
+    task_id: str = typer.Argument(..., help="The ID of the task to approve (e.g. 'T-1')"),
+    phase: str = typer.Option("before_start", "--phase", "-p", help="The checkpoint phase to clear"),
+    manifest_path: Path = typer.Option(Path("manifest.yaml"), "--manifest", "-m", help="Path to manifest.yaml")
+):
+    """
+    Manually approve a task checkpoint, clearing it in the ledger.
+    """
+    verifier = CheckpointVerifier(manifest_path.parent, manifest_path=manifest_path)
+    required = verifier.required(task_id)
+    if required is None:
+        typer.secho(f"Error: Task '{task_id}' has no envelope in .gap/plan.yaml.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    if phase not in required:
+        typer.secho(f"⚠️  '{phase}' is not a planned checkpoint for {task_id}; recording the approval anyway.", fg=typer.colors.YELLOW)
+
+    verifier.approve(task_id, phase)
+    typer.secho(f"✅ Cleared '{phase}' checkpoint for {task_id}", fg=typer.colors.GREEN)
@@ -4,10 +4,14 @@ import yaml
 import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
-from gap.core.manifest import load_manifest
+from gap.core.inheritance import resolve_manifest
 from gap.core.state import StepStatus
 from gap.core.factory import get_ledger
+from gap.core.merkle import MerkleTree
+from gap.core.diff import diff_files
+from gap.core.proposals import ProposalStore
 
 app = typer.Typer(help="Manage approvals and state transitions.")
 
@@ -42,6 +46,89 @@ def list_proposals(
         rel = p.relative_to(proposal_dir)
         typer.echo(f" - {rel}")
 
+@app.command("diff")
+def diff(
+    step: str = typer.Argument(..., help="The step whose proposal to review."),
+    manifest_path: Path = typer.Option(Path("manifest.yaml"), "--manifest", "-m", help="Path to manifest.yaml"),
+    context: int = typer.Option(3, "--context", "-U", help="Unchanged lines shown around each change."),
+):
+    """
+    Show what approving a proposal would change in the live artifact.
+    """
+    if not manifest_path.exists():
+        typer.secho(f"Error: Manifest not found.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    manifest = resolve_manifest(manifest_path)
+    root = manifest_path.parent
+    step_def = next((s for s in manifest.flow if s.step == step), None)
+    if not step_def:
+        typer.secho(f"Error: Step '{step}' not found in manifest.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    proposal_path = root / ".gap/proposals" / step_def.artifact
+    if not proposal_path.is_file():
+        typer.secho(f"Error: No proposal found for step '{step}' at {proposal_path}.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    # Known hashes (sealed live file, recorded draft) save rehashing either side
+    live_path = root / step_def.artifact
+    live_hash = MerkleTree.load(root).file_hash(step_def.artifact)
+    proposal_hash = ProposalStore(root).current(step, step_def.artifact)
+    result = diff_files(live_path, proposal_path, context=max(context, 0), old_sha256=live_hash, new_sha256=proposal_hash)
+    if result.identical:
+        typer.secho(f"✅ Proposal for '{step}' is identical to {step_def.artifact}.", fg=typer.colors.GREEN)
+        return
+
+    colors = {"+": typer.colors.GREEN, "-": typer.colors.RED, "@": typer.colors.CYAN}
+    old_name = f"a/{step_def.artifact}" if live_path.exists() else "/dev/null"
+    for line in result.unified(old_name, f"b/{step_def.artifact}"):
+        typer.secho(line, fg=None if line[:3] in ("---", "+++") else colors.get(line[:1]))
+    if not result.binary:
+        typer.echo(f"📝 {step_def.artifact}: +{result.added} -{result.removed}")
+
+@app.command("history")
+def history(
+    step: str = typer.Argument(..., help="The step whose drafts to list."),
+    manifest_path: Path = typer.Option(Path("manifest.yaml"), "--manifest", "-m", help="Path to manifest.yaml"),
+    restore: Optional[str] = typer.Option(None, "--restore", help="Check out the draft with this hash (prefix) as the proposal."),
+):
+    """
+    List the drafts proposed for a step, or restore one of them.
+    """
+    if not manifest_path.exists():
+        typer.secho(f"Error: Manifest not found.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    manifest = resolve_manifest(manifest_path)
+    root = manifest_path.parent
+    step_def = next((s for s in manifest.flow if s.step == step), None)
+    if not step_def:
+        typer.secho(f"Error: Step '{step}' not found in manifest.", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    store = ProposalStore(root)
+    if restore:
+        try:
+            sha = store.resolve(step, restore)
+            store.restore(step, step_def.artifact, sha)
+        except (KeyError, OSError, ValueError) as e:
+            typer.secho(f"Error: {e.args[0] if isinstance(e, KeyError) else e}", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+        typer.secho(f"↩️  Restored draft {sha[:12]} to {store.working_copy(step_def.artifact)}", fg=typer.colors.GREEN)
+        return
+
+    drafts = store.history(step)
+    if not drafts:
+        typer.echo(f"No drafts recorded for '{step}'.")
+        return
+    current = store.current(step, step_def.artifact)
+    checked_out = max((i for i, e in enumerate(drafts) if e["sha256"] == current), default=None)
+    typer.echo(f"📜 Drafts for '{step}' ({step_def.artifact}):")
+    for i, entry in enumerate(drafts):
+        marker = "*" if i == checked_out else " "
+        typer.echo(f" {marker} {entry['sha256'][:12]}  {entry['timestamp'][:19]}  {entry['source']:<8} {entry['size']:>8} B")
+
 @app.command("approve")
 def approve(
     step: str = typer.Argument(..., help="The step name to approve (e.g. 'design_course')."),
@@ -58,7 +145,7 @@ def approve(
         typer.secho(f"Error: Manifest not found.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
         
-    manifest = load_manifest(manifest_path)
+    manifest = resolve_manifest(manifest_path)
     root = manifest_path.parent
     
     # 2. Find Step
@@ -74,6 +161,9 @@ def approve(
         typer.secho(f"Error: No proposal found for step '{step}' at {proposal_path}.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
     
+    # Keep hand edits made to the draft in its history before it leaves proposals/
+    ProposalStore(root).snapshot(step, step_def.artifact)
+
     # 4. Move to Live (The Gate) - with atomic rollback
     target_path = root / step_def.artifact
     backup_path = None
@@ -91,6 +181,11 @@ def approve(
         # Update ledger (State Persistence)
         ledger = get_ledger(root, manifest)
         ledger.update_status(step, StepStatus.COMPLETE, approver="user")
+
+        # Seal the approved content in the integrity tree
+        tree = MerkleTree.load(root)
+        tree.seal(step_def)
+        tree.save()
         
         # Success - remove backup
         if backup_path and backup_path.exists():
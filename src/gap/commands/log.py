@@ -0,0 +1,100 @@
+import typer
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+from gap.core.log_index import LogIndex
+
+app = typer.Typer(help="Query session history.")
+
+
+def _summary(entry: dict, width: int = 80) -> str:
+    if entry.get("type") == "human_interaction":
+        text = f"choice={entry.get('choice')}"
+    else:
+        text = entry.get("prompt") or entry.get("response") or ""
+    text = " ".join(str(text).split())
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        typer.secho(f"Error: Invalid timestamp '{value}' (expected ISO format).", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+
+def _open_index(root: Path) -> LogIndex:
+    log_dir = root / ".gap/sessions"
+    if not log_dir.exists():
+        typer.echo("No session logs found.")
+        raise typer.Exit(code=0)
+    index = LogIndex(log_dir)
+    index.update()
+    return index
+
+
+@app.callback(invoke_without_command=True)
+def show(
+    ctx: typer.Context,
+    root: Path = typer.Option(Path("."), "--root", "-r", help="Project root containing .gap/"),
+    session: Optional[str] = typer.Option(None, "--session", "-s", help="Only entries from this session."),
+    entry_type: Optional[str] = typer.Option(None, "--type", "-t", help="Entry type (e.g. 'llm_interaction')."),
+    task_id: Optional[str] = typer.Option(None, "--task", help="Only entries for this task id."),
+    since: Optional[str] = typer.Option(None, "--since", help="ISO timestamp lower bound."),
+    until: Optional[str] = typer.Option(None, "--until", help="ISO timestamp upper bound."),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", help="Maximum number of entries."),
+    raw: bool = typer.Option(False, "--json", help="Print raw JSON lines."),
+):
+    """
+    Display session history from .gap/sessions/ (indexed, streamed).
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
+    index = _open_index(root)
+    try:
+        results = index.query(
+            session=session,
+            type=entry_type,
+            task_id=task_id,
+            since=_parse_time(since),
+            until=_parse_time(until),
+            limit=limit,
+        )
+        found = False
+        for entry in results:
+            found = True
+            if raw:
+                typer.echo(json.dumps(entry))
+                continue
+            task = f" {entry['task_id']}" if entry.get("task_id") else ""
+            typer.echo(f"{entry.get('timestamp', '?')} [{entry.get('type', '?')}]{task}: {_summary(entry)}")
+        if not found:
+            typer.echo("No matching entries.")
+    finally:
+        index.close()
+
+
+@app.command("sessions")
+def sessions(
+    root: Path = typer.Option(Path("."), "--root", "-r", help="Project root containing .gap/"),
+):
+    """
+    List recorded sessions with entry counts and time ranges.
+    """
+    index = _open_index(root)
+    try:
+        rows = index.sessions()
+        if not rows:
+            typer.echo("No sessions recorded.")
+            return
+        typer.echo("📜 Sessions:")
+        for session_id, count, first, last in rows:
+            typer.echo(f" - {session_id}: {count} entries ({first} → {last})")
+    finally:
+        index.close()
@@ -1,15 +1,19 @@
 import typer
 import sys
+import hashlib
 import json
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 from jinja2 import Environment, FileSystemLoader
 
-from gap.core.manifest import load_manifest
+from gap.core.inheritance import resolve_manifest
 from gap.core.state import StepStatus
 from gap.core.path import PathManager
 from gap.core.factory import get_ledger
+from gap.core.merkle import MerkleTree
+from gap.core.proposals import ProposalStore
+from gap.core.scribe_cache import ScribeCache
 
 app = typer.Typer(help="Generate artifacts from templates.")
 
@@ -38,7 +42,8 @@ def create(
     step: str = typer.Argument(..., help="Name of the step to run (e.g. 'design_course')."),
     manifest_path: Path = typer.Option(Path("manifest.yaml"), "--manifest", "-m", help="Path to manifest.yaml"),
     force: bool = typer.Option(False, "--force", "-f", help="Bypass state checks."),
-    dry_run: bool = typer.Option(False, "--dry-run", help="Print output to stdout instead of writing file.")
+    dry_run: bool = typer.Option(False, "--dry-run", help="Print output to stdout instead of writing file."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Render even if the template and input are unchanged.")
 ):
     """
     Generate an artifact from a template.
@@ -48,7 +53,7 @@ def create(
         typer.secho(f"Error: Manifest not found.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
         
-    manifest = load_manifest(manifest_path)
+    manifest = resolve_manifest(manifest_path)
     root = manifest_path.parent
     
     # 2. Check State
@@ -107,42 +112,59 @@ def create(
             typer.secho(f"Error: Could not resolve template for '{step}'.", fg=typer.colors.RED)
             raise typer.Exit(code=1)
 
-    # 5. Render Content
+    # 5. Render Content (memoized on template, dependencies and input)
     data = read_input_data()
     # Inject Standard Variables
     data['project_name'] = manifest.name
     data['step_name'] = step_def.name
-    
+
+    target_path = root / step_def.artifact
+    store = ProposalStore(root)
+    cache = ScribeCache(root)
+    key = None if (dry_run or no_cache) else cache.key(template_path, data, step_def.artifact, step_def.gate)
+    cached = cache.lookup(step, key)
+    if cached:
+        if step_def.gate and store.current(step, step_def.artifact) == cached:
+            typer.secho(f"⚡ Cache hit: proposal for '{step}' is up to date (draft {cached[:12]}).", fg=typer.colors.BLUE)
+            return
+        if MerkleTree.load(root).file_hash(step_def.artifact) == cached:
+            typer.secho(f"⚡ Cache hit: {target_path} is up to date.", fg=typer.colors.BLUE)
+            return
+
     env = Environment(loader=FileSystemLoader(str(template_path.parent)))
     template = env.get_template(template_path.name)
     rendered_content = template.render(**data)
     
     # 6. Write (The Gate)
-    target_path = root / step_def.artifact
-    
     if dry_run:
         typer.echo(f"--- Dry Run: {target_path} ---")
         typer.echo(rendered_content)
         return
 
     # Write Directly to Proposal or Live
+    content = rendered_content.encode("utf-8")
+    content_hash = hashlib.sha256(content).hexdigest()
+    tree = MerkleTree.load(root)
+    if tree.file_hash(step_def.artifact) == content_hash:
+        cache.record(step, key, content_hash)
+        cache.save()
+        typer.secho(f"⏭️  Already live: {target_path} has identical content.", fg=typer.colors.BLUE)
+        return
 
     if step_def.gate:  # gate: true = requires approval
-        # Write to Proposal
-        proposal_dir = root / ".gap/proposals"
-        proposal_dir.mkdir(parents=True, exist_ok=True)
-        # We keep the directory structure of the artifact
+        # Write to Proposal: the draft is stored by content hash and checked out
+        # under .gap/proposals/, keeping the directory structure of the artifact
         # e.g. artifacts/design.md -> .gap/proposals/artifacts/design.md
-        # This handles nested artifacts correctly.
-        proposal_write_path = proposal_dir / step_def.artifact
-        
-        # Ensure parent dirs exist in proposals
-        proposal_write_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(proposal_write_path, "w") as f:
-            f.write(rendered_content)
-            
-        typer.secho(f"📝 Proposal written to: {proposal_write_path}", fg=typer.colors.YELLOW)
+        proposal_write_path = store.working_copy(step_def.artifact)
+        sha, written = store.propose(step, step_def.artifact, content)
+        cache.record(step, key, sha)
+        cache.save()
+
+        if not written:
+            typer.secho(f"⏭️  Already proposed: {proposal_write_path} is unchanged (draft {sha[:12]}).", fg=typer.colors.BLUE)
+            return
+
+        typer.secho(f"📝 Proposal written to: {proposal_write_path} (draft {sha[:12]})", fg=typer.colors.YELLOW)
         typer.echo("Run 'gap gate list' to see pending proposals.")
         
     else:  # gate: false = autonomous
@@ -150,4 +172,8 @@ def create(
         target_path.parent.mkdir(parents=True, exist_ok=True)
         with open(target_path, "w") as f:
             f.write(rendered_content)
+        tree.seal(step_def)
+        tree.save()
+        cache.record(step, key, tree.file_hash(step_def.artifact))
+        cache.save()
         typer.secho(f"✅ Scribed to Live: {target_path}", fg=typer.colors.GREEN)
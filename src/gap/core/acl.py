@@ -0,0 +1,185 @@
+"""
+Compiled ACL matcher for `allow_write` rules (see docs/acl-specification.md).
+
+Rules are compiled once into a prefix trie over path segments:
+- Literal rules (`src/main.py`) mark a trie node as an exact match.
+- Directory rules (`docs/updates/`) mark a node as matching its whole subtree.
+- Glob rules are split at their first wildcard segment; the literal prefix
+  selects the trie node and the wildcard remainder joins that node's single
+  combined regex.
+- Rules without a `/` match the file name at any depth (`walkthrough.md`, `*.md`).
+
+Glob semantics: `*` and `?` never cross `/`, `**/` matches zero or more
+directories, a trailing `**` matches everything below, `[...]` / `[!...]`
+are character classes.
+"""
+import posixpath
+import re
+from typing import Dict, Iterable, List, Optional
+
+GLOB_CHARS = frozenset("*?[")
+
+
+def is_glob(pattern: str) -> bool:
+    return any(c in GLOB_CHARS for c in pattern)
+
+
+def normalize_path(path: str) -> str:
+    """Project-relative POSIX form: 'src//a/./b.py' -> 'src/a/b.py'."""
+    norm = posixpath.normpath(path.replace("\\", "/"))
+    return norm.lstrip("/") if norm != "." else ""
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate one glob (relative to its trie node) to a regex body for fullmatch."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob.startswith("**", i):
+                at_segment_start = i == 0 or glob[i - 1] == "/"
+                if at_segment_start and glob.startswith("**/", i):
+                    out.append("(?:[^/]+/)*")
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    out.append(".+")
+                    i += 2
+                    continue
+                out.append("[^/]*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = glob.find("]", i + 2)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class _Node:
+    __slots__ = ("children", "exact", "subtree", "globs", "regex")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.exact = False
+        self.subtree = False
+        self.globs: List[str] = []
+        self.regex = None
+
+
+class AclMatcher:
+    """Answers `path in matcher` for a fixed rule set."""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns = sorted(set(patterns))
+        self._root = _Node()
+        self._names = set()
+        name_globs = []
+
+        for pattern in self.patterns:
+            pattern = pattern.strip()
+            directory = pattern.endswith("/")
+            rule = normalize_path(pattern)
+            if not rule:
+                continue
+            if "/" not in rule and not directory:
+                if is_glob(rule):
+                    name_globs.append(glob_to_regex(rule))
+                else:
+                    self._names.add(rule)
+                continue
+
+            segments = rule.split("/")
+            node = self._root
+            for k, segment in enumerate(segments):
+                if is_glob(segment):
+                    node.globs.append(glob_to_regex("/".join(segments[k:])))
+                    break
+                node = node.children.setdefault(segment, _Node())
+            else:
+                if directory:
+                    node.subtree = True
+                else:
+                    node.exact = True
+
+        self._name_regex = re.compile("|".join(f"(?:{g})" for g in name_globs)) if name_globs else None
+        self._compile(self._root)
+
+    def _compile(self, node: _Node):
+        if node.globs:
+            node.regex = re.compile("|".join(f"(?:{g})" for g in node.globs))
+        for child in node.children.values():
+            self._compile(child)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def __contains__(self, path: str) -> bool:
+        return self.matches(path)
+
+    def matches(self, path: str) -> bool:
+        rel = normalize_path(path)
+        if not rel:
+            return False
+        parts = rel.split("/")
+
+        name = parts[-1]
+        if name in self._names:
+            return True
+        if self._name_regex is not None and self._name_regex.fullmatch(name):
+            return True
+
+        node: Optional[_Node] = self._root
+        for i, part in enumerate(parts):
+            if node.subtree:
+                return True
+            if node.regex is not None and node.regex.fullmatch("/".join(parts[i:])):
+                return True
+            node = node.children.get(part)
+            if node is None:
+                return False
+        return node.exact
+
+
+class AccessControlList:
+    """
+    An immutable, versioned ACL snapshot: the rules, the compiled matcher and
+    the content digest they were parsed from. Holders compare `version` (or
+    identity) to notice policy changes without touching the disk.
+    """
+
+    __slots__ = ("rules", "version", "digest", "matcher")
+
+    def __init__(self, rules: Iterable[str] = (), version: int = 0, digest: Optional[str] = None):
+        self.rules = frozenset(rules)
+        self.version = version
+        self.digest = digest
+        self.matcher = AclMatcher(self.rules)
+
+    def __contains__(self, path: str) -> bool:
+        return self.matcher.matches(path)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __repr__(self) -> str:
+        return f"AccessControlList(v{self.version}, {len(self.rules)} rules)"
@@ -0,0 +1,175 @@
+"""
+Runtime checkpoint gates (`gap checkpoint verify/approve`).
+
+Agents ask before and after every task whether they may proceed. The plan
+(`.gap/plan.yaml`) is compiled once into a task id -> required phases index and
+checkpoint approvals are read from the ledger in one pass into a dict keyed by
+`checkpoint:<task>:<phase>`. Both are rebuilt only when the stat metadata of
+their file changes, so a verification is two dict lookups and `verify_many()`
+answers any number of (task, phase) pairs against the same snapshot.
+
+    from gap.core.checkpoint import get_checkpoint_verifier
+
+    verifier = get_checkpoint_verifier(project_root)
+    if not verifier.verify("T-1", "after_completion").allowed:
+        ...
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+from pydantic import ValidationError
+
+from gap.core.factory import get_ledger
+from gap.core.inheritance import resolve_manifest
+from gap.core.ledger import Ledger, YamlLoader
+from gap.core.models import Plan
+from gap.core.policy import DEFAULT_TTL, stat_key
+from gap.core.state import StepData, StepStatus
+
+CHECKPOINT_PREFIX = "checkpoint:"
+
+
+def checkpoint_key(task_id: str, phase: str) -> str:
+    """Ledger step key of a checkpoint approval."""
+    return f"{CHECKPOINT_PREFIX}{task_id}:{phase}"
+
+
+class Verdict(NamedTuple):
+    task_id: str
+    phase: str
+    allowed: bool
+    reason: str  # approved | not_required | pending | unplanned | no_plan | invalid_plan
+    approver: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class PlanIndex:
+    """A compiled plan: required checkpoint phases per task id."""
+    __slots__ = ("key", "required", "error")
+
+    def __init__(self, key, required: Dict[str, FrozenSet[str]], error: Optional[str] = None):
+        self.key = key
+        self.required = required
+        self.error = error
+
+
+def compile_plan(path: Path, key=None) -> PlanIndex:
+    """Validates `.gap/plan.yaml` once; errors are kept on the index so every verification can report them."""
+    try:
+        with open(path) as f:
+            data = yaml.load(f, Loader=YamlLoader) or {}
+    except FileNotFoundError:
+        return PlanIndex(key, {}, "no_plan")
+    except yaml.YAMLError as e:
+        return PlanIndex(key, {}, f"invalid_plan: {e}")
+
+    try:
+        envelopes = (data.get("plan") if isinstance(data, dict) else None) or {}
+        if isinstance(envelopes, dict):
+            # `T-1:` with no body is an envelope without checkpoints
+            envelopes = {str(task_id): env or {} for task_id, env in envelopes.items()}
+        plan = Plan(plan=envelopes)
+    except ValidationError as e:
+        return PlanIndex(key, {}, f"invalid_plan: {e.error_count()} validation error(s)")
+    return PlanIndex(key, {task_id: frozenset(env.checkpoints) for task_id, env in plan.plan.items()})
+
+
+class CheckpointVerifier:
+    def __init__(self, root: Path, ledger: Optional[Ledger] = None, ttl: float = DEFAULT_TTL,
+                 manifest_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.root / "manifest.yaml"
+        self.plan_path = self.root / ".gap/plan.yaml"
+        self.status_path = self.root / ".gap/status.yaml"
+        self._ledger = ledger  # from get_ledger() on first use
+        self.ttl = ttl
+        self._index: Optional[PlanIndex] = None
+        self._approvals: Dict[str, StepData] = {}
+        self._approvals_key = False  # never a stat key; forces the first read
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ledger(self) -> Ledger:
+        """The project's configured ledger (resolved from the manifest the first time it is needed)."""
+        if self._ledger is None:
+            self._ledger = get_ledger(self.root, resolve_manifest(self.manifest_path))
+        return self._ledger
+
+    # --- Cache maintenance ---
+
+    def _refresh(self, force: bool = False) -> Tuple[PlanIndex, Dict[str, StepData]]:
+        index = self._index
+        now = time.monotonic()
+        if index is not None and not force and now - self._checked < self.ttl:
+            return index, self._approvals
+        with self._lock:
+            plan_key = stat_key(self.plan_path)
+            if force or self._index is None or self._index.key != plan_key:
+                self._index = compile_plan(self.plan_path, plan_key)
+            status_key = stat_key(self.status_path)
+            if force or self._approvals_key != status_key:
+                self._approvals = self.ledger.get_approvals(CHECKPOINT_PREFIX)
+                self._approvals_key = status_key
+            self._checked = time.monotonic()
+            return self._index, self._approvals
+
+    def invalidate(self) -> None:
+        self._index = None
+        self._approvals_key = False
+
+    # --- Queries ---
+
+    def required(self, task_id: str) -> Optional[FrozenSet[str]]:
+        """Phases the plan gates for a task, or None if the task has no envelope."""
+        index, _ = self._refresh()
+        return index.required.get(task_id)
+
+    def verify(self, task_id: str, phase: str) -> Verdict:
+        index, approvals = self._refresh()
+        return self._verdict(index, approvals, task_id, phase)
+
+    def verify_many(self, checks: Iterable[Tuple[str, str]]) -> List[Verdict]:
+        """Answers every (task, phase) pair against one snapshot of the plan and ledger."""
+        index, approvals = self._refresh()
+        return [self._verdict(index, approvals, task_id, phase) for task_id, phase in checks]
+
+    @staticmethod
+    def _verdict(index: PlanIndex, approvals: Dict[str, StepData], task_id: str, phase: str) -> Verdict:
+        if index.error is not None:
+            reason, _, detail = index.error.partition(": ")
+            return Verdict(task_id, phase, False, reason, detail=detail or None)
+        phases = index.required.get(task_id)
+        if phases is None:
+            return Verdict(task_id, phase, False, "unplanned")
+        if phase not in phases:
+            return Verdict(task_id, phase, True, "not_required")
+        approval = approvals.get(checkpoint_key(task_id, phase))
+        if approval is not None and approval.status == StepStatus.COMPLETE:
+            return Verdict(task_id, phase, True, "approved", approver=approval.approver)
+        return Verdict(task_id, phase, False, "pending")
+
+    # --- Transitions ---
+
+    def approve(self, task_id: str, phase: str, approver: str = "user") -> None:
+        self.ledger.update_status(checkpoint_key(task_id, phase), StepStatus.COMPLETE, approver=approver)
+        with self._lock:
+            self._approvals_key = False  # re-read on the next verification
+            self._checked = 0.0
+
+
+_verifiers: Dict[str, CheckpointVerifier] = {}
+_verifiers_lock = threading.Lock()
+
+
+def get_checkpoint_verifier(root: Path) -> CheckpointVerifier:
+    """Process-wide CheckpointVerifier per project (created on first use)."""
+    key = str(Path(root).resolve())
+    with _verifiers_lock:
+        verifier = _verifiers.get(key)
+        if verifier is None:
+            verifier = _verifiers[key] = CheckpointVerifier(Path(root))
+        return verifier
@@ -0,0 +1,413 @@
+"""
+Proposal vs live diff (`gap gate diff`).
+
+Both files are memory-mapped. Equal size and equal sha256 short-circuit to
+"identical" without splitting lines. Otherwise the common byte prefix and
+suffix are found with chunked slice comparisons on the maps. Only the changed
+window, widened to line boundaries plus context, is split into lines.
+
+Lines are interned to ints and diffed with patience anchors (lines unique on
+both sides, longest increasing subsequence). Gaps without anchors use Myers'
+linear-space (middle snake) algorithm. A gap whose edit distance exceeds
+MAX_COST is reported as replaced wholesale rather than searched further.
+
+Hunks are rendered lazily in unified format, so callers can stream them.
+"""
+import hashlib
+import mmap
+import os
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+from itertools import chain, count
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+CHUNK = 1 << 20
+SNIFF = 8192
+MAX_COST = 1024
+
+Opcode = Tuple[str, int, int, int, int]  # (tag, i1, i2, j1, j2) as in difflib
+
+
+class _TooCostly(Exception):
+    pass
+
+
+def _map(stack: ExitStack, path: Optional[Path]):
+    """Read-only mmap of `path`; b"" for a missing or empty file."""
+    if path is None or not os.path.exists(path):
+        return b""
+    f = stack.enter_context(open(path, "rb"))
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _split(data: bytes) -> List[bytes]:
+    """Lines including their b"\\n"; a final unterminated line is kept as is."""
+    parts = data.split(b"\n")
+    last = parts.pop()
+    lines = [part + b"\n" for part in parts]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def _count_lines(buf, end: int) -> int:
+    return sum(buf[i:min(i + CHUNK, end)].count(b"\n") for i in range(0, end, CHUNK))
+
+
+def common_prefix(a, b) -> int:
+    limit = min(len(a), len(b))
+    p = 0
+    while p < limit:
+        step = min(CHUNK, limit - p)
+        if a[p:p + step] == b[p:p + step]:
+            p += step
+            continue
+        lo, hi = 0, step  # a[p:p+lo] matches, a[p:p+hi] does not
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if a[p:p + mid] == b[p:p + mid]:
+                lo = mid
+            else:
+                hi = mid
+        return p + lo
+    return p
+
+
+def common_suffix(a, b, limit: int) -> int:
+    na, nb = len(a), len(b)
+    s = 0
+    while s < limit:
+        step = min(CHUNK, limit - s)
+        if a[na - s - step:na - s] == b[nb - s - step:nb - s]:
+            s += step
+            continue
+        lo, hi = 0, step
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if a[na - s - mid:na - s] == b[nb - s - mid:nb - s]:
+                lo = mid
+            else:
+                hi = mid
+        return s + lo
+    return s
+
+
+# --- Line diff ---
+
+def _anchors(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Longest increasing run of (i, j) pairs of lines unique in both ranges (patience diff)."""
+    count_a = Counter(a[alo:ahi])
+    count_b = Counter(b[blo:bhi])
+    where_b = {x: j for j, x in enumerate(b[blo:bhi], blo) if count_b[x] == 1}
+    pairs = [(i, where_b[x]) for i, x in enumerate(a[alo:ahi], alo) if x in where_b and count_a[x] == 1]
+    if not pairs:
+        return []
+    js = [j for _, j in pairs]
+    if js == sorted(js):  # no moved lines: every pair is an anchor
+        return pairs
+
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        p = bisect_left(tails, j)
+        if p == len(tails):
+            tails.append(j)
+            tail_idx.append(k)
+        else:
+            tails[p] = j
+            tail_idx[p] = k
+        prev[k] = tail_idx[p - 1] if p else -1
+    result = []
+    k = tail_idx[-1]
+    while k >= 0:
+        result.append(pairs[k])
+        k = prev[k]
+    result.reverse()
+    return result
+
+
+def _midpoint(a, b, left: int, top: int, right: int, bottom: int):
+    """Middle snake of the box (Myers 1986, section 4b); None for an empty box."""
+    width, height = right - left, bottom - top
+    size = width + height
+    if size == 0:
+        return None
+    delta = width - height
+    odd = delta & 1
+    dmax = (size + 1) // 2
+    vf = [0] * (2 * dmax + 1)
+    vb = [0] * (2 * dmax + 1)
+    vf[1], vb[1] = left, bottom
+
+    for d in range(dmax + 1):
+        if d > MAX_COST // 2:
+            raise _TooCostly()
+        for k in range(d, -d - 1, -2):
+            c = k - delta
+            if k == -d or (k != d and vf[k - 1] < vf[k + 1]):
+                px = x = vf[k + 1]
+            else:
+                px = vf[k - 1]
+                x = px + 1
+            y = top + (x - left) - k
+            py = y if (d == 0 or x != px) else y - 1
+            while x < right and y < bottom and a[x] == b[y]:
+                x += 1
+                y += 1
+            vf[k] = x
+            if odd and -(d - 1) <= c <= d - 1 and y >= vb[c]:
+                return (px, py), (x, y)
+        for c in range(d, -d - 1, -2):
+            k = c + delta
+            if c == -d or (c != d and vb[c - 1] > vb[c + 1]):
+                py = y = vb[c + 1]
+            else:
+                py = vb[c - 1]
+                y = py - 1
+            x = left + (y - top) + k
+            px = x if (d == 0 or y != py) else x + 1
+            while x > left and y > top and a[x - 1] == b[y - 1]:
+                x -= 1
+                y -= 1
+            vb[c] = y
+            if not odd and -d <= k <= d and x <= vf[k]:
+                return (x, y), (px, py)
+    return None
+
+
+def _path(a, b, left: int, top: int, right: int, bottom: int) -> Optional[List[Tuple[int, int]]]:
+    snake = _midpoint(a, b, left, top, right, bottom)
+    if snake is None:
+        return None
+    start, finish = snake
+    head = _path(a, b, left, top, start[0], start[1])
+    tail = _path(a, b, finish[0], finish[1], right, bottom)
+    return (head or [start]) + (tail or [finish])
+
+
+def myers(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, ops: List[Opcode]) -> None:
+    """Appends a shortest edit script for a[alo:ahi] -> b[blo:bhi] (one opcode per step)."""
+    path = _path(a, b, alo, blo, ahi, bhi) or []
+
+    def diagonal(x, y, x2, y2):
+        x0, y0 = x, y
+        while x < x2 and y < y2 and a[x] == b[y]:
+            x += 1
+            y += 1
+        if x > x0:
+            ops.append(("equal", x0, x, y0, y))
+        return x, y
+
+    for (x, y), (x2, y2) in zip(path, path[1:]):
+        x, y = diagonal(x, y, x2, y2)
+        if x2 - x < y2 - y:
+            ops.append(("insert", x, x, y, y + 1))
+            y += 1
+        elif x2 - x > y2 - y:
+            ops.append(("delete", x, x + 1, y, y))
+            x += 1
+        diagonal(x, y, x2, y2)
+
+
+def _diff(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, ops: List[Opcode]) -> None:
+    i, j = alo, blo
+    while i < ahi and j < bhi and a[i] == b[j]:
+        i += 1
+        j += 1
+    if i > alo:
+        ops.append(("equal", alo, i, blo, j))
+    ie, je = ahi, bhi
+    while ie > i and je > j and a[ie - 1] == b[je - 1]:
+        ie -= 1
+        je -= 1
+
+    if i == ie and j < je:
+        ops.append(("insert", i, i, j, je))
+    elif j == je and i < ie:
+        ops.append(("delete", i, ie, j, j))
+    elif i < ie:
+        anchors = _anchors(a, i, ie, b, j, je)
+        if anchors:
+            run_i, run_j = i, j  # start of the current run of consecutive anchors
+            for ai, bj in anchors:
+                if ai == i and bj == j:
+                    i, j = ai + 1, bj + 1
+                    continue
+                if i > run_i:
+                    ops.append(("equal", run_i, i, run_j, j))
+                _diff(a, i, ai, b, j, bj, ops)
+                run_i, run_j = ai, bj
+                i, j = ai + 1, bj + 1
+            if i > run_i:
+                ops.append(("equal", run_i, i, run_j, j))
+            _diff(a, i, ie, b, j, je, ops)
+        elif set(a[i:ie]).isdisjoint(b[j:je]):
+            ops.append(("delete", i, ie, j, j))
+            ops.append(("insert", ie, ie, j, je))
+        else:
+            mark = len(ops)
+            try:
+                myers(a, i, ie, b, j, je, ops)
+            except _TooCostly:
+                del ops[mark:]
+                ops.append(("delete", i, ie, j, j))
+                ops.append(("insert", ie, ie, j, je))
+
+    if ie < ahi:
+        ops.append(("equal", ie, ahi, je, bhi))
+
+
+def diff_lines(a: Sequence[int], b: Sequence[int]) -> List[Opcode]:
+    """Opcodes turning `a` into `b`; adjacent opcodes with the same tag are merged."""
+    raw: List[Opcode] = []
+    _diff(a, 0, len(a), b, 0, len(b), raw)
+    ops: List[Opcode] = []
+    for op in raw:
+        if op[1] == op[2] and op[3] == op[4]:
+            continue
+        if ops and ops[-1][0] == op[0]:
+            last = ops[-1]
+            ops[-1] = (op[0], last[1], op[2], last[3], op[4])
+        else:
+            ops.append(op)
+    return ops
+
+
+# --- Files ---
+
+def _range(start: int, length: int) -> str:
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+class FileDiff(NamedTuple):
+    identical: bool
+    binary: bool
+    old_lines: List[bytes]   # the changed window only
+    new_lines: List[bytes]
+    offset: int              # line number of the window's first line (0-based, same on both sides)
+    ops: List[Opcode]
+    context: int = 3         # equal lines shown around each change; the window holds at least this many
+
+    @property
+    def added(self) -> int:
+        return sum(j2 - j1 for tag, _, _, j1, j2 in self.ops if tag == "insert")
+
+    @property
+    def removed(self) -> int:
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.ops if tag == "delete")
+
+    def hunks(self) -> Iterator[List[Opcode]]:
+        """Opcode groups with up to `context` equal lines around each change (difflib's grouping)."""
+        context = self.context
+        ops = list(self.ops)
+        if not ops or all(op[0] == "equal" for op in ops):
+            return
+        if ops[0][0] == "equal":
+            _, i1, i2, j1, j2 = ops[0]
+            ops[0] = ("equal", max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+        if ops[-1][0] == "equal":
+            _, i1, i2, j1, j2 = ops[-1]
+            ops[-1] = ("equal", i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+        group: List[Opcode] = []
+        for tag, i1, i2, j1, j2 in ops:
+            if tag == "equal" and i2 - i1 > 2 * context:
+                group.append((tag, i1, i1 + context, j1, j1 + context))
+                yield group
+                group = []
+                i1, j1 = i2 - context, j2 - context
+            group.append((tag, i1, i2, j1, j2))
+        if group and not (len(group) == 1 and group[0][0] == "equal"):
+            yield group
+
+    def unified(self, fromfile: str, tofile: str) -> Iterator[str]:
+        """Unified diff lines (without trailing newlines), one hunk at a time."""
+        if self.identical:
+            return
+        if self.binary:
+            yield f"Binary files {fromfile} and {tofile} differ"
+            return
+        yield f"--- {fromfile}"
+        yield f"+++ {tofile}"
+        for group in self.hunks():
+            i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+            yield f"@@ -{_range(self.offset + i1, i2 - i1)} +{_range(self.offset + j1, j2 - j1)} @@"
+            removed: List[bytes] = []
+            added: List[bytes] = []
+            for tag, a1, a2, b1, b2 in group:
+                if tag == "equal":
+                    yield from _flush(removed, added)
+                    for line in self.old_lines[a1:a2]:
+                        yield from _render(" ", line)
+                elif tag == "delete":
+                    removed.extend(self.old_lines[a1:a2])
+                else:
+                    added.extend(self.new_lines[b1:b2])
+            yield from _flush(removed, added)
+
+
+def _render(prefix: str, line: bytes) -> Iterator[str]:
+    yield prefix + line.rstrip(b"\n").decode("utf-8", errors="replace")
+    if not line.endswith(b"\n"):
+        yield "\\ No newline at end of file"
+
+
+def _flush(removed: List[bytes], added: List[bytes]) -> Iterator[str]:
+    for line in removed:
+        yield from _render("-", line)
+    for line in added:
+        yield from _render("+", line)
+    removed.clear()
+    added.clear()
+
+
+def diff_files(old: Optional[Path], new: Path, context: int = 3, old_sha256: Optional[str] = None,
+               new_sha256: Optional[str] = None) -> FileDiff:
+    """
+    Diffs `old` (None or missing = empty) against `new`. Known hashes (from the
+    Merkle tree or the proposal store) skip rehashing either side.
+    """
+    with ExitStack() as stack:
+        a = _map(stack, old)
+        b = _map(stack, new)
+        na, nb = len(a), len(b)
+
+        if na == nb and (old_sha256 or hashlib.sha256(a).hexdigest()) == (new_sha256 or hashlib.sha256(b).hexdigest()):
+            return FileDiff(True, False, [], [], 0, [], context)
+        if b"\0" in a[:SNIFF] or b"\0" in b[:SNIFF]:
+            return FileDiff(False, True, [], [], 0, [], context)
+
+        # Changed window: [start, a_end) / [start, b_end), widened to whole lines plus context.
+        p = common_prefix(a, b)
+        start = a.rfind(b"\n", 0, p) + 1
+        for _ in range(context):
+            if start == 0:
+                break
+            start = a.rfind(b"\n", 0, start - 1) + 1
+
+        s = common_suffix(a, b, min(na, nb) - p)
+        a_end, b_end = na - s, nb - s
+        if a_end > 0 and not (a[a_end - 1:a_end] == b"\n" and b[b_end - 1:b_end] == b"\n"):
+            cut = a.find(b"\n", a_end, na)
+            shift = (na if cut < 0 else cut + 1) - a_end
+            a_end, b_end = a_end + shift, b_end + shift
+        for _ in range(context):
+            if a_end == na:
+                break
+            cut = a.find(b"\n", a_end, na)
+            shift = (na if cut < 0 else cut + 1) - a_end
+            a_end, b_end = a_end + shift, b_end + shift
+
+        offset = _count_lines(a, start)
+        old_lines = _split(a[start:a_end])
+        new_lines = _split(b[start:b_end])
+
+    ids = dict(zip(dict.fromkeys(chain(old_lines, new_lines)), count()))
+    ops = diff_lines(list(map(ids.__getitem__, old_lines)), list(map(ids.__getitem__, new_lines)))
+    return FileDiff(False, False, old_lines, new_lines, offset, ops, context)
@@ -0,0 +1,149 @@
+"""
+Protocol inheritance: resolves `extends` chains into a single merged manifest.
+
+Merge rules (see docs/SCHEMA_PROTOCOL.md):
+- Parents are applied left to right, then the child on top.
+- Steps are patched by `step` id: a child step replaces the parent step in place,
+  new steps are appended in declaration order.
+- Template maps are merged key by key (child wins). Inherited template paths are
+  anchored to the directory of the protocol that declared them.
+"""
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from gap.core.manifest import GapManifest, ProtocolRef, Step
+
+PACKAGE_PROTOCOLS = Path(__file__).parent.parent / "protocols"
+
+# (path, sha256) for every manifest in a chain, child first.
+ChainKey = Tuple[Tuple[str, str], ...]
+
+
+class InheritanceError(ValueError):
+    """Raised when an `extends` chain cannot be resolved (missing parent or cycle)."""
+
+
+class ProtocolResolver:
+    """
+    Loads a manifest and its `extends` ancestors and merges them.
+
+    Parsed manifests are cached by file content hash, and merged manifests by the
+    content hashes of the whole chain, so an unchanged protocol stack costs one
+    read per file and a single dictionary lookup.
+    """
+
+    def __init__(self, search_paths: Optional[List[Path]] = None):
+        self.search_paths = list(search_paths or []) + [PACKAGE_PROTOCOLS]
+        self._parsed: Dict[str, Tuple[str, GapManifest]] = {}
+        self._merged: Dict[ChainKey, GapManifest] = {}
+
+    def resolve(self, path: Path) -> GapManifest:
+        """Return the fully merged manifest for `path`."""
+        path = Path(path).resolve()
+        chain = self._collect_chain(path, stack=[])
+        key: ChainKey = tuple((str(p), digest) for p, digest, _ in chain)
+
+        cached = self._merged.get(key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        merged = self._merge(path, chain)
+        self._merged[key] = merged
+        return merged.model_copy(deep=True)
+
+    def find_protocol(self, ref: ProtocolRef, base_dir: Path) -> Path:
+        """
+        Locate the manifest for a parent reference.
+
+        1. Explicit path relative to the extending manifest (`../core/manifest.yaml`)
+        2. `<name>/`, `protocols/<name>/` or a sibling protocol of the extending manifest
+        3. `<search_path>/<name>/manifest.yaml` for each configured search path
+        4. The built-in protocols shipped in `gap/protocols`
+        """
+        name = ref.protocol
+        candidates = []
+        if name.endswith((".yaml", ".yml")):
+            candidates.append(base_dir / name)
+        else:
+            candidates.append(base_dir / name / "manifest.yaml")
+            candidates.append(base_dir / "protocols" / name / "manifest.yaml")
+            candidates.append(base_dir.parent / name / "manifest.yaml")
+            for search_path in self.search_paths:
+                candidates.append(search_path / name / "manifest.yaml")
+
+        for candidate in candidates:
+            if candidate.exists():
+                return candidate.resolve()
+
+        raise InheritanceError(f"Parent protocol '{name}' not found (extended from {base_dir}).")
+
+    def _load(self, path: Path) -> Tuple[str, GapManifest]:
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        hit = self._parsed.get(str(path))
+        if hit and hit[0] == digest:
+            return hit
+
+        data = yaml.safe_load(raw) or {}
+        entry = (digest, GapManifest(**data))
+        self._parsed[str(path)] = entry
+        return entry
+
+    def _collect_chain(self, path: Path, stack: List[Path]) -> List[Tuple[Path, str, GapManifest]]:
+        """Depth-first walk of the `extends` graph, child first, with cycle detection."""
+        if path in stack:
+            cycle = " -> ".join(p.parent.name for p in stack[stack.index(path):] + [path])
+            raise InheritanceError(f"Circular protocol inheritance detected: {cycle}")
+
+        if not path.exists():
+            raise FileNotFoundError(f"Manifest not found: {path}")
+
+        digest, manifest = self._load(path)
+        chain = [(path, digest, manifest)]
+        for ref in manifest.extends:
+            parent_path = self.find_protocol(ref, path.parent)
+            chain.extend(self._collect_chain(parent_path, stack + [path]))
+        return chain
+
+    def _merge(self, path: Path, chain: List[Tuple[Path, str, GapManifest]]) -> GapManifest:
+        manifests = {p: m for p, _, m in chain}
+        return self._merge_node(path, manifests[path], manifests, is_root=True)
+
+    def _merge_node(
+        self,
+        path: Path,
+        manifest: GapManifest,
+        manifests: Dict[Path, GapManifest],
+        is_root: bool = False,
+    ) -> GapManifest:
+        steps: Dict[str, Step] = {}
+        templates: Dict[str, str] = {}
+
+        for ref in manifest.extends:
+            parent_path = self.find_protocol(ref, path.parent)
+            parent = self._merge_node(parent_path, manifests[parent_path], manifests)
+            for step in parent.flow:
+                steps[step.step] = step
+            templates.update(parent.templates)
+
+        for step in manifest.get_flat_steps():
+            steps[step.step] = step.model_copy()
+
+        for name, rel in manifest.templates.items():
+            # The root manifest keeps its own relative paths so PathManager can
+            # still apply project overrides; inherited ones are pinned to their protocol.
+            templates[name] = rel if is_root else str(path.parent / rel)
+
+        return manifest.model_copy(update={"flow": list(steps.values()), "templates": templates})
+
+
+_default_resolver = ProtocolResolver()
+
+
+def resolve_manifest(path: Path, resolver: Optional[ProtocolResolver] = None) -> GapManifest:
+    """Load a manifest with its `extends` chain merged in (memoized across calls)."""
+    return (resolver or _default_resolver).resolve(path)
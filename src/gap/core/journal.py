@@ -0,0 +1,247 @@
+"""
+Append-only, hash-chained ledger journal (`.gap/ledger.jsonl`).
+
+`status.yaml` is the ledger's materialized view; every change to it is first
+appended here as one JSON line carrying `seq`, `prev` (hash of the previous
+entry) and `hash` (sha256 of the canonical entry without `hash`). An edited
+`status.yaml` no longer matches the replayed journal, and an edited journal
+line breaks the chain.
+
+JournalVerifier remembers the last verified position in
+`.gap/ledger.verified.json` (byte offset, seq, head hash and the replayed
+steps and session exceptions), so a routine check reads only entries appended
+since then: O(new entries), plus O(steps + exceptions) to compare the replayed
+state against `status.yaml`.
+It also re-reads the last verified entry, so a rewrite of history ending at
+the tail is caught. `full=True` re-verifies from the first entry.
+
+Without a secret key the chain detects edits, not a forger who recomputes
+every hash; record the head hash somewhere outside `.gap/` to anchor it.
+"""
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+JOURNAL_PATH = ".gap/ledger.jsonl"
+CHECKPOINT_PATH = ".gap/ledger.verified.json"
+CHECKPOINT_VERSION = 2
+GENESIS = "0" * 64
+TAIL_CHUNK = 4096
+
+
+def canonical(value):
+    """JSON-shaped copy of a YAML value; datetimes become ISO strings."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    return value
+
+
+def entry_hash(entry: Dict) -> str:
+    body = {k: v for k, v in entry.items() if k != "hash"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def _read_tail(path: Path) -> Optional[Tuple[int, bytes]]:
+    """(offset, bytes) of the last complete line, reading backwards in chunks."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return None
+        pos, buf = end, b""
+        while pos > 0:
+            step = min(TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            cut = buf.rstrip(b"\n").rfind(b"\n")
+            if cut >= 0:
+                return pos + cut + 1, buf[cut + 1:]
+        return 0, buf
+
+
+class LedgerJournal:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = self.root / JOURNAL_PATH
+
+    def head(self) -> Optional[Dict]:
+        tail = _read_tail(self.path)
+        return json.loads(tail[1]) if tail else None
+
+    def append(self, entry_type: str, snapshot: Optional[Dict] = None, **fields) -> Dict:
+        """
+        Appends one chained entry. `snapshot` (the current status.yaml data) is
+        recorded as an `import` entry first when the journal does not exist yet,
+        so ledgers created before the journal keep verifying.
+        """
+        head = self.head()
+        if head is None and snapshot and (snapshot.get("steps") or snapshot.get("exceptions")):
+            head = self._write(self._entry(None, "import", steps=snapshot.get("steps") or {},
+                                           exceptions=snapshot.get("exceptions") or []))
+        return self._write(self._entry(head, entry_type, **fields))
+
+    @staticmethod
+    def _entry(head: Optional[Dict], entry_type: str, **fields) -> Dict:
+        entry = {
+            "seq": head["seq"] + 1 if head else 0,
+            "prev": head["hash"] if head else GENESIS,
+            "type": entry_type,
+            **{k: canonical(v) for k, v in fields.items()},
+        }
+        entry["hash"] = entry_hash(entry)
+        return entry
+
+    def _write(self, entry: Dict) -> Dict:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, sort_keys=True, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return entry
+
+
+def new_state() -> Dict:
+    return {"steps": {}, "exceptions": []}
+
+
+def apply(state: Dict, entry: Dict) -> None:
+    """Replays one entry onto the state that status.yaml `steps` and `exceptions` must equal."""
+    if entry["type"] == "import":
+        state["steps"] = {k: dict(v or {}) for k, v in entry["steps"].items()}
+        state["exceptions"] = list(entry.get("exceptions") or [])
+    elif entry["type"] == "step":
+        state["steps"][entry["step"]] = {"status": entry["status"], "timestamp": entry["timestamp"],
+                                         "approver": entry["approver"]}
+    elif entry["type"] == "exception":
+        state["exceptions"].append(entry["entry"])
+
+
+class JournalReport:
+    def __init__(self):
+        self.ok = True
+        self.exists = False
+        self.checked = 0        # entries verified in this call
+        self.total = 0          # entries in the journal
+        self.head: Optional[str] = None
+        self.errors: List[str] = []
+
+    def fail(self, message: str):
+        self.ok = False
+        self.errors.append(message)
+
+
+class JournalVerifier:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.journal = LedgerJournal(root)
+        self.checkpoint_path = self.root / CHECKPOINT_PATH
+        self.status_path = self.root / ".gap/status.yaml"
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if data.get("version") == CHECKPOINT_VERSION else None
+
+    def _save_checkpoint(self, data: Dict):
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CHECKPOINT_VERSION, **data}, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def verify(self, full: bool = False) -> JournalReport:
+        report = JournalReport()
+        if not self.journal.path.exists():
+            return report
+        report.exists = True
+
+        cp = None if full else self._load_checkpoint()
+        with open(self.journal.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if cp is not None and not self._tail_intact(f, cp, size, report):
+                return report
+            if cp is None:
+                cp = {"offset": 0, "last_offset": None, "seq": -1, "hash": GENESIS, "state": new_state()}
+
+            f.seek(cp["offset"])
+            offset, seq, prev, state = cp["offset"], cp["seq"], cp["hash"], cp["state"]
+            last_offset = cp["last_offset"]
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # torn append; verified once complete
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    report.fail(f"Entry after seq {seq} is not valid JSON (byte {offset}).")
+                    return report
+                if entry.get("seq") != seq + 1 or entry.get("prev") != prev:
+                    report.fail(f"Chain broken at seq {entry.get('seq')}: expected seq {seq + 1} after {prev[:12]}.")
+                    return report
+                if entry_hash(entry) != entry.get("hash"):
+                    report.fail(f"Entry seq {entry['seq']} was modified (hash mismatch).")
+                    return report
+                apply(state, entry)
+                last_offset, offset = offset, offset + len(raw)
+                seq, prev = entry["seq"], entry["hash"]
+                report.checked += 1
+
+        report.total = seq + 1
+        report.head = prev
+        if report.checked:
+            self._save_checkpoint({"offset": offset, "last_offset": last_offset, "seq": seq, "hash": prev,
+                                   "state": state})
+        self._compare_status(state, report)
+        return report
+
+    @staticmethod
+    def _tail_intact(f, cp: Dict, size: int, report: JournalReport) -> bool:
+        """The last verified entry must still be where it was, unchanged."""
+        if size < cp["offset"]:
+            report.fail(f"Journal shrank below the verified position (seq {cp['seq']}).")
+            return False
+        if cp["last_offset"] is None:
+            return True
+        f.seek(cp["last_offset"])
+        try:
+            entry = json.loads(f.readline())
+        except ValueError:
+            entry = {}
+        if entry.get("hash") != cp["hash"] or entry_hash(entry) != cp["hash"]:
+            report.fail(f"Verified history was rewritten (entry seq {cp['seq']} changed).")
+            return False
+        return True
+
+    def _compare_status(self, state: Dict, report: JournalReport):
+        try:
+            with open(self.status_path) as f:
+                data = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            data = {}
+        steps = canonical(data.get("steps") or {})
+        expected = state["steps"]
+        for step in sorted(set(steps) | set(expected)):
+            if (steps.get(step) or {}) != expected.get(step, {}):
+                report.fail(f"status.yaml entry '{step}' does not match the journal.")
+
+        exceptions = canonical(data.get("exceptions") or [])
+        for i in range(max(len(exceptions), len(state["exceptions"]))):
+            actual = exceptions[i] if i < len(exceptions) else None
+            recorded = state["exceptions"][i] if i < len(state["exceptions"]) else None
+            if actual != recorded:
+                session = (actual or recorded).get("session_id")
+                report.fail(f"status.yaml exception #{i} (session '{session}') does not match the journal.")
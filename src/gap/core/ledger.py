@@ -2,10 +2,14 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime
 import yaml
-from typing import Optional
+from typing import Dict, List, Optional
 
 from gap.core.state import GapStatus, StepData, StepStatus
 from gap.core.manifest import GapManifest
+from gap.core.journal import LedgerJournal
+
+# libyaml when available: bulk reads of large ledgers/plans are several times faster.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 class Ledger(ABC):
     def __init__(self, root: Path):
@@ -26,6 +30,24 @@ class Ledger(ABC):
         """Get the stored status of a specific step (ignoring manifest dependencies)."""
         pass
 
+    @abstractmethod
+    def get_approvals(self, prefix: str = "") -> Dict[str, StepData]:
+        """All stored step entries whose key starts with `prefix`, read in one pass."""
+        pass
+
+    @abstractmethod
+    def log_exception(self, entry: Dict) -> bool:
+        """
+        Record a session exception declaration (see docs/SCHEMA_SESSION.md).
+        Idempotent per (session_id, digest); returns True if a new entry was written.
+        """
+        pass
+
+    @abstractmethod
+    def get_exceptions(self, session_id: Optional[str] = None) -> List[Dict]:
+        """Recorded session exception entries, oldest first."""
+        pass
+
 class YamlLedger(Ledger):
     def get_status(self, manifest: GapManifest) -> GapStatus:
         # 1. Load Ledger (if exists)
@@ -96,6 +118,11 @@ class YamlLedger(Ledger):
             current_data["steps"] = {}
             
         ts = timestamp or datetime.now()
+
+        # Journal first: status.yaml is only the materialized view of the chain
+        LedgerJournal(self.root).append(
+            "step", snapshot=current_data, step=step, status=status.value, timestamp=ts.isoformat(), approver=approver
+        )
         
         current_data["steps"][step] = {
             "status": status.value,
@@ -126,3 +153,52 @@ class YamlLedger(Ledger):
                 timestamp=s.get("timestamp")
             )
         return None
+
+    def get_approvals(self, prefix: str = "") -> Dict[str, StepData]:
+        ledger_path = self.root / ".gap/status.yaml"
+        if not ledger_path.exists():
+            return {}
+
+        with open(ledger_path) as f:
+            data = yaml.load(f, Loader=YamlLoader) or {}
+
+        return {
+            key: StepData(status=StepStatus(s["status"]), approver=s.get("approver"), timestamp=s.get("timestamp"))
+            for key, s in (data.get("steps") or {}).items()
+            if key.startswith(prefix)
+        }
+
+    def log_exception(self, entry: Dict) -> bool:
+        ledger_path = self.root / ".gap/status.yaml"
+        current_data = {}
+
+        if ledger_path.exists():
+            with open(ledger_path) as f:
+                current_data = yaml.safe_load(f) or {}
+
+        entries = current_data.setdefault("exceptions", [])
+        if any(e.get("session_id") == entry.get("session_id") and e.get("digest") == entry.get("digest") for e in entries):
+            return False
+
+        record = dict(entry)
+        record.setdefault("timestamp", datetime.now().isoformat())
+        LedgerJournal(self.root).append("exception", snapshot=current_data, entry=record)
+        entries.append(record)
+
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(ledger_path, "w") as f:
+            yaml.safe_dump(current_data, f)
+        return True
+
+    def get_exceptions(self, session_id: Optional[str] = None) -> List[Dict]:
+        ledger_path = self.root / ".gap/status.yaml"
+        if not ledger_path.exists():
+            return []
+
+        with open(ledger_path) as f:
+            data = yaml.safe_load(f) or {}
+
+        entries = data.get("exceptions") or []
+        if session_id is not None:
+            entries = [e for e in entries if e.get("session_id") == session_id]
+        return entries
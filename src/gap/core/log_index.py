@@ -0,0 +1,220 @@
+"""
+Sidecar index for `.gap/sessions/*.log.jsonl[.gz]`, used by `gap log`.
+
+The index (`.gap/sessions/.index.db`, SQLite) stores one row per entry with its
+segment, byte offset (in the uncompressed stream) and the filterable fields.
+Indexing is incremental: each segment remembers how many bytes were indexed,
+so a growing active segment is only scanned from its previous end. A segment
+that shrank or was replaced (rotation) is re-indexed from the start.
+"""
+import gzip
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+INDEX_NAME = ".index.db"
+BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    indexed_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    session_id TEXT,
+    type TEXT,
+    task_id TEXT,
+    ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_session ON entries (session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_type ON entries (type, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_task ON entries (task_id, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_ts ON entries (ts);
+CREATE INDEX IF NOT EXISTS idx_entries_segment ON entries (segment, offset);
+"""
+
+SEGMENT_NAME = re.compile(r"^(?P<session>.+?)(?:\.\d{4})?\.log\.jsonl(?:\.gz)?$")
+
+
+def session_from_filename(name: str) -> Optional[str]:
+    match = SEGMENT_NAME.match(name)
+    return match.group("session") if match else None
+
+
+def _open_segment(path: Path):
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+class LogIndex:
+    def __init__(self, log_dir: Path):
+        self.log_dir = log_dir
+        self.db_path = log_dir / INDEX_NAME
+        log_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        # The index is derived data and can always be rebuilt from the logs.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- Indexing ---
+
+    def segments(self) -> List[Path]:
+        return sorted(p for p in self.log_dir.iterdir() if session_from_filename(p.name))
+
+    def update(self) -> int:
+        """Index any new bytes across all segments. Returns the number of entries added."""
+        known = {p: (ino, n) for p, ino, n in self.conn.execute("SELECT path, inode, indexed_bytes FROM segments")}
+        live = {p.name: p for p in self.segments()}
+        added = 0
+
+        with self.conn:
+            for name in set(known) - set(live):
+                self._drop(name)
+
+            for name, path in live.items():
+                st = path.stat()
+                inode, done = known.get(name, (None, 0))
+                compressed = path.suffix == ".gz"
+                if inode is not None and inode != st.st_ino:
+                    self._drop(name)
+                    done = 0
+                elif compressed and inode is not None:
+                    continue  # closed segments never change
+                elif not compressed and st.st_size < done:
+                    self._drop(name)
+                    done = 0
+                elif not compressed and st.st_size == done:
+                    continue
+                added += self._scan(name, path, done, st.st_ino)
+        return added
+
+    def _drop(self, name: str):
+        self.conn.execute("DELETE FROM entries WHERE segment = ?", (name,))
+        self.conn.execute("DELETE FROM segments WHERE path = ?", (name,))
+
+    def _scan(self, name: str, path: Path, start: int, inode: int) -> int:
+        fallback_session = session_from_filename(name)
+        rows, count, offset = [], 0, start
+        with _open_segment(path) as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written entry; pick it up next time
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = {}
+                rows.append((
+                    name, offset,
+                    entry.get("session_id", fallback_session),
+                    entry.get("type"),
+                    entry.get("task_id"),
+                    entry.get("timestamp"),
+                ))
+                offset += len(line)
+                if len(rows) >= BATCH:
+                    self._insert(rows)
+                    count += len(rows)
+                    rows = []
+        self._insert(rows)
+        count += len(rows)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO segments (path, inode, indexed_bytes) VALUES (?, ?, ?)",
+            (name, inode, offset),
+        )
+        return count
+
+    def _insert(self, rows):
+        if rows:
+            self.conn.executemany(
+                "INSERT INTO entries (segment, offset, session_id, type, task_id, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # --- Querying ---
+
+    def query(
+        self,
+        session: Optional[str] = None,
+        type: Optional[str] = None,
+        task_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Streams matching entries in time order, reading only the indexed offsets.
+
+        Plain segments are read with one seek per hit. A gzip stream can only
+        seek by decompressing, and a backward seek restarts from the top, so
+        hits in `.gz` segments are grouped per segment and read in one forward
+        pass the first time the segment is reached. Those entries are held in
+        memory until yielded; the cost is one decompression per matching closed
+        segment, not one per hit.
+        """
+        clauses, params = [], []
+        for column, value in (("session_id", session), ("type", type), ("task_id", task_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("ts <= ?")
+            params.append(until.isoformat())
+
+        sql = "SELECT segment, offset FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts, segment, offset"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        hits = self.conn.execute(sql, params).fetchall()
+        compressed: Dict[str, List[int]] = {}
+        for segment, offset in hits:
+            if segment.endswith(".gz"):
+                compressed.setdefault(segment, []).append(offset)
+
+        handles = {}
+        try:
+            for segment, offset in hits:
+                pending = compressed.get(segment)
+                if pending is not None:
+                    if isinstance(pending, list):
+                        pending = compressed[segment] = self._read_offsets(segment, pending)
+                    yield json.loads(pending.pop(offset))
+                    continue
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = _open_segment(self.log_dir / segment)
+                f.seek(offset)
+                yield json.loads(f.readline())
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def _read_offsets(self, segment: str, offsets: List[int]) -> Dict[int, bytes]:
+        """The lines at `offsets` in one forward pass over the segment."""
+        lines = {}
+        with _open_segment(self.log_dir / segment) as f:
+            for offset in sorted(set(offsets)):
+                f.seek(offset)  # forward only: decompresses just the gap since the last line
+                lines[offset] = f.readline()
+        return lines
+
+    def sessions(self) -> List[tuple]:
+        """(session_id, entries, first_ts, last_ts) for every indexed session."""
+        return list(self.conn.execute(
+            "SELECT session_id, COUNT(*), MIN(ts), MAX(ts) FROM entries GROUP BY session_id ORDER BY MIN(ts)"
+        ))
@@ -0,0 +1,261 @@
+"""
+Merkle tree over approved artifacts (`.gap/merkle.json`).
+
+Leaves are the live files of sealed steps: the step's artifact path, a
+directory, or a glob such as `src/*`. A leaf's hash is the sha256 of its
+content. A directory's hash covers the sorted (kind, name, hash) entries of its
+children, so the root hash identifies the whole approved tree.
+
+`gap gate approve` and `gap scribe create` (live writes) seal a step. This
+rehashes only that step's files and the directories above them.
+`gap check status --verify` re-stats the tracked files and rehashes only those
+whose stat changed. It recomputes only their ancestor directories and compares
+root hashes; on a mismatch it descends only into subtrees whose hashes differ.
+"""
+import glob
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from gap.core.manifest import Step
+
+MERKLE_PATH = ".gap/merkle.json"
+MERKLE_VERSION = 1
+SKIP_DIRS = {".git", "__pycache__"}
+GLOB_CHARS = set("*?[")
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _parent(path: str) -> str:
+    return path.rpartition("/")[0]
+
+
+def _ancestors(path: str) -> Iterable[str]:
+    """Directories containing `path`, deepest first, ending with the root ('')."""
+    while path:
+        path = _parent(path)
+        yield path
+
+
+def expand_artifact(root: Path, artifact: str) -> List[str]:
+    """Live files (relative posix paths) matched by a manifest artifact."""
+    base = str(root)
+    cut = len(base) + 1
+    if GLOB_CHARS & set(artifact):
+        matches = [p for p in glob.iglob(os.path.join(base, artifact), recursive=True) if os.path.isfile(p)]
+    else:
+        target = os.path.join(base, artifact)
+        if os.path.isdir(target):
+            matches = []
+            for dirpath, dirnames, filenames in os.walk(target):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                matches.extend(os.path.join(dirpath, name) for name in filenames)
+        elif os.path.isfile(target):
+            matches = [target]
+        else:
+            matches = []
+    files = []
+    for path in matches:
+        rel = path[cut:].replace(os.sep, "/")
+        if not SKIP_DIRS.intersection(rel.split("/")):
+            files.append(rel)
+    return sorted(files)
+
+
+class Verification:
+    def __init__(self, expected: Optional[str], actual: Optional[str], files: int, rehashed: int):
+        self.expected = expected
+        self.actual = actual
+        self.files = files        # tracked files on disk
+        self.rehashed = rehashed  # files whose stat changed (or all, when deep)
+        self.visited = 0          # directories descended into
+        self.modified: List[str] = []
+        self.added: List[str] = []
+        self.removed: List[str] = []
+
+    @property
+    def intact(self) -> bool:
+        return self.expected == self.actual
+
+
+class MerkleTree:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = self.root / MERKLE_PATH
+        self.steps: Dict[str, Dict] = {}                      # sealed step -> {artifact, files}
+        self.files: Dict[str, Tuple[str, int, int]] = {}     # path -> (sha256, mtime_ns, size)
+        self.dirs: Dict[str, str] = {}                        # dir path ('' = root) -> hash
+        self.stale_stats = False  # verify() saw touched-but-unchanged files; save() keeps it cheap next time
+
+    @property
+    def root_hash(self) -> Optional[str]:
+        return self.dirs.get("")
+
+    # --- Persistence ---
+
+    @classmethod
+    def load(cls, root: Path) -> "MerkleTree":
+        tree = cls(root)
+        if tree.path.exists():
+            with open(tree.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MERKLE_VERSION:
+                tree.steps = data.get("steps") or {}
+                tree.files = {p: tuple(v) for p, v in (data.get("files") or {}).items()}
+                tree.dirs = data.get("dirs") or {}
+        return tree
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": MERKLE_VERSION, "root": self.root_hash, "steps": self.steps,
+                                "files": self.files, "dirs": self.dirs}))
+        os.replace(tmp, self.path)
+
+    # --- Hashing ---
+
+    def _leaf(self, rel: str, known: Optional[Tuple[str, int, int]] = None, deep: bool = False) -> Optional[Tuple[str, int, int]]:
+        """(sha256, mtime_ns, size) of a live file; the recorded hash is reused while the stat matches."""
+        try:
+            st = os.stat(self.root / rel)
+        except OSError:
+            return None
+        if known is not None and not deep and known[1] == st.st_mtime_ns and known[2] == st.st_size:
+            return known
+        return (hash_file(self.root / rel), st.st_mtime_ns, st.st_size)
+
+    def file_hash(self, rel: str) -> Optional[str]:
+        """sha256 of a live file, reusing the sealed hash while its stat is unchanged; None if absent."""
+        leaf = self._leaf(rel, self.files.get(rel))
+        return leaf[0] if leaf else None
+
+    @staticmethod
+    def _children(files: Dict[str, Tuple], dirs: Iterable[str]) -> Dict[str, List[Tuple[str, str, str]]]:
+        """dir -> [(kind, name, path)] for the given directories."""
+        wanted = set(dirs)
+        children: Dict[str, List[Tuple[str, str, str]]] = {d: [] for d in wanted}
+        seen_dirs: Set[str] = set()
+        for rel in files:
+            child, kind = rel, "f"
+            for parent in _ancestors(rel):
+                if parent in wanted and (kind == "f" or child not in seen_dirs):
+                    children[parent].append((kind, child.rpartition("/")[2], child))
+                if kind == "d":
+                    seen_dirs.add(child)
+                child, kind = parent, "d"
+        return children
+
+    @staticmethod
+    def _rehash(files: Dict[str, Tuple], dirs: Dict[str, str], dirty: Set[str]) -> None:
+        """Recomputes the hashes of `dirty` directories (deepest first); other directories keep theirs."""
+        if not dirty:
+            return
+        children = MerkleTree._children(files, dirty)
+        for d in sorted(dirty, key=lambda p: p.count("/") + (1 if p else 0), reverse=True):
+            entries = children.get(d)
+            if not entries:
+                dirs.pop(d, None)
+                continue
+            lines = []
+            for kind, name, path in sorted(entries):
+                lines.append(f"{kind} {name} {files[path][0] if kind == 'f' else dirs[path]}\n")
+            dirs[d] = hash_bytes("".join(lines).encode())
+
+    # --- Updates ---
+
+    def seal(self, step: Step) -> List[str]:
+        """Records the current content of a step's artifact; returns the paths whose hash changed."""
+        current = set(expand_artifact(self.root, step.artifact))
+        owned = set(self.steps.get(step.step, {}).get("files", ()))
+        self.steps[step.step] = {"artifact": step.artifact, "files": sorted(current)}
+        still_owned = {rel for name, s in self.steps.items() if name != step.step for rel in s["files"]}
+        changed = []
+        for rel in owned - current - still_owned:
+            del self.files[rel]
+            changed.append(rel)
+        for rel in current:
+            known = self.files.get(rel)
+            leaf = self._leaf(rel, known)
+            if leaf is None:
+                continue
+            if known is None or known[0] != leaf[0]:
+                changed.append(rel)
+            self.files[rel] = leaf
+        dirty = {d for rel in changed for d in _ancestors(rel)}
+        if not self.dirs:
+            dirty.add("")
+        self._rehash(self.files, self.dirs, dirty)
+        return sorted(changed)
+
+    # --- Verification ---
+
+    def verify(self, deep: bool = False) -> Verification:
+        """Compares the live project against the sealed tree."""
+        files = dict(self.files)
+        dirty: Set[str] = set()
+        current: Set[str] = set()
+        for artifact in {s["artifact"] for s in self.steps.values()}:
+            current.update(expand_artifact(self.root, artifact))
+
+        rehashed = 0
+        for rel in current | set(self.files):
+            known = self.files.get(rel)
+            leaf = self._leaf(rel, known, deep) if rel in current else None
+            if leaf is not None and leaf is not known:
+                rehashed += 1
+            if leaf is None:
+                files.pop(rel, None)
+            elif known is None or leaf[0] != known[0]:
+                files[rel] = leaf
+            else:
+                if leaf is not known:
+                    self.files[rel] = leaf
+                    self.stale_stats = True
+                continue
+            dirty.update(_ancestors(rel))
+
+        dirs = dict(self.dirs)
+        self._rehash(files, dirs, dirty)
+        result = Verification(self.root_hash, dirs.get(""), len(files), rehashed)
+        if result.intact:
+            return result
+
+        # Descend only into subtrees whose hash differs.
+        old_children = self._children(self.files, dirty | {""})
+        new_children = self._children(files, dirty | {""})
+        stack = [""]
+        while stack:
+            d = stack.pop()
+            old = {e[2]: e[0] for e in old_children.get(d, [])}
+            new = {e[2]: e[0] for e in new_children.get(d, [])}
+            for path in sorted(set(old) | set(new)):
+                kind = new.get(path, old.get(path))
+                if kind == "d":
+                    if self.dirs.get(path) != dirs.get(path):
+                        stack.append(path)
+                        result.visited += 1
+                    continue
+                if path not in new:
+                    result.removed.append(path)
+                elif path not in old:
+                    result.added.append(path)
+                elif self.files[path][0] != files[path][0]:
+                    result.modified.append(path)
+        for paths in (result.modified, result.added, result.removed):
+            paths.sort()
+        return result
+
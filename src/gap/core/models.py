@@ -0,0 +1,21 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TaskEnvelope(BaseModel):
+    """
+    The execution envelope the supervisor grants a single task in `.gap/plan.yaml`.
+    Only `checkpoints` is interpreted by GAP; the rest is read by the Runner.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    checkpoints: List[str] = Field(default_factory=list)  # e.g. before_start, after_completion
+    model: Optional[str] = None
+    locality: Optional[str] = None  # local | cloud
+    acl: Dict = Field(default_factory=dict)
+
+
+class Plan(BaseModel):
+    """`.gap/plan.yaml`: task id -> envelope."""
+    plan: Dict[str, TaskEnvelope] = Field(default_factory=dict)
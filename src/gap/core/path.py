@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Optional
 from gap.core.manifest import GapManifest
+from gap.core.inheritance import InheritanceError, ProtocolResolver
 
 class PathManager:
     def __init__(self, root: Optional[Path] = None):
@@ -9,6 +10,7 @@ class PathManager:
             self.root = self.package_root / "protocols"
         else:
             self.root = root
+        self.resolver = ProtocolResolver()
         
     def resolve_template(self, manifest: GapManifest, name: str) -> Path:
         """
@@ -35,12 +37,14 @@ class PathManager:
         if local_path.exists():
             return local_path
             
-        # Hardcoded Parent Check (Simulating Inheritance for now)
-        # In the real engine, we would load the 'extends' path dynamically.
-        if name == "course" or name == "campaign":
-             # Fallback to Instructional Protocol (Internal Package)
-             protocol_path = self.package_root / "protocols/instructional/templates/course.md"
-             if protocol_path.exists():
-                 return protocol_path
-                 
-        raise FileNotFoundError(f"Template '{name}' not found.")
\ No newline at end of file
+        # Parent Protocols (convention lookup along the `extends` chain)
+        for ref in manifest.extends:
+            try:
+                parent_manifest = self.resolver.find_protocol(ref, self.root)
+            except InheritanceError:
+                continue
+            parent_path = parent_manifest.parent / f"templates/{name}.md"
+            if parent_path.exists():
+                return parent_path
+
+        raise FileNotFoundError(f"Template '{name}' not found.")
@@ -0,0 +1,366 @@
+"""
+In-process policy API for harnesses: current phase, effective policy and
+write decisions, without shelling out to `gap check status`.
+
+All state (resolved manifest, ledger status, the phase ACL at
+`.gap/acls/<phase>.yaml`) is held in an immutable snapshot. The snapshot is
+revalidated against the stat metadata of its source files at most once per
+`ttl` seconds and rebuilt only when one of them changed, so `can_write()` is
+normally a dict lookup.
+
+Session exceptions (docs/SCHEMA_SESSION.md) are applied by PolicyResolver,
+which merges project law with the active session's `execution_exceptions`
+once per change of the manifest, `.gap/gap.yaml` or the session config, and
+records each declared exception in the ledger the first time it is seen.
+
+    from gap.core.policy import get_policy_engine
+
+    engine = get_policy_engine(project_root)
+    if engine.can_write("src/main.py"):
+        ...
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from pydantic import BaseModel, Field
+
+from gap.core.acl import AccessControlList, normalize_path
+from gap.core.factory import get_ledger
+from gap.core.inheritance import resolve_manifest
+from gap.core.ledger import Ledger
+from gap.core.manifest import GapManifest, Step
+from gap.core.state import StepStatus
+
+DEFAULT_TTL = 1.0
+# Per-snapshot memo of path decisions; cleared when it grows past this.
+MAX_DECISIONS = 65536
+
+
+class EffectivePolicy(BaseModel):
+    """Execution rules in force for the current phase (project law from the manifest's `execution:` block)."""
+    mode: str = "gated"  # gated | autonomous
+    task_granularity: str = "function"
+    checkpoint_strategy: str = "explicit"  # explicit | every | none
+    after_tasks: List[str] = Field(default_factory=list)
+    session_id: Optional[str] = None  # set when session exceptions were applied
+    phase: Optional[str] = None
+    phase_class: Optional[str] = None  # alignment | execution
+
+
+def is_execution_step(step: Step) -> bool:
+    """Decision (alignment) steps are written through scribe/gate; only execution steps accept direct writes."""
+    return step.phase_class == "execution" or (step.phase_class is None and step.step == "execution")
+
+
+def load_law(manifest_path: Path) -> Dict:
+    """The raw `execution:` block of a manifest (not part of the GapManifest model)."""
+    with open(manifest_path) as f:
+        data = yaml.safe_load(f) or {}
+    return data.get("execution") or {}
+
+
+def policy_from_law(law: Dict) -> EffectivePolicy:
+    checkpoints = law.get("checkpoints") or {}
+    return EffectivePolicy(
+        mode=law.get("mode", "gated"),
+        task_granularity=(law.get("task_granularity") or {}).get("max_scope", "function"),
+        checkpoint_strategy=checkpoints.get("strategy", "explicit"),
+        after_tasks=list(checkpoints.get("after_tasks") or []),
+    )
+
+
+def apply_exceptions(policy: EffectivePolicy, exceptions: Dict) -> EffectivePolicy:
+    """Overlays declared session exceptions on project law (only the keys that are declared)."""
+    if "mode" in exceptions:
+        policy.mode = exceptions["mode"]
+    if "task_granularity" in exceptions:
+        policy.task_granularity = (exceptions["task_granularity"] or {}).get("max_scope", policy.task_granularity)
+    if "checkpoints" in exceptions:
+        checkpoints = exceptions["checkpoints"] or {}
+        policy.checkpoint_strategy = checkpoints.get("strategy", policy.checkpoint_strategy)
+        policy.after_tasks = list(checkpoints.get("after_tasks", policy.after_tasks) or [])
+    return policy
+
+
+def _load_yaml(path: Path) -> Dict:
+    try:
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def load_acl_file(path: Path) -> AccessControlList:
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    return AccessControlList(data.get("allow_write") or ())
+
+
+def stat_key(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ResolvedPolicy:
+    """Effective policy for one (manifest, registry, session config) state."""
+    __slots__ = ("key", "policy", "session_id", "exceptions", "pause_after")
+
+    def __init__(self, key, policy: EffectivePolicy, session_id: Optional[str], exceptions: Dict):
+        self.key = key
+        self.policy = policy
+        self.session_id = session_id
+        self.exceptions = exceptions
+        self.pause_after = frozenset(policy.after_tasks)
+
+    def should_pause(self, task_id: str) -> bool:
+        strategy = self.policy.checkpoint_strategy
+        if strategy == "every":
+            return True
+        return strategy == "explicit" and task_id in self.pause_after
+
+
+class PolicyResolver:
+    """
+    Project law + active session exceptions, resolved once per change.
+
+    The cache key is the stat metadata of the manifest, `.gap/gap.yaml` and the
+    active session's `config.yaml`; it is re-checked at most every `ttl`
+    seconds, so `should_pause()` is a set lookup between changes.
+    """
+    def __init__(self, root: Path, manifest_path: Optional[Path] = None, ledger: Optional[Ledger] = None,
+                 ttl: float = DEFAULT_TTL):
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.root / "manifest.yaml"
+        self.registry_path = self.root / ".gap/gap.yaml"
+        self.ledger = ledger  # from get_ledger() on first use, once the manifest is known
+        self.ttl = ttl
+        self._session_config: Optional[Path] = None
+        self._resolved: Optional[ResolvedPolicy] = None
+        self._checked = 0.0
+        self._logged = set()
+        self._lock = threading.Lock()
+
+    def paths(self) -> List[Path]:
+        """Files the resolved policy depends on (the session config as of the last resolution)."""
+        paths = [self.manifest_path, self.registry_path]
+        if self._session_config is not None:
+            paths.append(self._session_config)
+        return paths
+
+    def _key(self) -> tuple:
+        return tuple(stat_key(p) for p in self.paths())
+
+    def resolve(self, force: bool = False) -> ResolvedPolicy:
+        resolved = self._resolved
+        now = time.monotonic()
+        if resolved is not None and not force and now - self._checked < self.ttl:
+            return resolved
+        with self._lock:
+            resolved = self._resolved
+            if resolved is None or force or self._key() != resolved.key:
+                resolved = self._resolved = self._build()
+            self._checked = time.monotonic()
+            return resolved
+
+    def invalidate(self) -> None:
+        self._resolved = None
+
+    def _build(self) -> ResolvedPolicy:
+        if not self.manifest_path.exists():
+            raise FileNotFoundError(f"Missing Project Law: {self.manifest_path}")
+        registry = _load_yaml(self.registry_path)
+        session_id = registry.get("active_session")
+        self._session_config = self._config_path(registry, session_id) if session_id else None
+        key = self._key()  # taken before reading so a concurrent change forces a rebuild
+
+        law = load_law(self.manifest_path)
+        policy = policy_from_law(law)
+        exceptions: Dict = {}
+        if self._session_config is not None:
+            exceptions = _load_yaml(self._session_config).get("execution_exceptions") or {}
+        if exceptions:
+            apply_exceptions(policy, exceptions)
+            policy.session_id = session_id
+            self._log(session_id, law, exceptions, policy)
+        return ResolvedPolicy(key, policy, session_id, exceptions)
+
+    def _config_path(self, registry: Dict, session_id: str) -> Path:
+        for entry in registry.get("sessions") or ():
+            if isinstance(entry, dict) and entry.get("id") == session_id and entry.get("path"):
+                return self.root / entry["path"] / "config.yaml"
+        return self.root / ".gap/sessions" / session_id / "config.yaml"
+
+    def _log(self, session_id: str, law: Dict, exceptions: Dict, policy: EffectivePolicy) -> None:
+        """Transparency invariant: every declared exception is on the ledger before it takes effect."""
+        digest = hashlib.sha256(json.dumps(exceptions, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        if (session_id, digest) in self._logged:
+            return
+        if self.ledger is None:
+            self.ledger = get_ledger(self.root, resolve_manifest(self.manifest_path))
+        defaults = policy_from_law(law).model_dump(include={"mode", "task_granularity", "checkpoint_strategy", "after_tasks"})
+        self.ledger.log_exception({
+            "session_id": session_id,
+            "digest": digest,
+            "declared": exceptions,
+            "defaults": defaults,
+            "effective": policy.model_dump(include=set(defaults)),
+        })
+        self._logged.add((session_id, digest))
+
+    # --- Queries ---
+
+    def effective_policy(self) -> EffectivePolicy:
+        return self.resolve().policy.model_copy(deep=True)
+
+    def should_pause(self, task_id: str) -> bool:
+        """Checkpoint decision for the task that just finished."""
+        return self.resolve().should_pause(task_id)
+
+    def checkpoints(self, task_ids: List[str]) -> List[str]:
+        """The subset of `task_ids` the harness must pause at."""
+        resolved = self.resolve()
+        return [t for t in task_ids if resolved.should_pause(t)]
+
+
+class PolicySnapshot:
+    """Everything a decision needs, resolved once."""
+    __slots__ = ("key", "manifest", "phase", "step", "resolved", "policy", "acl", "decisions")
+
+    def __init__(self, key, manifest: GapManifest, phase: Optional[Step], resolved: ResolvedPolicy,
+                 acl: Optional[AccessControlList]):
+        self.key = key
+        self.manifest = manifest
+        self.step = phase
+        self.phase = phase.step if phase else None
+        self.resolved = resolved
+        self.policy = resolved.policy.model_copy()
+        self.policy.phase = self.phase
+        self.policy.phase_class = phase.phase_class if phase else None
+        self.acl = acl
+        self.decisions: Dict[str, bool] = {}
+
+
+class PolicyEngine:
+    def __init__(self, root: Path, manifest_path: Optional[Path] = None, ttl: float = DEFAULT_TTL):
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.root / "manifest.yaml"
+        self.ttl = ttl
+        self.resolver = PolicyResolver(self.root, self.manifest_path, ttl=ttl)
+        self._snapshot: Optional[PolicySnapshot] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    # --- Cache maintenance ---
+
+    def _watched(self, manifest: Optional[GapManifest]) -> List[Path]:
+        paths = self.resolver.paths() + [self.root / ".gap/status.yaml"]
+        if manifest is not None:
+            for step in manifest.get_flat_steps():
+                paths.append(self.root / step.artifact)
+                paths.append(self.root / ".gap/proposals" / step.artifact)
+                paths.append(self.root / ".gap/acls" / f"{step.step}.yaml")
+        return paths
+
+    def _key(self, manifest: Optional[GapManifest]) -> tuple:
+        return tuple(stat_key(p) for p in self._watched(manifest))
+
+    def snapshot(self, force: bool = False) -> PolicySnapshot:
+        """Current snapshot; source files are re-stat'ed at most every `ttl` seconds."""
+        snap = self._snapshot
+        now = time.monotonic()
+        if snap is not None and not force and now - self._checked < self.ttl:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is None or force or self._key(snap.manifest) != snap.key:
+                snap = self._snapshot = self._build()
+            self._checked = time.monotonic()
+            return snap
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self.resolver.invalidate()
+
+    def _build(self) -> PolicySnapshot:
+        if not self.manifest_path.exists():
+            raise FileNotFoundError(f"Missing Project Law: {self.manifest_path}")
+        manifest = resolve_manifest(self.manifest_path)
+        resolved = self.resolver.resolve(force=True)
+        key = self._key(manifest)  # taken before reading so a concurrent change forces a rebuild
+
+        state = get_ledger(self.root, manifest).get_status(manifest)
+        steps = {s.step: s for s in manifest.get_flat_steps()}
+        phase = next(
+            (steps[name] for name, data in state.steps.items()
+             if data.status == StepStatus.UNLOCKED and name in steps),
+            None,
+        )
+
+        acl = None
+        if phase is not None and is_execution_step(phase):
+            acl_path = self.root / ".gap/acls" / f"{phase.step}.yaml"
+            if acl_path.exists():
+                acl = load_acl_file(acl_path)
+        return PolicySnapshot(key, manifest, phase, resolved, acl)
+
+    # --- Queries ---
+
+    def current_phase(self) -> Optional[str]:
+        """The first unlocked step (what `gap check status` marks 🟢), or None when nothing is open."""
+        return self.snapshot().phase
+
+    def is_execution_phase(self, phase: Optional[str] = None) -> bool:
+        snap = self.snapshot()
+        if phase is None or phase == snap.phase:
+            return snap.step is not None and is_execution_step(snap.step)
+        step = next((s for s in snap.manifest.get_flat_steps() if s.step == phase), None)
+        return step is not None and is_execution_step(step)
+
+    def effective_policy(self) -> EffectivePolicy:
+        return self.snapshot().policy.model_copy(deep=True)
+
+    def acl(self) -> Optional[AccessControlList]:
+        return self.snapshot().acl
+
+    def can_write(self, path: str) -> bool:
+        """
+        Decision records must be proposed (never written directly); execution
+        output is allowed only if it matches the phase ACL.
+        """
+        snap = self.snapshot()
+        decision = snap.decisions.get(path)
+        if decision is None:
+            decision = snap.acl is not None and normalize_path(path) in snap.acl
+            if len(snap.decisions) >= MAX_DECISIONS:
+                snap.decisions.clear()
+            snap.decisions[path] = decision
+        return decision
+
+    def should_pause(self, task_id: str) -> bool:
+        """Checkpoint decision for the task that just finished (session exceptions applied)."""
+        return self.snapshot().resolved.should_pause(task_id)
+
+
+_engines: Dict[Tuple[str, str], PolicyEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_policy_engine(root: Path, manifest_path: Optional[Path] = None) -> PolicyEngine:
+    """Process-wide PolicyEngine per project (created on first use)."""
+    root = Path(root)
+    manifest_path = Path(manifest_path) if manifest_path else root / "manifest.yaml"
+    key = (str(root.resolve()), str(manifest_path.resolve()))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = PolicyEngine(root, manifest_path)
+        return engine
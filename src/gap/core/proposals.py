@@ -0,0 +1,153 @@
+"""
+Content-addressed proposal store.
+
+Every draft is stored once as a zlib-compressed blob at
+`.gap/objects/<sha[:2]>/<sha[2:]>`, named by the sha256 of its uncompressed
+content. A regenerated identical draft, or the same text proposed for another
+step, adds no new blob. Set GAP_OBJECT_STORE to share one object directory
+between projects.
+
+Each step has a ref, `.gap/refs/proposals/<step>.json`, holding the current
+head hash, the working copy's stat, and the step's draft history.
+
+`.gap/proposals/<artifact>` remains a plain working copy, so supervisors and
+agents can read and edit the draft there as before. While its stat matches the
+ref, its hash is known without reading it. That makes "already proposed" a
+stat and a string comparison.
+"""
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+OBJECTS_PATH = ".gap/objects"
+REFS_PATH = ".gap/refs/proposals"
+PROPOSALS_PATH = ".gap/proposals"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ProposalStore:
+    def __init__(self, root: Path, level: int = 6):
+        self.root = Path(root)
+        self.objects = Path(os.environ.get("GAP_OBJECT_STORE") or self.root / OBJECTS_PATH)
+        self.level = level  # zlib level; 0 stores blobs uncompressed inside the zlib envelope
+
+    # --- Blobs ---
+
+    def _object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha[2:]
+
+    def put(self, data: bytes) -> str:
+        """Stores `data` once; returns its sha256."""
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._object_path(sha)
+        if not path.exists():
+            _atomic_write(path, zlib.compress(data, self.level))
+        return sha
+
+    def get(self, sha: str) -> bytes:
+        with open(self._object_path(sha), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != sha:
+            raise ValueError(f"Object {sha[:12]} is corrupt.")
+        return data
+
+    # --- Refs ---
+
+    def working_copy(self, artifact: str) -> Path:
+        return self.root / PROPOSALS_PATH / artifact
+
+    def _ref_path(self, step: str) -> Path:
+        return self.root / REFS_PATH / f"{step}.json"
+
+    def ref(self, step: str) -> Dict:
+        try:
+            with open(self._ref_path(step), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"head": None, "stat": None, "history": []}
+
+    def _save_ref(self, step: str, ref: Dict) -> None:
+        _atomic_write(self._ref_path(step), json.dumps(ref, indent=1).encode())
+
+    def history(self, step: str) -> List[Dict]:
+        """Drafts of a step, oldest first: {sha256, timestamp, source, size}."""
+        return self.ref(step)["history"]
+
+    def current(self, step: str, artifact: str) -> Optional[str]:
+        """sha256 of the working copy (None if absent); rehashed only if its stat left the ref's."""
+        try:
+            st = os.stat(self.working_copy(artifact))
+        except OSError:
+            return None
+        ref = self.ref(step)
+        if ref["head"] and ref["stat"] == [st.st_mtime_ns, st.st_size]:
+            return ref["head"]
+        with open(self.working_copy(artifact), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def resolve(self, step: str, prefix: str) -> str:
+        """Full hash of the draft in the step's history starting with `prefix`."""
+        matches = {e["sha256"] for e in self.history(step) if e["sha256"].startswith(prefix)}
+        if len(matches) != 1:
+            raise KeyError(f"{'No' if not matches else 'Ambiguous'} draft '{prefix}' for step '{step}'.")
+        return matches.pop()
+
+    # --- Drafts ---
+
+    def propose(self, step: str, artifact: str, data: bytes, source: str = "scribe") -> Tuple[str, bool]:
+        """
+        Makes `data` the step's current draft. Returns (sha256, written); an
+        identical current draft is left untouched and `written` is False.
+        """
+        sha = hashlib.sha256(data).hexdigest()
+        if self.snapshot(step, artifact) == sha:  # keeps a hand-edited draft before replacing it
+            return sha, False
+        self.put(data)
+        _atomic_write(self.working_copy(artifact), data)
+        self._record(step, artifact, sha, len(data), source)
+        return sha, True
+
+    def snapshot(self, step: str, artifact: str, source: str = "edit") -> Optional[str]:
+        """Records a hand-edited working copy as a draft; returns its hash (None if absent)."""
+        sha = self.current(step, artifact)
+        ref = self.ref(step)
+        if sha is None:
+            return None
+        if sha == ref["head"]:
+            st = os.stat(self.working_copy(artifact))
+            if ref["stat"] != [st.st_mtime_ns, st.st_size]:  # touched, not changed
+                ref["stat"] = [st.st_mtime_ns, st.st_size]
+                self._save_ref(step, ref)
+            return sha
+        with open(self.working_copy(artifact), "rb") as f:
+            data = f.read()
+        sha = self.put(data)
+        self._record(step, artifact, sha, len(data), source)
+        return sha
+
+    def restore(self, step: str, artifact: str, sha: str) -> None:
+        """Checks out an earlier draft as the working copy."""
+        self.snapshot(step, artifact)
+        data = self.get(sha)
+        _atomic_write(self.working_copy(artifact), data)
+        self._record(step, artifact, sha, len(data), "restore")
+
+    def _record(self, step: str, artifact: str, sha: str, size: int, source: str) -> None:
+        ref = self.ref(step)
+        st = os.stat(self.working_copy(artifact))
+        ref["artifact"] = artifact
+        ref["head"] = sha
+        ref["stat"] = [st.st_mtime_ns, st.st_size]
+        ref["history"].append({"sha256": sha, "timestamp": datetime.now().isoformat(), "source": source, "size": size})
+        self._save_ref(step, ref)
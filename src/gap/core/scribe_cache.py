@@ -0,0 +1,116 @@
+"""
+Memoized scribe output (`.gap/cache/scribe.json`).
+
+A render is identified by a key over:
+- the template's source hash and the hashes of every template it includes,
+  extends or imports (resolved through the template's own directory);
+- the input data, including the variables scribe injects;
+- the artifact path and gate mode;
+- the Jinja2 version.
+
+The cache maps each step to the key of its last render and the sha256 of that
+output. If the key matches and the proposal or live artifact still has that
+hash, `gap scribe create` skips rendering and writing. Template hashes and
+their parsed references are kept per stat, so a hit costs a few stats and one
+hash of the input data.
+
+Templates with dynamic references (`{% include name %}`) are never memoized.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import jinja2
+from jinja2 import Environment, meta
+
+CACHE_PATH = ".gap/cache/scribe.json"
+CACHE_VERSION = 1
+
+
+class ScribeCache:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = self.root / CACHE_PATH
+        self.templates: Dict[str, Dict] = {}   # template path -> {stat, sha256, deps}
+        self.outputs: Dict[str, Dict] = {}     # step -> {key, sha256}
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.templates = data.get("templates") or {}
+                self.outputs = data.get("outputs") or {}
+        except (OSError, ValueError):
+            pass
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CACHE_VERSION, "templates": self.templates, "outputs": self.outputs}))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    # --- Keys ---
+
+    def _template(self, path: Path) -> Tuple[str, Optional[List[str]]]:
+        """(sha256, referenced template names); the source is re-read and parsed only when its stat changed."""
+        st = os.stat(path)
+        entry = self.templates.get(str(path))
+        if entry and entry["stat"] == [st.st_mtime_ns, st.st_size]:
+            return entry["sha256"], entry["deps"]
+        source = path.read_bytes()
+        try:
+            refs = list(meta.find_referenced_templates(Environment().parse(source.decode("utf-8"))))
+            deps = None if None in refs else sorted(set(refs))
+        except (jinja2.TemplateSyntaxError, UnicodeDecodeError):
+            deps = None
+        sha = hashlib.sha256(source).hexdigest()
+        self.templates[str(path)] = {"stat": [st.st_mtime_ns, st.st_size], "sha256": sha, "deps": deps}
+        self.dirty = True
+        return sha, deps
+
+    def template_hash(self, template_path: Path) -> Optional[str]:
+        """Hash over a template and everything it references; None if a reference is dynamic or missing."""
+        base = template_path.parent
+        seen: Dict[str, str] = {}
+        stack = [template_path.name]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            path = base / name
+            if not path.is_file():
+                return None
+            sha, deps = self._template(path)
+            if deps is None:
+                return None
+            seen[name] = sha
+            stack.extend(deps)
+        return hashlib.sha256("".join(f"{n} {seen[n]}\n" for n in sorted(seen)).encode()).hexdigest()
+
+    def key(self, template_path: Path, data: Dict, artifact: str, gate: bool) -> Optional[str]:
+        template = self.template_hash(template_path)
+        if template is None:
+            return None
+        payload = {"template": template, "data": data, "artifact": artifact, "gate": gate, "jinja2": jinja2.__version__}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    # --- Outputs ---
+
+    def lookup(self, step: str, key: Optional[str]) -> Optional[str]:
+        """sha256 of the output last rendered for `key`, if any."""
+        entry = self.outputs.get(step)
+        if key is None or not entry or entry["key"] != key:
+            return None
+        return entry["sha256"]
+
+    def record(self, step: str, key: Optional[str], sha: str) -> None:
+        if key is None or self.outputs.get(step) == {"key": key, "sha256": sha}:
+            return
+        self.outputs[step] = {"key": key, "sha256": sha}
+        self.dirty = True
@@ -0,0 +1,234 @@
+"""
+Session log: buffered, rotating JSONL writer for `.gap/sessions/`.
+
+All components of one process share a single SessionLog (and session id) per
+project root via `get_session_log()`. Entries are serialized and written by a
+background thread in batches; segments are rotated by size and closed segments
+are gzip-compressed.
+
+Layout:
+    .gap/sessions/<session_id>.log.jsonl              active segment
+    .gap/sessions/<session_id>.<seq>.log.jsonl.gz     closed segments (seq = 0001, 0002, ...)
+"""
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def new_session_id() -> str:
+    """Timestamp + pid, so two processes started in the same second never share a file."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+def segment_paths(log_dir: Path, session_id: str) -> List[Path]:
+    """All segments of a session in write order (closed segments first, active last)."""
+    closed = sorted(log_dir.glob(f"{session_id}.[0-9][0-9][0-9][0-9].log.jsonl*"))
+    active = log_dir / f"{session_id}.log.jsonl"
+    return closed + ([active] if active.exists() else [])
+
+
+class SessionLog:
+    """
+    Thread-safe, non-blocking session logger.
+
+    Args:
+        root: Project root (logs go to `<root>/.gap/sessions`).
+        session_id: Shared id; defaults to $GAP_SESSION_ID or a fresh id.
+        batch_size: Max entries written per batch.
+        flush_interval: Max seconds an entry waits in memory before being written.
+        fsync: 'always' (every batch), 'interval' (at most every fsync_interval s) or 'never'.
+        max_bytes: Rotate the active segment once it grows past this size (0 disables).
+        compress: Gzip closed segments.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        session_id: Optional[str] = None,
+        batch_size: int = 1024,
+        flush_interval: float = 0.2,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        compress: bool = True,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+
+        self.root = root
+        self.session_id = session_id or os.environ.get("GAP_SESSION_ID") or new_session_id()
+        self.log_dir = self.root / ".gap/sessions"
+        self.path = self.log_dir / f"{self.session_id}.log.jsonl"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.compress = compress
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._file = None
+        self._size = 0
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=f"gap-session-log-{self.session_id}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- Producer API ---
+
+    def log(self, entry: Dict) -> None:
+        """Queue an entry (a shallow copy is taken and timestamped). Never blocks on I/O."""
+        if self._closed:
+            raise RuntimeError("SessionLog is closed.")
+        self._raise_error()
+        record = dict(entry)
+        record.setdefault("timestamp", datetime.now().isoformat())
+        record.setdefault("session_id", self.session_id)
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until everything logged so far is written (and fsynced unless
+        fsync='never'). Raises RuntimeError if the writer thread has failed.
+        """
+        if self._closed:
+            return
+        self._raise_error()
+        done = threading.Event()
+        self._queue.put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Poll so a writer thread that died without reaching its handler cannot block us forever.
+        while not done.wait(0.1):
+            if not self._thread.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                break
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"SessionLog writer failed: {self._error}") from self._error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    # --- Writer thread ---
+
+    def _open(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._write(batch)
+                if self._file and (waiters or stop):
+                    self._sync(force=True)
+            except Exception as e:
+                self._error = e
+            for w in waiters:
+                w.set()
+            if stop or self._error is not None:
+                if self._file:
+                    try:
+                        self._file.close()
+                    except OSError:
+                        pass
+                    self._file = None
+                if stop:
+                    return
+                self._drain()
+                return
+
+    def _drain(self):
+        """After a failure: drop entries and release flush() waiters until close()."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _write(self, batch: List[Dict]):
+        if self._file is None:
+            self._open()
+        data = "".join(json.dumps(e, default=str) + "\n" for e in batch)
+        self._file.write(data)
+        self._size += len(data.encode("utf-8"))
+        self._sync()
+        if self.max_bytes and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _sync(self, force: bool = False):
+        self._file.flush()
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if force or self.fsync == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def _rotate(self):
+        self._sync(force=True)
+        self._file.close()
+        self._file = None
+
+        existing = segment_paths(self.log_dir, self.session_id)
+        seq = len(existing)  # closed segments + the active one
+        closed = self.log_dir / f"{self.session_id}.{seq:04d}.log.jsonl"
+        os.replace(self.path, closed)
+        if self.compress:
+            with open(closed, "rb") as src, gzip.open(f"{closed}.gz", "wb", compresslevel=5) as dst:
+                shutil.copyfileobj(src, dst)
+            closed.unlink()
+
+
+_registry: Dict[str, SessionLog] = {}
+_registry_lock = threading.Lock()
+
+
+def get_session_log(root: Path, **kwargs) -> SessionLog:
+    """Return the process-wide SessionLog for a project root (created on first use)."""
+    key = str(Path(root).resolve())
+    with _registry_lock:
+        log = _registry.get(key)
+        if log is None or log._closed:
+            log = _registry[key] = SessionLog(Path(root), **kwargs)
+        return log
@@ -0,0 +1,198 @@
+"""
+Lightweight tracing for harness runs.
+
+Spans record wall-clock duration plus free-form attributes (tokens, bytes,
+paths, ...) and can be exported as Chrome trace-event JSON (load it in
+chrome://tracing or https://ui.perfetto.dev) or summarized as a table.
+
+Tracing is off unless enabled (`enable()` or $GAP_TRACE). $GAP_TRACE is either
+a flag (`1`, `true`, `yes`, `on` enable tracing with the default output path;
+`0`, `false`, `no`, `off` or empty leave it off) or an output path. Disabled
+spans are a shared no-op object, so instrumented code pays one attribute check
+per call.
+
+    from gap.core.trace import span, traced
+
+    with span("llm.chat", cat="llm", model=model) as s:
+        ...
+        s.set(tokens=usage.total_tokens)
+
+    @traced("harness.execute", cat="harness")
+    def execute(...): ...
+"""
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Attributes summed per span name in the summary table.
+COUNTERS = ("tokens", "bytes")
+
+TRUTHY = {"1", "true", "yes", "on"}
+FALSY = {"", "0", "false", "no", "off"}
+
+
+def trace_target(value: Optional[str]) -> Optional[str]:
+    """A $GAP_TRACE value -> None (off), "" (on, default output path) or the output path."""
+    if value is None or value.strip().lower() in FALSY:
+        return None
+    if value.strip().lower() in TRUTHY:
+        return ""
+    return value
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def set(self, **attrs) -> None:
+        self.args.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self, end)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans in memory (thread-safe: list.append is atomic)."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.events: List[tuple] = []
+
+    def span(self, name: str, cat: str = "gap", **args):
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, cat, args)
+
+    def reset(self) -> None:
+        self.origin = time.perf_counter_ns()
+        self.events = []
+
+    def _record(self, span: Span, end: int) -> None:
+        self.events.append((span.name, span.cat, span.start, end, threading.get_native_id(), span.args))
+
+    # --- Export ---
+
+    def chrome_trace(self) -> Dict:
+        events = [
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": tid,
+                "args": args,
+            }
+            for name, cat, start, end, tid, args in sorted(self.events, key=lambda e: e[2])
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        return path
+
+    def summary(self) -> List[Dict]:
+        """One row per span name: calls, total/mean/max seconds and summed counters, slowest first."""
+        rows: Dict[str, Dict] = {}
+        for name, _cat, start, end, _tid, args in self.events:
+            row = rows.get(name)
+            if row is None:
+                row = rows[name] = {"name": name, "calls": 0, "total": 0.0, "max": 0.0, **{c: 0 for c in COUNTERS}}
+            seconds = (end - start) / 1e9
+            row["calls"] += 1
+            row["total"] += seconds
+            row["max"] = max(row["max"], seconds)
+            for counter in COUNTERS:
+                value = args.get(counter)
+                if isinstance(value, (int, float)):
+                    row[counter] += value
+        for row in rows.values():
+            row["mean"] = row["total"] / row["calls"]
+        return sorted(rows.values(), key=lambda r: r["total"], reverse=True)
+
+    def format_summary(self) -> str:
+        lines = [f"{'Span':<28} {'Calls':>6} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9} {'Tokens':>9} {'Bytes':>11}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:<28} {row['calls']:>6} {row['total']:>9.2f} {row['mean'] * 1000:>9.1f} "
+                f"{row['max'] * 1000:>9.1f} {row['tokens']:>9} {row['bytes']:>11}"
+            )
+        return "\n".join(lines)
+
+
+_tracer = Tracer(enabled=trace_target(os.environ.get("GAP_TRACE")) is not None)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def enable() -> Tracer:
+    _tracer.enabled = True
+    return _tracer
+
+
+def disable() -> None:
+    _tracer.enabled = False
+
+
+def span(name: str, cat: str = "gap", **args):
+    """Span on the process-wide tracer (a no-op when tracing is disabled)."""
+    if not _tracer.enabled:
+        return NOOP_SPAN
+    return Span(_tracer, name, cat, args)
+
+
+def traced(name: Optional[str] = None, cat: str = "gap"):
+    """Decorator form of span(); the wrapped call is untouched while tracing is disabled."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(_tracer, label, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
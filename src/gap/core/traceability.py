@@ -0,0 +1,433 @@
+"""
+Traceability audit (`gap check trace`): Tasks -> Design Properties -> Requirements.
+
+Each Markdown artifact is tokenized once into a FileIndex:
+
+- definitions: an ID (R-01, DP-02, T-03, ...) at the start of a list item,
+  heading or table row, or an explicit `<!-- id: X -->` marker;
+- citations: `Traces to: ...` / `Validates: ...` (plain, bold, italic or in
+  parentheses), attributed to the definition block they appear in.
+
+Links are then resolved with set operations over the three indexes.
+
+The audit is incremental. `.gap/cache/trace.json` holds each artifact's stat
+and content hash, plus the violations of the previous run. The per-file indexes
+live next to it in `.gap/cache/trace/<sha256>.json`, keyed by content. An
+unchanged artifact's index is never rewritten. When an artifact changes, only
+some blocks are rechecked, and everything else is carried over:
+- blocks whose definitions or multiset of cited targets changed;
+- blocks citing IDs that appeared or disappeared.
+The difference to the previous run is reported as new and resolved violations.
+
+Rules (from the original TraceabilityAuditor):
+- a design citation must name a requirement            (error)
+- a task citation must name a requirement or property  (error)
+- a design property or task without citations is orphaned intent (warning)
+- an ID defined more than once in an artifact           (warning)
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from gap.core.manifest import GapManifest
+from gap.core.validator import ValidationError
+
+CACHE_VERSION = 3
+CACHE_PATH = ".gap/cache/trace.json"
+INDEX_DIR = ".gap/cache/trace"
+TRACE_STEPS = ("requirements", "design", "tasks")
+# Steps whose blocks must cite something, and what they may cite.
+CONTEXT = {"design": "Design Property", "tasks": "Task"}
+TARGETS = {"design": ("requirements",), "tasks": ("requirements", "design")}
+
+ID = r"(?:G|R|FR|NFR|DP|PROP|P|TASK|T|H)-[A-Z0-9_][A-Z0-9_\-]*"
+ID_TOKEN = re.compile(rf"(?<![A-Za-z0-9_\-]){ID}")
+ID_MARKER = re.compile(r"<!--\s*id:\s*(.*?)\s*-->")
+# Leading list/heading/table/emphasis/checkbox markup before a defining ID.
+DEFINITION = re.compile(rf"^[\s#>|*+\-_`]*(?:\d+\.\s+)?(?:\[[ xX~/\-]\]\s*)?[*_`]*({ID})")
+CITATION = re.compile(r"(?P<kind>Traces to|Validates)[*_]*\s*:\s*[*_]*(?P<targets>[^)\n]*)", re.IGNORECASE)
+
+Subject = Tuple[str, Optional[str]]  # (step, block owner id; None for citations before any definition)
+
+
+class TraceViolation(ValidationError):
+    """A ValidationError with a location and a stable identity (rule, subject, target) for diffing runs."""
+    def __init__(self, message: str, severity: str, rule: str, path: str, line: int, subject: Optional[str],
+                 target: Optional[str] = None, step: Optional[str] = None):
+        super().__init__(message, severity)
+        self.rule = rule
+        self.path = path
+        self.line = line
+        self.subject = subject
+        self.target = target
+        self.step = step
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str], Optional[str]]:
+        return (self.rule, self.path, self.subject, self.target)
+
+    def to_dict(self) -> Dict:
+        return {"message": self.message, "severity": self.severity, "rule": self.rule, "path": self.path,
+                "line": self.line, "subject": self.subject, "target": self.target, "step": self.step}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TraceViolation":
+        return cls(**data)
+
+
+def violation(rule: str, step: str, rel: str, line: int, subject: Optional[str], target: Optional[str] = None,
+              lines: Optional[List[int]] = None) -> TraceViolation:
+    name = Path(rel).name
+    context = CONTEXT.get(step, "Block")
+    if rule == "unknown_citation":
+        message, severity = f"{context} in {name}:{line} cites unknown ID: '{target}'", "error"
+    elif rule == "orphan":
+        message, severity = f"Orphaned Intent: {context} '{subject}' ({name}:{line}) has no traceability link.", "warning"
+    else:
+        message = f"ID '{subject}' is defined {len(lines)} times in {name} (lines {', '.join(map(str, lines))})."
+        severity = "warning"
+    return TraceViolation(message, severity, rule, rel, line, subject, target, step)
+
+
+class FileIndex:
+    """IDs defined in one artifact and the citations made from each definition block."""
+    __slots__ = ("sha256", "defs", "cites", "_by_owner")
+
+    def __init__(self, sha256: str, defs: Dict[str, List[int]], cites: List[Tuple[Optional[str], str, str, int]]):
+        self.sha256 = sha256
+        self.defs = defs    # id -> lines where it is defined
+        self.cites = cites  # (owner id or None, kind, target id, line)
+        self._by_owner = None
+
+    @property
+    def cited_by(self) -> Set[str]:
+        return {owner for owner, _, _, _ in self.cites if owner is not None}
+
+    def by_owner(self) -> Dict[Optional[str], List[Tuple[str, int]]]:
+        """owner -> [(target, line)]"""
+        if self._by_owner is None:
+            grouped: Dict[Optional[str], List[Tuple[str, int]]] = {}
+            for owner, _kind, target, line in self.cites:
+                grouped.setdefault(owner, []).append((target, line))
+            self._by_owner = grouped
+        return self._by_owner
+
+    def subjects(self) -> Set[Optional[str]]:
+        return set(self.defs) | set(self.by_owner())
+
+    def to_dict(self) -> Dict:
+        return {"sha256": self.sha256, "defs": self.defs, "cites": self.cites}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FileIndex":
+        return cls(data["sha256"], data["defs"], data["cites"])  # cites stay JSON lists; only unpacked
+
+
+def tokenize(text: str, sha256: str = "") -> FileIndex:
+    """Single pass over the lines of an artifact."""
+    defs: Dict[str, List[int]] = {}
+    cites: List[Tuple[Optional[str], str, str, int]] = []
+    owner = None
+    for number, line in enumerate(text.splitlines(), 1):
+        if "-" not in line:
+            continue  # no ID, marker or citation target can appear
+
+        defined = [m.group(1) for m in ID_MARKER.finditer(line)] if "<!--" in line else []
+        match = DEFINITION.match(line)
+        if match:
+            defined.append(match.group(1))
+        for id_ in defined:
+            defs.setdefault(id_, []).append(number)
+        if defined:
+            owner = defined[0]
+
+        for citation in CITATION.finditer(line):
+            kind = "validates" if citation.group("kind").lower() == "validates" else "traces"
+            for target in ID_TOKEN.findall(citation.group("targets")):
+                cites.append((owner, kind, target, number))
+    return FileIndex(sha256, defs, cites)
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# --- Rules ---
+
+def valid_targets(indexes: Dict[str, Tuple[str, FileIndex]]) -> Dict[str, Set[str]]:
+    defined = {step: set(index.defs) for step, (_, index) in indexes.items()}
+    return {step: set().union(*(defined.get(t, ()) for t in targets)) for step, targets in TARGETS.items()}
+
+
+def check_subject(step: str, rel: str, index: FileIndex, owner: Optional[str], valid: Dict[str, Set[str]]) -> List[TraceViolation]:
+    """All violations of one definition block."""
+    found = []
+    lines = index.defs.get(owner) if owner is not None else None
+    if step in CONTEXT:
+        cites = index.by_owner().get(owner, ())
+        allowed = valid[step]
+        for target, line in cites:
+            if target not in allowed:
+                found.append(violation("unknown_citation", step, rel, line, owner, target))
+        if lines and not cites:
+            found.append(violation("orphan", step, rel, lines[0], owner))
+    if lines and len(lines) > 1:
+        found.append(violation("duplicate", step, rel, lines[1], owner, lines=lines))
+    return found
+
+
+def check(indexes: Dict[str, Tuple[str, FileIndex]]) -> List[TraceViolation]:
+    """Full audit: resolves every citation against the defined ID sets."""
+    valid = valid_targets(indexes)
+    found: List[TraceViolation] = []
+    for step, (rel, index) in indexes.items():
+        for owner in index.subjects():
+            found.extend(check_subject(step, rel, index, owner, valid))
+    return _ordered(found)
+
+
+def _ordered(violations: List[TraceViolation]) -> List[TraceViolation]:
+    order = {step: i for i, step in enumerate(TRACE_STEPS)}
+    return sorted(violations, key=lambda v: (order.get(v.step, len(order)), v.line, v.rule, v.target or ""))
+
+
+def changed_subjects(old: FileIndex, new: FileIndex) -> Tuple[Set[Optional[str]], Set[str]]:
+    """Blocks whose definition count or multiset of cited targets changed, and IDs that appeared or disappeared."""
+    old_defs, new_defs = old.defs, new.defs
+    appeared_or_gone = set(old_defs).symmetric_difference(new_defs)
+    blocks = set(appeared_or_gone)
+    blocks.update(i for i in set(old_defs) & set(new_defs) if len(old_defs[i]) != len(new_defs[i]))
+
+    old_cites = Counter((owner, target) for owner, _, target, _ in old.cites)
+    new_cites = Counter((owner, target) for owner, _, target, _ in new.cites)
+    blocks.update(owner for owner, _ in (old_cites - new_cites) + (new_cites - old_cites))
+    return blocks, appeared_or_gone
+
+
+def citing(indexes: Dict[str, Tuple[str, FileIndex]], ids: Set[str]) -> Set[Subject]:
+    """Blocks (step, owner) citing any of `ids`."""
+    if not ids:
+        return set()
+    return {(step, owner) for step, (_, index) in indexes.items()
+            for owner, _, target, _ in index.cites if target in ids}
+
+
+def _multiset_difference(items: List[TraceViolation], other: List[TraceViolation]) -> List[TraceViolation]:
+    """The occurrences of each key in `items` beyond its count in `other`."""
+    budget = Counter(v.key for v in other)
+    found = []
+    for v in items:
+        if budget[v.key] > 0:
+            budget[v.key] -= 1
+        else:
+            found.append(v)
+    return found
+
+
+class TraceabilityAuditor:
+    def __init__(self, root: Path, manifest: GapManifest, use_cache: bool = True):
+        self.root = Path(root)
+        self.manifest = manifest
+        self.use_cache = use_cache
+        self.cache_path = self.root / CACHE_PATH
+        self._artifact_map = {step.step: step.artifact for step in manifest.get_flat_steps()}
+        self.index_dir = self.root / INDEX_DIR
+        self._cache: Dict = {}
+        self._files: Dict[str, Dict] = {}           # rel -> {stat, sha256}
+        self._previous: Dict[str, FileIndex] = {}  # rel -> index before this run, for re-tokenized files
+        self._written: Dict[str, FileIndex] = {}   # sha256 -> new indexes to persist
+        self._lost = False                           # a previous index is missing; fall back to a full check
+        self._dirty = False
+        self.new: List[TraceViolation] = []
+        self.resolved: List[TraceViolation] = []
+        self.stats = {"files": 0, "tokenized": 0, "ids": 0, "citations": 0, "rechecked": 0,
+                      "incremental": False, "seconds": 0.0}
+
+    def artifact_path(self, step_id: str) -> Optional[Path]:
+        artifact = self._artifact_map.get(step_id)
+        if artifact is None or "*" in artifact:
+            return None  # directory artifacts are not traced
+        return self.root / artifact
+
+    # --- Persistent state ---
+
+    def _load_cache(self):
+        self._cache = {}
+        if self.use_cache and self.cache_path.exists():
+            try:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}  # derived data; rebuilt below
+            if data.get("version") == CACHE_VERSION:
+                self._cache = data
+        self._files = self._cache.get("files") or {}
+
+    def _load_index(self, sha256: str) -> Optional[FileIndex]:
+        if not self.use_cache:
+            return None
+        try:
+            with open(self.index_dir / f"{sha256}.json", encoding="utf-8") as f:
+                return FileIndex.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cache(self, steps: Dict[str, str], violations: List[TraceViolation]):
+        if not self.use_cache or not self._dirty:
+            return
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        for sha256, index in self._written.items():
+            tmp = self.index_dir / f"{sha256}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                # json.dumps uses the C encoder; json.dump(obj, f) would not
+                f.write(json.dumps(index.to_dict()))
+            os.replace(tmp, self.index_dir / f"{sha256}.json")
+        if self._written:
+            live = {f"{entry['sha256']}.json" for entry in self._files.values()}
+            for name in os.listdir(self.index_dir):
+                if name not in live:
+                    os.unlink(self.index_dir / name)
+
+        tmp = self.cache_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "version": CACHE_VERSION,
+                "files": self._files,
+                "steps": steps,
+                "violations": [v.to_dict() for v in violations],
+            }))
+        os.replace(tmp, self.cache_path)
+
+    def index_file(self, path: Path) -> Optional[FileIndex]:
+        """Tokenized artifact, reusing the cached index when stat or content hash still match."""
+        stat = _stat(path)
+        if stat is None:
+            return None
+        self.stats["files"] += 1
+        rel = path.relative_to(self.root).as_posix()
+        entry = self._files.get(rel)
+        if entry is not None and tuple(entry["stat"]) == stat:
+            index = self._load_index(entry["sha256"])
+            if index is not None:
+                return index
+
+        data = path.read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+        index = self._load_index(sha256) if entry is not None and entry["sha256"] == sha256 else None  # touched
+        if index is None:
+            index = tokenize(data.decode("utf-8", errors="replace"), sha256)
+            self.stats["tokenized"] += 1
+            self._written[sha256] = index
+            if entry is not None and entry["sha256"] != sha256:
+                previous = self._load_index(entry["sha256"])
+                if previous is None:
+                    self._lost = True
+                else:
+                    self._previous[rel] = previous
+        self._files[rel] = {"stat": list(stat), "sha256": sha256}
+        self._dirty = True
+        return index
+
+    # --- Audit ---
+
+    def indexes(self) -> Dict[str, Tuple[str, FileIndex]]:
+        """step -> (artifact path relative to root, index) for the traced steps that exist."""
+        found = {}
+        for step_id in TRACE_STEPS:
+            path = self.artifact_path(step_id)
+            if path is None:
+                continue
+            index = self.index_file(path)
+            if index is not None:
+                found[step_id] = (path.relative_to(self.root).as_posix(), index)
+        return found
+
+    def audit(self, full: bool = False) -> List[TraceViolation]:
+        """Current violations; `new`/`resolved` hold the difference to the previous run."""
+        started = time.perf_counter()
+        self._load_cache()
+        self._previous, self._written = {}, {}
+        self._lost = self._dirty = False
+        indexes = self.indexes()
+        steps = {step: rel for step, (rel, _) in indexes.items()}
+
+        previous = [TraceViolation.from_dict(v) for v in self._cache.get("violations", [])] if self._cache else None
+        incremental = not full and not self._lost and previous is not None and self._cache.get("steps") == steps
+        if incremental:
+            violations = self._incremental(indexes, previous)
+        else:
+            violations = check(indexes)
+            self._dirty = True
+            self.stats["rechecked"] = sum(len(index.subjects()) for _, index in indexes.values())
+
+        if previous is not None:
+            self.new = _multiset_difference(violations, previous)
+            self.resolved = _multiset_difference(previous, violations)
+        else:
+            self.new, self.resolved = list(violations), []
+
+        self._save_cache(steps, violations)
+        self.stats["incremental"] = incremental
+        self.stats["ids"] = sum(len(index.defs) for _, index in indexes.values())
+        self.stats["citations"] = sum(len(index.cites) for _, index in indexes.values())
+        self.stats["seconds"] = time.perf_counter() - started
+        return violations
+
+    def _incremental(self, indexes: Dict[str, Tuple[str, FileIndex]], previous: List[TraceViolation]) -> List[TraceViolation]:
+        changed = {step: (rel, index) for step, (rel, index) in indexes.items() if rel in self._previous}
+        if not changed:
+            self.stats["rechecked"] = 0
+            return previous
+
+        affected: Set[Subject] = set()
+        appeared_or_gone: Set[Subject] = set()
+        for step, (rel, index) in changed.items():
+            blocks, ids = changed_subjects(self._previous[rel], index)
+            affected.update((step, owner) for owner in blocks)
+            appeared_or_gone.update((step, id_) for id_ in ids)
+        # blocks elsewhere whose citations of these IDs now resolve differently
+        if appeared_or_gone:
+            ids = {id_ for _, id_ in appeared_or_gone}
+            steps = {step for step, _ in appeared_or_gone}
+            affected.update((s, o) for s, o in citing(indexes, ids) if steps.intersection(TARGETS.get(s, ())))
+
+        valid = valid_targets(indexes)
+        violations = []
+        moved: Dict[Tuple, List[TraceViolation]] = {}
+        for v in previous:
+            if (v.step, v.subject) in affected:
+                continue
+            if v.path not in self._previous:
+                violations.append(v)
+            elif v.rule == "unknown_citation":
+                moved.setdefault((v.step, v.subject, v.target), []).append(v)
+            else:
+                violations.append(self._relocate(v, indexes[v.step][1]))  # unchanged block, possibly moved
+        for (step, subject, target), group in moved.items():
+            # an unchanged block cites `target` exactly len(group) times; pair occurrences in order
+            index = indexes[step][1]
+            lines = [line for t, line in index.by_owner().get(subject, ()) if t == target]
+            for v, line in zip(sorted(group, key=lambda v: v.line), lines):
+                violations.append(violation(v.rule, v.step, v.path, line, v.subject, v.target))
+        for step, owner in affected:
+            rel, index = indexes[step]
+            violations.extend(check_subject(step, rel, index, owner, valid))
+        self.stats["rechecked"] = len(affected)
+        return _ordered(violations)
+
+    @staticmethod
+    def _relocate(v: TraceViolation, index: FileIndex) -> TraceViolation:
+        """An orphan or duplicate violation of an unchanged block, at the block's current lines."""
+        lines = index.defs.get(v.subject) if v.subject is not None else None
+        line = lines[1] if v.rule == "duplicate" else lines[0]
+        return violation(v.rule, v.step, v.path, line, v.subject, v.target, lines=lines)
+
@@ -1,5 +1,5 @@
 import typer
-from gap.commands import check, scribe, gate
+from gap.commands import check, scribe, gate, log, checkpoint
 
 app = typer.Typer(
     name="gap",
@@ -10,6 +10,8 @@ app = typer.Typer(
 app.add_typer(check.app, name="check")
 app.add_typer(scribe.app, name="scribe")
 app.add_typer(gate.app, name="gate")
+app.add_typer(log.app, name="log")
+app.add_typer(checkpoint.app, name="checkpoint")
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,90 @@
+import pytest
+from fnmatch import fnmatchcase
+from gap.core.acl import AccessControlList, AclMatcher, glob_to_regex, normalize_path
+
+
+@pytest.mark.parametrize("rule,path,expected", [
+    # Literal paths
+    ("src/main.py", "src/main.py", True),
+    ("src/main.py", "src/main.pyc", False),
+    ("src/main.py", "lib/src/main.py", False),
+    ("src/main.py", "./src//main.py", True),
+    # Directory rules cover their subtree
+    ("docs/updates/", "docs/updates/a.md", True),
+    ("docs/updates/", "docs/updates/deep/b.md", True),
+    ("docs/updates/", "docs/updates", False),
+    ("docs/updates/", "docs/other.md", False),
+    # Single star stays inside a segment
+    ("src/*.py", "src/a.py", True),
+    ("src/*.py", "src/pkg/a.py", False),
+    ("src/*", "src/a.py", True),
+    ("src/*", "src/pkg/a.py", False),
+    # Double star crosses directories
+    ("docs/updates/**", "docs/updates/a.md", True),
+    ("docs/updates/**", "docs/updates/x/y/z.md", True),
+    ("docs/updates/**", "docs/updates", False),
+    ("src/**/test_*.py", "src/test_a.py", True),
+    ("src/**/test_*.py", "src/a/b/test_a.py", True),
+    ("src/**/test_*.py", "src/a/b/a_test.py", False),
+    ("**/*.md", "README.md", True),
+    ("**/*.md", "a/b/c.md", True),
+    ("**/*", "anything/at/all.txt", True),
+    # ? and character classes
+    ("src/v?.py", "src/v1.py", True),
+    ("src/v?.py", "src/v10.py", False),
+    ("src/[ab].py", "src/a.py", True),
+    ("src/[!ab].py", "src/a.py", False),
+    ("src/[!ab].py", "src/c.py", True),
+    # Wildcard in a middle segment
+    ("src/*/models.py", "src/app/models.py", True),
+    ("src/*/models.py", "src/app/sub/models.py", False),
+    # Rules without a slash match the file name anywhere
+    ("walkthrough.md", "walkthrough.md", True),
+    ("walkthrough.md", "docs/walkthrough.md", True),
+    ("*.md", "docs/readme.md", True),
+    ("*.md", "docs/readme.txt", False),
+    # Regex metacharacters are literal
+    ("src/a+b(1).py", "src/a+b(1).py", True),
+    ("src/a+b(1).py", "src/aab1.py", False),
+    # Case sensitive
+    ("src/Main.py", "src/main.py", False),
+])
+def test_glob_semantics(rule, path, expected):
+    assert AclMatcher([rule]).matches(path) is expected
+
+
+def test_empty_matcher_is_falsy():
+    matcher = AclMatcher([])
+    assert not matcher
+    assert "src/main.py" not in matcher
+
+
+def test_many_rules_share_prefixes():
+    rules = [f"src/pkg_{i}/*.py" for i in range(200)] + [f"docs/file_{i}.md" for i in range(200)]
+    matcher = AclMatcher(rules)
+    assert "src/pkg_150/mod.py" in matcher
+    assert "src/pkg_150/sub/mod.py" not in matcher
+    assert "docs/file_199.md" in matcher
+    assert "docs/file_200.md" not in matcher
+
+
+def test_single_segment_globs_agree_with_fnmatch():
+    for glob in ["*.py", "a?c", "[abc]*", "[!x]yz", "*_test.*"]:
+        for name in ["a.py", "abc", "bzz", "ayz", "xyz", "foo_test.go", "foo.py"]:
+            assert AclMatcher([glob]).matches(name) == fnmatchcase(name, glob), (glob, name)
+
+
+def test_normalize_path():
+    assert normalize_path("./src/../src/a.py") == "src/a.py"
+    assert normalize_path("src\\win\\a.py") == "src/win/a.py"
+    assert normalize_path(".") == ""
+    assert glob_to_regex("**/") == "(?:[^/]+/)*"
+
+
+def test_access_control_list_snapshot():
+    acl = AccessControlList(["src/*.py", "walkthrough.md"], version=3, digest="abc")
+    assert acl.version == 3
+    assert "src/a.py" in acl
+    assert "lib/a.py" not in acl
+    assert acl.rules == frozenset({"src/*.py", "walkthrough.md"})
+    assert not AccessControlList()
@@ -0,0 +1,84 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.security import acl  # noqa: E402
+from gated_agent_tui.security.acl import AclLoader, get_acl_loader, parse_acl  # noqa: E402
+
+TASKS = """# Tasks
+
+## Access Control
+```yaml
+allow_write:
+{rules}
+```
+"""
+
+
+def write_tasks(root, *rules):
+    path = root / "specs/tasks.md"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(TASKS.format(rules="\n".join(f"  - {r}" for r in rules)))
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Counts how often the loader reads the spec's bytes."""
+    count = []
+    original = Path.read_bytes
+
+    def counting(self):
+        count.append(self.name)
+        return original(self)
+
+    monkeypatch.setattr(Path, "read_bytes", counting)
+    return count
+
+
+def test_unchanged_stat_skips_reading(tmp_path, reads):
+    write_tasks(tmp_path, "src/**")
+    loader = AclLoader(tmp_path)
+    first = loader.load()
+    assert first.version == 1 and "src/a.py" in first
+    assert loader.load() is first
+    assert len(reads) == 1
+
+
+def test_touch_only_keeps_the_version(tmp_path, reads):
+    path = write_tasks(tmp_path, "src/**")
+    loader = AclLoader(tmp_path)
+    first = loader.load()
+
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert loader.load() is first  # rehashed, same digest
+    assert loader.load() is first  # new stat remembered: not rehashed again
+    assert len(reads) == 2
+
+
+def test_real_change_bumps_the_version(tmp_path):
+    write_tasks(tmp_path, "src/**")
+    loader = AclLoader(tmp_path)
+    first = loader.load()
+
+    write_tasks(tmp_path, "src/**", "docs/guide.md")
+    second = loader.load()
+    assert second.version == first.version + 1
+    assert "docs/guide.md" in second and "docs/guide.md" not in first
+
+    (tmp_path / "specs/tasks.md").unlink()
+    third = loader.load()
+    assert third.version == 3 and not third and third.digest is None
+
+
+def test_loader_is_shared_per_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(acl, "_loaders", {})
+    write_tasks(tmp_path, "src/**")
+    assert get_acl_loader(tmp_path) is get_acl_loader(tmp_path / "specs" / "..")
+    assert get_acl_loader(tmp_path) is not get_acl_loader(tmp_path / "specs")
+    assert parse_acl(tmp_path) == {"src/**", "walkthrough.md"}
+    assert get_acl_loader(tmp_path).load().version == 1
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.agent.llm import AsyncGatedLLM, LLMError  # noqa: E402
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_next = 0
+        self.delay = 0.0
+        self.peers = set()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body: bytes, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            prompt = payload["messages"][-1]["content"]
+
+            with state.lock:
+                state.requests += 1
+                state.peers.add(self.client_address)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+                fail = state.fail_next > 0
+                if fail:
+                    state.fail_next -= 1
+            try:
+                time.sleep(state.delay)
+                if fail:
+                    self._send(500, b'{"error": {"message": "boom"}}')
+                    return
+
+                if payload.get("stream"):
+                    events = []
+                    for word in ["echo:", " ", prompt]:
+                        chunk = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": payload["model"],
+                                 "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+                        events.append(f"data: {json.dumps(chunk)}\n\n")
+                    events.append("data: [DONE]\n\n")
+                    self._send(200, "".join(events).encode(), content_type="text/event-stream")
+                    return
+
+                body = {
+                    "id": "c", "object": "chat.completion", "created": 0, "model": payload["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": f"echo: {prompt}"}}],
+                }
+                self._send(200, json.dumps(body).encode())
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+    return Handler
+
+
+@pytest.fixture
+def stub_server():
+    state = StubState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1", state
+    server.shutdown()
+    server.server_close()
+
+
+def make_llm(tmp_path, base_url, **kwargs):
+    return AsyncGatedLLM(tmp_path, "test-key", base_url=base_url, model="stub-model", backoff=0.01, **kwargs)
+
+
+def test_achat_many_bounded_and_ordered(stub_server, tmp_path):
+    base_url, state = stub_server
+    state.delay = 0.05
+
+    async def run():
+        async with make_llm(tmp_path, base_url, concurrency=3) as llm:
+            return await llm.achat_many([f"p{i}" for i in range(9)])
+
+    results = asyncio.run(run())
+    assert results == [f"echo: p{i}" for i in range(9)]
+    assert state.max_in_flight <= 3
+    assert state.max_in_flight > 1
+    # Keep-alive: nine requests over at most three pooled connections
+    assert len(state.peers) <= 3
+
+
+def test_retries_transient_errors(stub_server, tmp_path):
+    base_url, state = stub_server
+    state.fail_next = 2
+
+    async def run():
+        async with make_llm(tmp_path, base_url, max_retries=3) as llm:
+            return await llm.achat("hello")
+
+    assert asyncio.run(run()) == "echo: hello"
+    assert state.requests == 3
+
+
+def test_raises_after_retries_exhausted(stub_server, tmp_path):
+    base_url, state = stub_server
+    state.fail_next = 10
+
+    async def run():
+        async with make_llm(tmp_path, base_url, max_retries=1) as llm:
+            return await llm.achat("hello")
+
+    with pytest.raises(LLMError):
+        asyncio.run(run())
+    assert state.requests == 2
+
+
+def test_stream_yields_deltas(stub_server, tmp_path):
+    base_url, _ = stub_server
+
+    async def run():
+        async with make_llm(tmp_path, base_url) as llm:
+            return [delta async for delta in llm.astream("hi")]
+
+    assert "".join(asyncio.run(run())) == "echo: hi"
+
+
+def test_per_model_rate_limit(stub_server, tmp_path):
+    base_url, _ = stub_server
+
+    async def run():
+        async with make_llm(tmp_path, base_url, concurrency=8, rate_limits={"stub-model": 20.0}) as llm:
+            start = time.monotonic()
+            await llm.achat_many(["a", "b", "c", "d", "e"])
+            return time.monotonic() - start
+
+    # Burst of 1, then 20 req/s: five requests need at least ~0.2s
+    assert asyncio.run(run()) >= 0.18
+
+
+def test_client_reconnects_on_a_new_event_loop(stub_server, tmp_path):
+    base_url, _ = stub_server
+    llm = make_llm(tmp_path, base_url, concurrency=2)
+
+    async def run(prompt):
+        try:
+            return await llm.achat_many([prompt, prompt])
+        finally:
+            await llm.aclose()
+
+    assert asyncio.run(run("a")) == ["echo: a"] * 2
+    assert asyncio.run(run("b")) == ["echo: b"] * 2  # fresh loop, fresh pool and semaphore
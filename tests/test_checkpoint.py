@@ -0,0 +1,99 @@
+import json
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core import checkpoint as checkpoint_module
+from gap.core.checkpoint import CheckpointVerifier, checkpoint_key
+from gap.core.ledger import YamlLedger
+from gap.core.state import StepStatus
+from gap.main import app
+
+PLAN = """
+plan:
+  T-1:
+    checkpoints: [before_start, after_completion]
+    model: local-llama
+  T-2:
+    checkpoints: []
+  T-3:
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".gap").mkdir()
+    (tmp_path / ".gap/plan.yaml").write_text(PLAN)
+    (tmp_path / "manifest.yaml").write_text("kind: project\nname: demo\nversion: 0.1.0\ndescription: Demo\nflow: []\n")
+    return tmp_path
+
+
+def test_verdicts(project):
+    verifier = CheckpointVerifier(project, ttl=0)
+    verdicts = verifier.verify_many([("T-1", "before_start"), ("T-1", "during"), ("T-3", "before_start"), ("T-9", "before_start")])
+    assert [(v.allowed, v.reason) for v in verdicts] == [
+        (False, "pending"), (True, "not_required"), (True, "not_required"), (False, "unplanned"),
+    ]
+
+    verifier.approve("T-1", "before_start", approver="alice")
+    verdict = verifier.verify("T-1", "before_start")
+    assert (verdict.allowed, verdict.reason, verdict.approver) == (True, "approved", "alice")
+    assert not verifier.verify("T-1", "after_completion").allowed
+    assert YamlLedger(project).get_approval(checkpoint_key("T-1", "before_start")).status == StepStatus.COMPLETE
+
+
+def test_plan_and_ledger_are_compiled_once_per_change(project):
+    verifier = CheckpointVerifier(project, ttl=0)
+    verifier.verify("T-1", "before_start")
+    index = verifier._index
+
+    verifier.verify_many([("T-2", "before_start")] * 100)
+    assert verifier._index is index
+
+    # an approval written by another process is picked up through the status.yaml stat
+    YamlLedger(project).update_status(checkpoint_key("T-1", "before_start"), StepStatus.COMPLETE)
+    assert verifier.verify("T-1", "before_start").reason == "approved"
+
+    (project / ".gap/plan.yaml").write_text("plan:\n  T-1:\n    checkpoints: [after_completion]\n")
+    assert verifier.verify("T-1", "before_start").reason == "not_required"
+    assert verifier._index is not index
+
+
+def test_missing_and_invalid_plan_block(project):
+    (project / ".gap/plan.yaml").unlink()
+    assert CheckpointVerifier(project).verify("T-1", "before_start").reason == "no_plan"
+
+    (project / ".gap/plan.yaml").write_text("plan:\n  T-1:\n    checkpoints: 7\n")
+    verdict = CheckpointVerifier(project).verify("T-1", "before_start")
+    assert (verdict.allowed, verdict.reason) == (False, "invalid_plan")
+
+
+def test_cli_bulk_verify_and_approve(project):
+    runner = CliRunner()
+    manifest = str(project / "manifest.yaml")
+
+    result = runner.invoke(app, ["checkpoint", "verify", "T-1", "T-2:after_completion", "-m", manifest, "--json"])
+    assert result.exit_code == 1
+    verdicts = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(v["task_id"], v["phase"], v["allowed"]) for v in verdicts] == [
+        ("T-1", "before_start", False), ("T-2", "after_completion", True),
+    ]
+
+    assert runner.invoke(app, ["checkpoint", "approve", "T-1", "-m", manifest]).exit_code == 0
+    result = runner.invoke(app, ["checkpoint", "verify", "T-1", "T-2", "-m", manifest])
+    assert result.exit_code == 0, result.stdout
+    assert "approved by user" in result.stdout
+
+
+def test_approvals_use_the_configured_ledger(project, monkeypatch):
+    requested = []
+
+    def fake_get_ledger(root, manifest):
+        requested.append(manifest.name)
+        return YamlLedger(root)
+
+    monkeypatch.setattr(checkpoint_module, "get_ledger", fake_get_ledger)
+    verifier = CheckpointVerifier(project, ttl=0)
+    verifier.approve("T-1", "before_start")
+    assert verifier.verify("T-1", "before_start").allowed
+    assert requested == ["demo"]
@@ -0,0 +1,97 @@
+import random
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core.diff import diff_files, diff_lines, myers
+from gap.main import app
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - step: requirements
+    artifact: docs/requirements.md
+"""
+
+
+def _apply(a, b, ops):
+    out = []
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+            out += a[i1:i2]
+        elif tag == "insert":
+            out += b[j1:j2]
+    return out
+
+
+def _lcs(a, b):
+    row = [0] * (len(b) + 1)
+    for x in a:
+        prev, row = row, [0]
+        for j, y in enumerate(b):
+            row.append(prev[j] + 1 if x == y else max(prev[j + 1], row[j]))
+    return row[-1]
+
+
+def test_myers_finds_a_shortest_edit_script():
+    rng = random.Random(7)
+    for _ in range(500):
+        a = [rng.randint(0, 3) for _ in range(rng.randint(0, 12))]
+        b = [rng.randint(0, 3) for _ in range(rng.randint(0, 12))]
+        ops = []
+        myers(a, 0, len(a), b, 0, len(b), ops)
+        assert _apply(a, b, ops) == b
+        assert sum(i2 - i1 for tag, i1, i2, _, _ in ops if tag == "equal") == _lcs(a, b)
+        assert _apply(a, b, diff_lines(a, b)) == b
+
+
+def test_identical_files_short_circuit(tmp_path):
+    (tmp_path / "a.md").write_text("same\n" * 100)
+    (tmp_path / "b.md").write_text("same\n" * 100)
+    result = diff_files(tmp_path / "a.md", tmp_path / "b.md")
+    assert result.identical and list(result.unified("a", "b")) == []
+
+
+def test_only_the_changed_window_is_split(tmp_path):
+    lines = [f"line {i}\n" for i in range(10000)]
+    (tmp_path / "live.md").write_text("".join(lines))
+    lines[5000] = "changed\n"
+    (tmp_path / "proposal.md").write_text("".join(lines))
+    result = diff_files(tmp_path / "live.md", tmp_path / "proposal.md")
+    assert (len(result.old_lines), result.offset) == (7, 4997)
+
+    (tmp_path / "proposal.md").write_text("".join(lines) + "tail")
+    result = diff_files(tmp_path / "live.md", tmp_path / "proposal.md")
+    assert (result.added, result.removed) == (2, 1)
+    assert list(result.unified("a", "b")) == [
+        "--- a", "+++ b",
+        "@@ -4998,7 +4998,7 @@",
+        " line 4997", " line 4998", " line 4999", "-line 5000", "+changed", " line 5001", " line 5002", " line 5003",
+        "@@ -9998,3 +9998,4 @@",
+        " line 9997", " line 9998", " line 9999", "+tail", "\\ No newline at end of file",
+    ]
+
+
+def test_gate_diff_cli(tmp_path):
+    runner = CliRunner()
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(MANIFEST)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs/requirements.md").write_text("# Req\n- R-01\n")
+    (tmp_path / ".gap/proposals/docs").mkdir(parents=True)
+    (tmp_path / ".gap/proposals/docs/requirements.md").write_text("# Req\n- R-01\n- R-02\n")
+
+    result = runner.invoke(app, ["gate", "diff", "requirements", "-m", str(manifest)])
+    assert result.exit_code == 0
+    assert "+- R-02" in result.stdout and "+1 -0" in result.stdout
+
+    (tmp_path / "docs/requirements.md").write_text("# Req\n- R-01\n- R-02\n")
+    result = runner.invoke(app, ["gate", "diff", "requirements", "-m", str(manifest)])
+    assert "identical" in result.stdout
+
+    result = runner.invoke(app, ["gate", "diff", "design", "-m", str(manifest)])
+    assert result.exit_code == 1
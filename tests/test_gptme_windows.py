@@ -0,0 +1,101 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core.flow import Task, independent_groups  # noqa: E402
+from gated_agent_tui.core.harnesses.gptme import GptmeHarness  # noqa: E402
+
+FAKE_GPTME = Path(__file__).parent / "fixtures/bin/gptme"
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "README.md").write_text("# project\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/existing.py").write_text("x = 1\n")
+    return tmp_path
+
+
+def harness(root, **kwargs):
+    return GptmeHarness(root, "test-key", model="fake/model", gptme_bin=str(FAKE_GPTME), **kwargs)
+
+
+def tasks(n):
+    return [Task(f"T-{i}", f"src/mod_{i}.py") for i in range(n)]
+
+
+def test_independent_groups_follow_files_and_dependencies():
+    ts = [
+        Task("A", "a.py"),
+        Task("B", "b.py"),
+        Task("C", "a.py"),
+        Task("D", "d.py", depends_on=["B"]),
+        Task("E", "e.py"),
+    ]
+    assert [[t.id for t in g] for g in independent_groups(ts)] == [["A", "C"], ["B", "D"], ["E"]]
+
+
+def test_windows_run_concurrently_and_merge(project, monkeypatch):
+    monkeypatch.setenv("FAKE_GPTME_SLEEP", "0.5")
+    h = harness(project, workers=4)
+    started = time.perf_counter()
+    assert h.execute(tasks(4))
+    assert time.perf_counter() - started < 1.8  # four 0.5 s windows, not run back to back
+
+    for i in range(4):
+        assert "fake gptme" in (project / f"src/mod_{i}.py").read_text()
+    run_dir = project / ".gap/windows" / h.progress.run_id
+    logs = sorted(p.name for p in run_dir.glob("*.log"))
+    assert logs == ["w001.1.log", "w001.2.log", "w001.3.log", "w001.4.log"]
+    assert not [p for p in run_dir.iterdir() if p.is_dir()]  # working copies removed
+    assert h.progress.records["T-3"]["outcome"] == "completed"
+
+
+def test_output_is_bounded_and_logged(project, monkeypatch):
+    monkeypatch.setenv("FAKE_GPTME_LINES", "500")
+    h = harness(project, workers=2, ring_lines=50)
+    runs = []
+    original = h._run_window
+    monkeypatch.setattr(h, "_run_window", lambda run, tools: (runs.append(run), original(run, tools))[1])
+    assert h.execute(tasks(2))
+
+    assert all(len(run.tail) == 50 for run in runs)
+    assert all("step 499" in run.tail[-1] for run in runs)
+    assert len(runs[0].log_path.read_text().splitlines()) == 500
+
+
+def test_leak_outside_promise_is_rejected(project, monkeypatch):
+    monkeypatch.setenv("FAKE_GPTME_LEAK", "src/existing.py")
+    h = harness(project, workers=2)
+    assert not h.execute(tasks(2))
+    assert (project / "src/existing.py").read_text() == "x = 1\n"
+    assert not (project / "src/mod_0.py").exists()  # nothing merged from a failed window set
+
+
+def test_missing_artifact_and_failed_exit(project, monkeypatch):
+    monkeypatch.setenv("FAKE_GPTME_SKIP", "src/mod_1.py")
+    assert not harness(project, workers=2).execute(tasks(2))
+    assert not (project / "src/mod_0.py").exists()
+
+    monkeypatch.delenv("FAKE_GPTME_SKIP")
+    monkeypatch.setenv("FAKE_GPTME_EXIT", "3")
+    h = harness(project, workers=2)
+    assert not h.execute(tasks(2))
+    assert h.progress.records["T-0"]["outcome"] == "failed"
+
+
+def test_sequential_in_place_mode(project, capsys):
+    h = harness(project)
+    assert h.execute(tasks(2))
+    assert (project / "src/mod_1.py").exists()
+    assert "step 4" in capsys.readouterr().out  # live feed still reaches the terminal
+
+
+def test_binary_artifacts_are_merged_verbatim(project, monkeypatch):
+    monkeypatch.setenv("FAKE_GPTME_BINARY", "1")
+    ts = [Task(f"T-{i}", f"assets/img_{i}.png") for i in range(2)]
+    assert harness(project, workers=2).execute(ts)
+    assert (project / "assets/img_1.png").read_bytes() == b"\x89PNG\r\n\x1a\n\xff\xfe\x00"
@@ -0,0 +1,152 @@
+import pytest
+from pathlib import Path
+from gap.core.inheritance import ProtocolResolver, InheritanceError
+from gap.core.path import PathManager
+
+
+def write_manifest(path: Path, body: str) -> Path:
+    path.mkdir(parents=True, exist_ok=True)
+    manifest_path = path / "manifest.yaml"
+    manifest_path.write_text(body)
+    return manifest_path
+
+
+@pytest.fixture
+def protocol_stack(tmp_path):
+    """core <- domain <- project, with templates at each level."""
+    write_manifest(tmp_path / "protocols/core", """
+kind: protocol
+name: core
+version: 1.0.0
+description: Core
+flow:
+  - step: requirements
+    artifact: docs/req.md
+  - step: design
+    artifact: docs/design.md
+    needs: [requirements]
+templates:
+  requirements: templates/requirements.md
+""")
+    (tmp_path / "protocols/core/templates").mkdir()
+    (tmp_path / "protocols/core/templates/requirements.md").write_text("# Core Req")
+    (tmp_path / "protocols/core/templates/design.md").write_text("# Core Design")
+
+    write_manifest(tmp_path / "protocols/domain", """
+kind: protocol
+name: domain
+version: 1.0.0
+description: Domain
+extends:
+  - protocol: core
+flow:
+  - step: design
+    artifact: docs/architecture.md
+    needs: [requirements]
+  - step: tasks
+    artifact: docs/tasks.md
+    needs: [design]
+""")
+    return write_manifest(tmp_path, """
+kind: project
+name: project
+version: 0.1.0
+description: Project
+extends:
+  - protocol: domain
+flow:
+  - step: review
+    artifact: docs/review.md
+    needs: [tasks]
+""")
+
+
+def test_resolve_merges_chain(protocol_stack):
+    """Child steps patch parents by id and new steps are appended in order."""
+    manifest = ProtocolResolver().resolve(protocol_stack)
+
+    assert [s.step for s in manifest.flow] == ["requirements", "design", "tasks", "review"]
+    design = next(s for s in manifest.flow if s.step == "design")
+    assert design.artifact == "docs/architecture.md"
+    assert manifest.name == "project"
+
+    # Inherited templates are pinned to the declaring protocol
+    assert Path(manifest.templates["requirements"]).exists()
+
+
+def test_resolve_is_memoized_by_chain_hash(protocol_stack, tmp_path):
+    resolver = ProtocolResolver()
+    resolver.resolve(protocol_stack)
+    assert len(resolver._merged) == 1
+
+    resolver.resolve(protocol_stack)
+    assert len(resolver._merged) == 1
+
+    # Editing any ancestor invalidates the merged entry
+    core = tmp_path / "protocols/core/manifest.yaml"
+    core.write_text(core.read_text().replace("docs/req.md", "docs/intent.md"))
+    manifest = resolver.resolve(protocol_stack)
+    assert len(resolver._merged) == 2
+    assert manifest.flow[0].artifact == "docs/intent.md"
+
+
+def test_cached_result_is_isolated(protocol_stack):
+    resolver = ProtocolResolver()
+    first = resolver.resolve(protocol_stack)
+    first.flow[0].artifact = "mutated.md"
+    assert resolver.resolve(protocol_stack).flow[0].artifact == "docs/req.md"
+
+
+def test_cycle_detection(tmp_path):
+    write_manifest(tmp_path / "a", """
+kind: protocol
+name: a
+version: 1.0.0
+description: A
+extends:
+  - protocol: ../b/manifest.yaml
+""")
+    path = write_manifest(tmp_path / "b", """
+kind: protocol
+name: b
+version: 1.0.0
+description: B
+extends:
+  - protocol: ../a/manifest.yaml
+""")
+    with pytest.raises(InheritanceError, match="Circular"):
+        ProtocolResolver().resolve(path)
+
+
+def test_missing_parent(tmp_path):
+    path = write_manifest(tmp_path, """
+kind: project
+name: orphan
+version: 0.1.0
+description: Orphan
+extends:
+  - protocol: does-not-exist
+""")
+    with pytest.raises(InheritanceError, match="not found"):
+        ProtocolResolver().resolve(path)
+
+
+def test_builtin_protocol_parent(tmp_path):
+    path = write_manifest(tmp_path, """
+kind: project
+name: course
+version: 0.1.0
+description: A course
+extends:
+  - protocol: instructional
+""")
+    manifest = ProtocolResolver().resolve(path)
+    assert any(s.step == "requirements" for s in manifest.flow)
+
+
+def test_path_manager_resolves_parent_templates(protocol_stack, tmp_path):
+    """Convention lookup walks the extends chain instead of a hardcoded fallback."""
+    manifest = ProtocolResolver().resolve(protocol_stack)
+    pm = PathManager(tmp_path)
+
+    assert pm.resolve_template(manifest, "requirements").read_text() == "# Core Req"
@@ -0,0 +1,112 @@
+import json
+import pytest
+import yaml
+from pathlib import Path
+
+from gap.core.journal import JournalVerifier, LedgerJournal
+from gap.core.ledger import YamlLedger
+from gap.core.state import StepStatus
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = YamlLedger(tmp_path)
+    ledger.update_status("requirements", StepStatus.COMPLETE, approver="alice")
+    ledger.update_status("design", StepStatus.COMPLETE, approver="bob")
+    return ledger
+
+
+def _lines(root):
+    return (root / ".gap/ledger.jsonl").read_text().splitlines()
+
+
+def test_chain_links_entries(ledger):
+    entries = [json.loads(line) for line in _lines(ledger.root)]
+    assert [e["seq"] for e in entries] == [0, 1]
+    assert entries[1]["prev"] == entries[0]["hash"]
+    assert LedgerJournal(ledger.root).head()["hash"] == entries[1]["hash"]
+
+
+def test_incremental_verify_checks_only_new_entries(ledger):
+    report = JournalVerifier(ledger.root).verify()
+    assert report.ok and (report.checked, report.total) == (2, 2)
+
+    ledger.update_status("tasks", StepStatus.COMPLETE)
+    ledger.log_exception({"session_id": "s-1", "digest": "abc"})
+    report = JournalVerifier(ledger.root).verify()
+    assert report.ok and (report.checked, report.total) == (2, 4)
+
+    report = JournalVerifier(ledger.root).verify()
+    assert report.ok and report.checked == 0
+
+
+def test_edited_status_yaml_is_detected(ledger):
+    JournalVerifier(ledger.root).verify()
+    path = ledger.root / ".gap/status.yaml"
+    data = yaml.safe_load(path.read_text())
+    data["steps"]["design"]["approver"] = "mallory"
+    path.write_text(yaml.safe_dump(data))
+
+    report = JournalVerifier(ledger.root).verify()
+    assert not report.ok
+    assert "'design'" in report.errors[0]
+
+
+def test_edited_journal_line_is_detected(ledger):
+    ledger.update_status("tasks", StepStatus.COMPLETE)
+    JournalVerifier(ledger.root).verify()
+
+    path = ledger.root / ".gap/ledger.jsonl"
+    lines = _lines(ledger.root)
+    lines[0] = lines[0].replace("alice", "mallory")
+    path.write_text("\n".join(lines) + "\n")
+
+    # history before the verified tail is only re-read by a full pass
+    assert not JournalVerifier(ledger.root).verify(full=True).ok
+
+    lines = _lines(ledger.root)
+    lines[-1] = lines[-1].replace("user", "mallory")
+    path.write_text("\n".join(lines) + "\n")
+    report = JournalVerifier(ledger.root).verify()
+    assert not report.ok and "rewritten" in report.errors[0]
+
+
+def test_existing_status_is_imported_as_genesis(tmp_path):
+    (tmp_path / ".gap").mkdir()
+    (tmp_path / ".gap/status.yaml").write_text(yaml.safe_dump(
+        {"steps": {"requirements": {"status": "complete", "timestamp": "2025-01-01T00:00:00", "approver": "user"}}}
+    ))
+    YamlLedger(tmp_path).update_status("design", StepStatus.COMPLETE)
+
+    entries = [json.loads(line) for line in _lines(tmp_path)]
+    assert [e["type"] for e in entries] == ["import", "step"]
+    report = JournalVerifier(tmp_path).verify()
+    assert report.ok and report.total == 2
+
+
+def test_edited_or_forged_exception_is_detected(ledger):
+    ledger.log_exception({"session_id": "s-1", "digest": "abc", "allow": ["docs/**"]})
+    assert JournalVerifier(ledger.root).verify().ok
+
+    path = ledger.root / ".gap/status.yaml"
+    original = path.read_text()
+    data = yaml.safe_load(original)
+    data["exceptions"][0]["allow"] = ["**"]
+    path.write_text(yaml.safe_dump(data))
+    report = JournalVerifier(ledger.root).verify(full=True)
+    assert not report.ok and "session 's-1'" in report.errors[0]
+
+    data = yaml.safe_load(original)
+    data["exceptions"].append({"session_id": "evil", "digest": "x", "allow": ["**"]})
+    path.write_text(yaml.safe_dump(data))
+    report = JournalVerifier(ledger.root).verify()
+    assert not report.ok and "session 'evil'" in report.errors[0]
+
+
+def test_existing_exceptions_are_imported(tmp_path):
+    (tmp_path / ".gap").mkdir()
+    (tmp_path / ".gap/status.yaml").write_text(yaml.safe_dump(
+        {"exceptions": [{"session_id": "s-0", "digest": "d", "timestamp": "2025-01-01T00:00:00"}]}
+    ))
+    YamlLedger(tmp_path).update_status("design", StepStatus.COMPLETE)
+    assert JournalVerifier(tmp_path).verify().ok
@@ -0,0 +1,132 @@
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core.flow import Task  # noqa: E402
+from gated_agent_tui.core.harnesses.legacy import LegacyHarness  # noqa: E402
+
+
+class StubClient:
+    """Stands in for AsyncOpenAI: answers every prompt after `delay` seconds, or raises if `fail`."""
+    def __init__(self, delay=0.0, fail=False):
+        self.chat = SimpleNamespace(completions=self)
+        self.delay = delay
+        self.fail = fail
+        self.calls = []  # (task id, start, end)
+
+    async def create(self, model, messages, **kwargs):
+        started = time.monotonic()
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        task_id = re.search(r"Your current task is: (\S+)", messages[-1]["content"]).group(1)
+        self.calls.append((task_id, started, time.monotonic()))
+        message = SimpleNamespace(content="# generated\n")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    async def close(self):
+        pass
+
+
+def harness(root, client, **kwargs):
+    h = LegacyHarness(root, "test-key", **kwargs)
+    h.llm.aclient = client
+    return h
+
+
+def tasks(n):
+    return [Task(f"T-{i}", f"src/f{i}.py") for i in range(n)]
+
+
+def test_generation_failure_publishes_nothing_and_resume_reruns(tmp_path):
+    h = harness(tmp_path, StubClient(fail=True), concurrency=2)
+    assert not h.execute(tasks(2))
+    assert not (tmp_path / "src").exists()
+    assert {r["outcome"] for r in h.progress.records.values()} == {"failed"}
+
+    client = StubClient()
+    resumed = harness(tmp_path, client, concurrency=2, resume=True)
+    assert resumed.execute(tasks(2))
+    assert len(client.calls) == 2
+    assert (tmp_path / "src/f1.py").read_text() == "# generated\n"
+
+
+def spans(client):
+    return {task_id: (start, end) for task_id, start, end in client.calls}
+
+
+def test_independent_tasks_of_a_wave_overlap(tmp_path):
+    client = StubClient(delay=0.2)
+    h = harness(tmp_path, client, concurrency=4)
+    started = time.monotonic()
+    assert h.execute(tasks(4))
+    assert time.monotonic() - started < 0.6  # four 0.2 s calls, not run back to back
+
+    windows = spans(client).values()
+    assert max(start for start, _ in windows) < min(end for _, end in windows)
+    assert {t["wave"] for t in h.timings.values()} == {1}
+
+
+def test_shared_files_and_dependencies_start_later_waves(tmp_path):
+    client = StubClient(delay=0.05)
+    ts = [
+        Task("A", "src/a.py"),
+        Task("B", "src/b.py"),
+        Task("C", "src/a.py"),                  # same file as A
+        Task("D", "src/d.py", depends_on=["B"]),
+    ]
+    h = harness(tmp_path, client, concurrency=4)
+    assert h.execute(ts)
+
+    assert {tid: t["wave"] for tid, t in h.timings.items()} == {"A": 1, "B": 1, "C": 2, "D": 2}
+    calls = spans(client)
+    assert calls["C"][0] >= calls["A"][1] and calls["D"][0] >= calls["B"][1]
+
+
+def test_checkpoint_window_is_published_before_the_next_starts(tmp_path):
+    client = StubClient(delay=0.05)
+    h = harness(tmp_path, client, concurrency=4)
+    seen = {}
+
+    def ask_human(task_id, context=""):
+        seen["published"] = sorted(p.name for p in (tmp_path / "src").iterdir())
+        seen["generated"] = [c[0] for c in client.calls]
+        return "y"
+
+    h.interaction.ask_human = ask_human
+    assert h.execute(tasks(4), checkpoints=["T-2"])
+    assert seen == {"published": ["f0.py", "f1.py"], "generated": ["T-0", "T-1"]}
+    assert spans(client)["T-2"][0] > max(end for tid, (_, end) in spans(client).items() if tid in ("T-0", "T-1"))
+
+
+def test_halting_at_a_checkpoint_runs_nothing_after_it(tmp_path):
+    client = StubClient()
+    h = harness(tmp_path, client, concurrency=2)
+    h.interaction.ask_human = lambda task_id, context="": "n"
+    assert not h.execute(tasks(3), checkpoints=["T-1"])
+    assert sorted(spans(client)) == ["T-0"]
+    assert not (tmp_path / "src/f1.py").exists()
+
+
+def test_acl_violation_rolls_back_its_whole_window(tmp_path):
+    client = StubClient()
+    h = harness(tmp_path, client, concurrency=4)
+    h.bridge.acl_whitelist = {"src/f0.py", "src/f1.py", "src/f2.py"}
+    h.interaction.ask_human = lambda task_id, context="": "y"
+    ts = tasks(3) + [Task("T-9", "secrets/token.txt")]
+
+    assert not h.execute(ts, checkpoints=["T-1"])
+    assert (tmp_path / "src/f0.py").exists()  # earlier window was already published
+    assert not (tmp_path / "src/f1.py").exists() and not (tmp_path / "src/f2.py").exists()
+    assert not (tmp_path / "secrets").exists()
+    assert h.progress.records["T-0"]["outcome"] == "completed"
+    assert {h.progress.records[t]["outcome"] for t in ("T-1", "T-2", "T-9")} == {"failed"}
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from gap.core import log_index
+from gap.core.log_index import LogIndex
+from gap.core.session_log import SessionLog
+
+
+def write_session(root, session_id, count, start=0, **kwargs):
+    log = SessionLog(root, session_id=session_id, **kwargs)
+    base = datetime(2026, 1, 1)
+    for i in range(start, start + count):
+        log.log({
+            "type": "human_interaction" if i % 10 == 0 else "llm_interaction",
+            "task_id": f"T-{i % 3}",
+            "n": i,
+            "timestamp": (base + timedelta(seconds=i)).isoformat(),
+        })
+    log.close()
+
+
+def test_query_filters(tmp_path):
+    write_session(tmp_path, "alpha", 100)
+    write_session(tmp_path, "beta", 20, start=100)
+    index = LogIndex(tmp_path / ".gap/sessions")
+    assert index.update() == 120
+
+    assert len(list(index.query(session="beta"))) == 20
+    human = list(index.query(type="human_interaction"))
+    assert [e["n"] for e in human] == list(range(0, 120, 10))
+    assert all(e["task_id"] == "T-1" for e in index.query(task_id="T-1"))
+
+    window = list(index.query(since=datetime(2026, 1, 1, 0, 0, 10), until=datetime(2026, 1, 1, 0, 0, 19)))
+    assert [e["n"] for e in window] == list(range(10, 20))
+    assert len(list(index.query(limit=5))) == 5
+    index.close()
+
+
+def test_incremental_update(tmp_path):
+    write_session(tmp_path, "alpha", 50)
+    index = LogIndex(tmp_path / ".gap/sessions")
+    assert index.update() == 50
+    assert index.update() == 0
+
+    write_session(tmp_path, "alpha", 10, start=50)
+    assert index.update() == 10
+    assert [e["n"] for e in index.query(session="alpha")] == list(range(60))
+    index.close()
+
+
+def test_rotated_segments_are_indexed(tmp_path):
+    write_session(tmp_path, "alpha", 500, max_bytes=4096, batch_size=8)
+    index = LogIndex(tmp_path / ".gap/sessions")
+    index.update()
+    assert [e["n"] for e in index.query(session="alpha")] == list(range(500))
+    assert index.sessions()[0][:2] == ("alpha", 500)
+    index.close()
+
+
+def test_compressed_segments_are_read_forward_only(tmp_path, monkeypatch):
+    # Timestamps run backwards, so time order is the reverse of file order.
+    log = SessionLog(tmp_path, session_id="alpha", max_bytes=4096, batch_size=8)
+    for i in range(300):
+        log.log({"type": "llm_interaction", "n": i, "timestamp": (datetime(2026, 1, 1) - timedelta(seconds=i)).isoformat()})
+    log.close()
+    index = LogIndex(tmp_path / ".gap/sessions")
+    index.update()
+
+    seeks = {}
+    real_open = log_index._open_segment
+
+    def recording_open(path):
+        f = real_open(path)
+        real_seek = f.seek
+        f.seek = lambda offset, *a: (seeks.setdefault(path.name, []).append(offset), real_seek(offset, *a))[1]
+        return f
+
+    monkeypatch.setattr(log_index, "_open_segment", recording_open)
+    assert [e["n"] for e in index.query()] == list(range(299, -1, -1))
+    gz = [offsets for name, offsets in seeks.items() if name.endswith(".gz")]
+    assert gz and all(offsets == sorted(offsets) for offsets in gz)
+    index.close()
@@ -0,0 +1,108 @@
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core.manifest import Step
+from gap.core.merkle import MerkleTree, expand_artifact
+from gap.main import app
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - step: requirements
+    artifact: docs/requirements.md
+  - step: implementation
+    artifact: src/*
+    gate: false
+    needs: [requirements]
+"""
+
+REQUIREMENTS = Step(step="requirements", artifact="docs/requirements.md")
+IMPLEMENTATION = Step(step="implementation", artifact="src/**/*.py", gate=False)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs/requirements.md").write_text("# Req\n")
+    for i in range(3):
+        (tmp_path / f"src/pkg_{i}").mkdir(parents=True)
+        for j in range(3):
+            (tmp_path / f"src/pkg_{i}/mod_{j}.py").write_text(f"x = {i}{j}\n")
+    return tmp_path
+
+
+def _sealed(root):
+    tree = MerkleTree(root)
+    tree.seal(REQUIREMENTS)
+    tree.seal(IMPLEMENTATION)
+    tree.save()
+    return MerkleTree.load(root)
+
+
+def test_expand_artifact(project):
+    assert expand_artifact(project, "docs/requirements.md") == ["docs/requirements.md"]
+    assert len(expand_artifact(project, "src/**/*.py")) == 9
+    assert len(expand_artifact(project, "src")) == 9
+    assert expand_artifact(project, "missing.md") == []
+
+
+def test_root_hash_is_independent_of_seal_order(project):
+    tree = _sealed(project)
+    other = MerkleTree(project)
+    other.seal(IMPLEMENTATION)
+    other.seal(REQUIREMENTS)
+    assert tree.root_hash == other.root_hash
+    assert len(tree.files) == 10
+
+
+def test_verify_intact_and_touched(project):
+    tree = _sealed(project)
+    result = tree.verify()
+    assert result.intact and result.rehashed == 0
+
+    (project / "src/pkg_1/mod_1.py").write_text("x = 11\n")  # same content, new mtime
+    result = tree.verify()
+    assert result.intact and result.rehashed == 1
+    assert tree.stale_stats
+
+
+def test_verify_descends_into_changed_subtrees(project):
+    tree = _sealed(project)
+    (project / "src/pkg_1/mod_1.py").write_text("x = 'tampered'\n")
+    (project / "src/pkg_2/mod_0.py").unlink()
+    (project / "src/pkg_0/new.py").write_text("y = 1\n")
+
+    result = tree.verify()
+    assert not result.intact
+    assert result.modified == ["src/pkg_1/mod_1.py"]
+    assert result.removed == ["src/pkg_2/mod_0.py"]
+    assert result.added == ["src/pkg_0/new.py"]
+    assert result.visited == 4  # src + three changed packages; docs/ is never entered
+
+    # resealing accepts the new state
+    assert tree.seal(IMPLEMENTATION) == ["src/pkg_0/new.py", "src/pkg_1/mod_1.py", "src/pkg_2/mod_0.py"]
+    assert tree.verify().intact
+
+
+def test_gate_approve_seals_and_status_verifies(tmp_path):
+    runner = CliRunner()
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(MANIFEST)
+    (tmp_path / ".gap/proposals/docs").mkdir(parents=True)
+    (tmp_path / ".gap/proposals/docs/requirements.md").write_text("# Req\n")
+
+    result = runner.invoke(app, ["check", "status", str(manifest), "--verify"])
+    assert result.exit_code == 0 and "no sealed artifacts" in result.stdout
+
+    assert runner.invoke(app, ["gate", "approve", "requirements", "-m", str(manifest)]).exit_code == 0
+    result = runner.invoke(app, ["check", "status", str(manifest), "--verify"])
+    assert result.exit_code == 0 and "intact" in result.stdout
+
+    (tmp_path / "docs/requirements.md").write_text("# Req (edited)\n")
+    result = runner.invoke(app, ["check", "status", str(manifest), "--verify"])
+    assert result.exit_code == 1
+    assert "modified docs/requirements.md" in " ".join(result.stdout.split())
@@ -0,0 +1,155 @@
+import pytest
+from pathlib import Path
+from gap.core.ledger import YamlLedger
+from gap.core import policy as policy_module
+from gap.core.policy import PolicyEngine, PolicyResolver, get_policy_engine
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - class: alignment
+    steps:
+      - step: requirements
+        artifact: docs/requirements.md
+  - class: execution
+    steps:
+      - step: execution
+        artifact: docs/walkthrough.md
+        needs: [requirements]
+execution:
+  mode: gated
+  task_granularity:
+    max_scope: file
+  checkpoints:
+    strategy: explicit
+    after_tasks: ["T-02"]
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "manifest.yaml").write_text(MANIFEST)
+    (tmp_path / ".gap/acls").mkdir(parents=True)
+    (tmp_path / ".gap/acls/execution.yaml").write_text('allow_write:\n  - "src/**/*.py"\n  - docs/walkthrough.md\n')
+    return tmp_path
+
+
+def test_decision_phase_denies_direct_writes(project):
+    engine = PolicyEngine(project, ttl=0)
+    assert engine.current_phase() == "requirements"
+    assert not engine.is_execution_phase()
+    assert not engine.can_write("docs/requirements.md")
+    assert not engine.can_write("src/app.py")
+
+
+def test_execution_phase_uses_phase_acl(project):
+    (project / "docs").mkdir()
+    (project / "docs/requirements.md").write_text("# Req")
+    engine = PolicyEngine(project, ttl=0)
+
+    assert engine.current_phase() == "execution"
+    assert engine.is_execution_phase()
+    assert engine.can_write("src/app.py")
+    assert engine.can_write("src/pkg/./mod.py")
+    assert not engine.can_write("setup.py")
+    assert not engine.can_write("../src/app.py")
+
+    policy = engine.effective_policy()
+    assert (policy.mode, policy.task_granularity, policy.phase) == ("gated", "file", "execution")
+    assert engine.should_pause("T-02") and not engine.should_pause("T-01")
+
+
+def test_snapshot_is_reused_until_a_source_changes(project):
+    (project / "docs").mkdir()
+    (project / "docs/requirements.md").write_text("# Req")
+    engine = PolicyEngine(project, ttl=0)
+    first = engine.snapshot()
+    assert engine.snapshot() is first
+
+    (project / ".gap/acls/execution.yaml").write_text("allow_write:\n  - setup.py\n")
+    assert engine.can_write("setup.py")
+    assert not engine.can_write("src/app.py")
+    assert engine.snapshot() is not first
+
+
+def test_ttl_defers_revalidation(project):
+    engine = PolicyEngine(project, ttl=3600)
+    assert engine.current_phase() == "requirements"
+    (project / "docs").mkdir()
+    (project / "docs/requirements.md").write_text("# Req")
+    assert engine.current_phase() == "requirements"  # cached
+    assert engine.snapshot(force=True).phase == "execution"
+
+
+def test_missing_manifest_and_registry(tmp_path, project):
+    with pytest.raises(FileNotFoundError):
+        PolicyEngine(tmp_path / "nowhere").current_phase()
+    assert get_policy_engine(project) is get_policy_engine(Path(str(project)))
+
+
+def _declare_session(root, exceptions, session_id="sprint_01"):
+    (root / ".gap/gap.yaml").write_text(f'active_session: "{session_id}"\n')
+    config = root / ".gap/sessions" / session_id / "config.yaml"
+    config.parent.mkdir(parents=True, exist_ok=True)
+    config.write_text(f"session_id: {session_id}\nexecution_exceptions:\n{exceptions}")
+    return config
+
+
+def test_resolver_without_session_is_project_law(project):
+    resolver = PolicyResolver(project, ttl=0)
+    policy = resolver.effective_policy()
+    assert (policy.mode, policy.session_id) == ("gated", None)
+    assert resolver.checkpoints(["T-01", "T-02"]) == ["T-02"]
+    assert YamlLedger(project).get_exceptions() == []
+
+
+def test_session_exceptions_override_law_and_are_logged_once(project):
+    config = _declare_session(project, "  mode: autonomous\n  checkpoints:\n    strategy: every\n")
+    resolver = PolicyResolver(project, ttl=0)
+
+    policy = resolver.effective_policy()
+    assert (policy.mode, policy.task_granularity, policy.session_id) == ("autonomous", "file", "sprint_01")
+    assert resolver.should_pause("T-01") and resolver.should_pause("T-99")
+
+    first = resolver.resolve()
+    assert resolver.resolve() is first
+    assert PolicyResolver(project, ttl=0).resolve().policy.mode == "autonomous"  # second process, same declaration
+
+    entries = YamlLedger(project).get_exceptions("sprint_01")
+    assert len(entries) == 1
+    assert entries[0]["defaults"]["mode"] == "gated"
+    assert entries[0]["effective"]["checkpoint_strategy"] == "every"
+
+    config.write_text("execution_exceptions:\n  checkpoints:\n    strategy: none\n")
+    assert not resolver.should_pause("T-02")
+    assert resolver.resolve() is not first
+    assert len(YamlLedger(project).get_exceptions("sprint_01")) == 2
+
+
+def test_resolver_logs_to_the_configured_ledger(project, monkeypatch):
+    _declare_session(project, "  mode: autonomous\n")
+    requested = []
+
+    def fake_get_ledger(root, manifest):
+        requested.append(manifest.name)
+        return YamlLedger(root)
+
+    monkeypatch.setattr(policy_module, "get_ledger", fake_get_ledger)
+    PolicyResolver(project, ttl=0).resolve()
+    assert len(requested) == 1
+    assert len(YamlLedger(project).get_exceptions("sprint_01")) == 1
+
+
+def test_engine_applies_session_exceptions(project):
+    (project / "docs").mkdir()
+    (project / "docs/requirements.md").write_text("# Req")
+    engine = PolicyEngine(project, ttl=0)
+    assert not engine.should_pause("T-03")
+
+    _declare_session(project, "  checkpoints:\n    after_tasks: [T-03]\n")
+    assert engine.should_pause("T-03") and not engine.should_pause("T-02")
+    policy = engine.effective_policy()
+    assert (policy.session_id, policy.phase, policy.after_tasks) == ("sprint_01", "execution", ["T-03"])
@@ -0,0 +1,76 @@
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core.proposals import ProposalStore
+from gap.main import app
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - step: requirements
+    artifact: docs/requirements.md
+"""
+
+
+def _objects(root):
+    return sorted(p for p in (root / ".gap/objects").rglob("*") if p.is_file())
+
+
+def test_identical_drafts_are_stored_once(tmp_path):
+    store = ProposalStore(tmp_path)
+    sha, written = store.propose("requirements", "docs/requirements.md", b"# Req\n")
+    assert written
+    assert (tmp_path / ".gap/proposals/docs/requirements.md").read_bytes() == b"# Req\n"
+
+    assert store.propose("requirements", "docs/requirements.md", b"# Req\n") == (sha, False)
+    store.propose("design", "docs/design.md", b"# Req\n")
+    assert len(_objects(tmp_path)) == 1
+    assert store.get(sha) == b"# Req\n"
+    assert len(store.history("requirements")) == 1
+
+
+def test_history_keeps_regenerations_and_hand_edits(tmp_path):
+    store = ProposalStore(tmp_path)
+    first, _ = store.propose("requirements", "docs/requirements.md", b"v1\n")
+    (tmp_path / ".gap/proposals/docs/requirements.md").write_bytes(b"v1, edited\n")
+    second, _ = store.propose("requirements", "docs/requirements.md", b"v2\n")
+
+    drafts = store.history("requirements")
+    assert [d["source"] for d in drafts] == ["scribe", "edit", "scribe"]
+    assert drafts[-1]["sha256"] == second == store.current("requirements", "docs/requirements.md")
+    assert store.get(drafts[1]["sha256"]) == b"v1, edited\n"
+
+    store.restore("requirements", "docs/requirements.md", store.resolve("requirements", first[:8]))
+    assert (tmp_path / ".gap/proposals/docs/requirements.md").read_bytes() == b"v1\n"
+    with pytest.raises(KeyError):
+        store.resolve("requirements", "ffff")
+
+
+def test_shared_object_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("GAP_OBJECT_STORE", str(tmp_path / "shared"))
+    ProposalStore(tmp_path / "a").propose("requirements", "docs/requirements.md", b"same\n")
+    ProposalStore(tmp_path / "b").propose("requirements", "docs/requirements.md", b"same\n")
+    assert len([p for p in (tmp_path / "shared").rglob("*") if p.is_file()]) == 1
+
+
+def test_scribe_reports_already_proposed(tmp_path):
+    runner = CliRunner()
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(MANIFEST)
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates/requirements.md").write_text("# {{ project_name }} requirements\n")
+
+    result = runner.invoke(app, ["scribe", "create", "requirements", "-m", str(manifest), "--force"], input="")
+    assert result.exit_code == 0 and "Proposal written" in result.stdout
+    result = runner.invoke(app, ["scribe", "create", "requirements", "-m", str(manifest), "--force", "--no-cache"], input="")
+    assert result.exit_code == 0 and "Already proposed" in result.stdout
+
+    result = runner.invoke(app, ["gate", "history", "requirements", "-m", str(manifest)])
+    assert result.stdout.count(" scribe ") == 1
+
+    assert runner.invoke(app, ["gate", "approve", "requirements", "-m", str(manifest)]).exit_code == 0
+    assert (tmp_path / "docs/requirements.md").read_text() == "# demo requirements"
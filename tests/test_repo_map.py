@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.agent import context  # noqa: E402
+from gated_agent_tui.agent.context import ContextManager  # noqa: E402
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/a.py").write_text("class Alpha:\n    def run(self, n):\n        pass\n")
+    (tmp_path / "src/b.py").write_text("class Beta:\n    pass\n")
+    return tmp_path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Records the files handed to parse_source."""
+    calls = []
+    original = context.parse_source
+
+    def counting(path):
+        calls.append(Path(path).name)
+        return original(path)
+
+    monkeypatch.setattr(context, "parse_source", counting)
+    return calls
+
+
+def _key(rel):
+    return os.path.join(*rel.split("/"))
+
+
+def test_unchanged_files_are_reused_from_the_cache(project, parsed):
+    symbols = ContextManager(project).refresh_symbols()
+    assert sorted(parsed) == ["a.py", "b.py"]
+    assert symbols[_key("src/a.py")]["symbols"] == ["  class Alpha:", "    def run(n)"]
+
+    parsed.clear()
+    cache_file = project / ".gap/cache/repo_map.json"
+    before = cache_file.stat().st_mtime_ns
+    assert ContextManager(project).refresh_symbols() == symbols  # fresh instance reads repo_map.json
+    assert parsed == []
+    assert cache_file.stat().st_mtime_ns == before
+
+
+def test_edited_files_are_reparsed(project, parsed):
+    ContextManager(project).refresh_symbols()
+    parsed.clear()
+
+    (project / "src/b.py").write_text("class Beta:\n    def stop(self):\n        pass\n")
+    st = (project / "src/a.py").stat()
+    os.utime(project / "src/a.py", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # touched, same size
+
+    symbols = ContextManager(project).refresh_symbols()
+    assert sorted(parsed) == ["a.py", "b.py"]
+    assert symbols[_key("src/b.py")]["symbols"] == ["  class Beta:", "    def stop()"]
+
+
+def test_deleted_files_are_pruned(project):
+    ContextManager(project).refresh_symbols()
+    (project / "src/b.py").unlink()
+
+    symbols = ContextManager(project).refresh_symbols()
+    assert list(symbols) == [_key("src/a.py")]
+    assert list(json.loads((project / ".gap/cache/repo_map.json").read_text())) == [_key("src/a.py")]
+
+
+def test_skip_dirs_are_not_walked(project, monkeypatch):
+    for d in context.SKIP_DIRS:
+        (project / d).mkdir(exist_ok=True)
+        (project / d / "vendored.py").write_text("def hidden():\n    pass\n")
+
+    walked = []
+    original = os.walk
+
+    def recording_walk(top, *args, **kwargs):
+        for base, dirs, files in original(top, *args, **kwargs):
+            walked.append(Path(base).name)
+            yield base, dirs, files
+
+    monkeypatch.setattr(context.os, "walk", recording_walk)
+    symbols = ContextManager(project).refresh_symbols()
+    assert sorted(symbols) == [_key("src/a.py"), _key("src/b.py")]
+    assert not set(walked) & context.SKIP_DIRS
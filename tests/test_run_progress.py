@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core.flow import Task  # noqa: E402
+from gated_agent_tui.core.progress import RunProgress  # noqa: E402
+
+
+def make_tasks(root, n=3):
+    tasks = [Task(f"T-{i}", f"src/f{i}.py") for i in range(n)]
+    (root / "src").mkdir()
+    for t in tasks:
+        (root / t.file).write_text(f"# {t.id}\n")
+    return tasks
+
+
+def test_resume_skips_unchanged_completed_tasks(tmp_path):
+    tasks = make_tasks(tmp_path)
+    progress = RunProgress(tmp_path, "legacy")
+    progress.start()
+    progress.record(tasks[:2], "completed")
+    progress.record(tasks[2:], "failed")
+
+    resumed = RunProgress(tmp_path, "legacy")
+    resumed.start(resume=True)
+    fresh = [Task(t.id, t.file) for t in tasks]
+    assert [t.id for t in resumed.remaining(fresh)] == ["T-2"]
+    assert fresh[0].status == "completed"
+
+
+def test_changed_or_missing_artifact_is_rerun(tmp_path):
+    tasks = make_tasks(tmp_path)
+    progress = RunProgress(tmp_path, "legacy")
+    progress.start()
+    progress.record(tasks, "completed")
+
+    (tmp_path / "src/f0.py").write_text("# edited by hand\n")
+    (tmp_path / "src/f1.py").unlink()
+    # Same content, new mtime: the hash decides.
+    st = (tmp_path / "src/f2.py").stat()
+    os.utime(tmp_path / "src/f2.py", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    resumed = RunProgress(tmp_path, "legacy")
+    resumed.start(resume=True)
+    assert [t.id for t in resumed.remaining(tasks)] == ["T-0", "T-1"]
+
+
+def test_start_compacts_to_latest_outcome(tmp_path):
+    tasks = make_tasks(tmp_path, n=1)
+    progress = RunProgress(tmp_path, "gptme")
+    for outcome in ("failed", "failed", "completed"):
+        progress.start()
+        progress.record(tasks, outcome)
+
+    progress.start()
+    lines = progress.path.read_text().splitlines()
+    assert len(lines) == 2  # one task line + the new run marker
+    assert progress.records["T-0"]["outcome"] == "completed"
+
+
+def test_multi_file_task_reruns_if_any_artifact_changed(tmp_path):
+    (tmp_path / "src").mkdir()
+    for name in ("a.py", "b.py"):
+        (tmp_path / "src" / name).write_text(f"# {name}\n")
+    task = Task("T-0", "src/a.py", files=["src/a.py", "src/b.py"])
+    progress = RunProgress(tmp_path, "legacy")
+    progress.start()
+    progress.record([task], "completed")
+
+    resumed = RunProgress(tmp_path, "legacy")
+    resumed.start(resume=True)
+    assert resumed.remaining([task.copy()]) == []
+
+    (tmp_path / "src/b.py").write_text("# edited by hand\n")
+    assert [t.id for t in resumed.remaining([task.copy()])] == ["T-0"]
+    (tmp_path / "src/b.py").unlink()
+    assert [t.id for t in resumed.remaining([task.copy()])] == ["T-0"]
+
+
+def test_single_file_entries_from_older_runs_still_resume(tmp_path):
+    task = make_tasks(tmp_path, n=1)[0]
+    progress = RunProgress(tmp_path, "legacy")
+    progress.start()
+    progress.record([task], "completed")
+    entry = progress.records["T-0"]
+    legacy = {k: v for k, v in entry.items() if k != "artifacts"}
+    legacy.update(entry["artifacts"]["src/f0.py"])
+    progress.path.write_text(json.dumps(legacy) + "\n")
+
+    resumed = RunProgress(tmp_path, "legacy")
+    resumed.start(resume=True)
+    assert resumed.remaining([task]) == []
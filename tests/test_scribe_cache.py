@@ -0,0 +1,72 @@
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core.scribe_cache import ScribeCache
+from gap.main import app
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - step: requirements
+    artifact: docs/requirements.md
+  - step: notes
+    artifact: docs/notes.md
+    gate: false
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "manifest.yaml").write_text(MANIFEST)
+    templates = tmp_path / "templates"
+    (templates / "partials").mkdir(parents=True)
+    (templates / "requirements.md").write_text('# {{ project_name }}\n{% include "partials/footer.md" %}\n')
+    (templates / "notes.md").write_text("Notes for {{ step_name }}: {{ topic }}\n")
+    (templates / "partials/footer.md").write_text("-- footer v1\n")
+    return tmp_path
+
+
+def _scribe(root, step, data=""):
+    return CliRunner().invoke(app, ["scribe", "create", step, "-m", str(root / "manifest.yaml"), "--force"], input=data)
+
+
+def test_key_covers_template_dependencies_and_data(project):
+    template = project / "templates/requirements.md"
+    cache = ScribeCache(project)
+    key = cache.key(template, {"a": 1}, "docs/requirements.md", True)
+    assert key == cache.key(template, {"a": 1}, "docs/requirements.md", True)
+    assert key != cache.key(template, {"a": 2}, "docs/requirements.md", True)
+
+    (project / "templates/partials/footer.md").write_text("-- footer v2\n")
+    assert key != ScribeCache(project).key(template, {"a": 1}, "docs/requirements.md", True)
+
+    template.write_text("{% include name %}\n")
+    assert cache.key(template, {"a": 1}, "docs/requirements.md", True) is None
+
+
+def test_rescribing_unchanged_inputs_is_a_cache_hit(project):
+    assert "Proposal written" in _scribe(project, "requirements").stdout
+    assert "Cache hit" in _scribe(project, "requirements").stdout
+
+    (project / "templates/partials/footer.md").write_text("-- footer v2\n")
+    assert "Proposal written" in _scribe(project, "requirements").stdout
+
+    runner = CliRunner()
+    assert runner.invoke(app, ["gate", "approve", "requirements", "-m", str(project / "manifest.yaml")]).exit_code == 0
+    result = _scribe(project, "requirements")
+    assert "Cache hit" in result.stdout and "up to date" in result.stdout
+    assert not (project / ".gap/proposals/docs/requirements.md").exists()
+
+
+def test_live_steps_and_input_data(project):
+    assert "Scribed to Live" in _scribe(project, "notes", '{"topic": "cache"}').stdout
+    assert "Cache hit" in _scribe(project, "notes", '{"topic": "cache"}').stdout
+    assert "Scribed to Live" in _scribe(project, "notes", '{"topic": "keys"}').stdout
+
+    # a hand edit to the live artifact is not masked by the cache
+    (project / "docs/notes.md").write_text("edited\n")
+    assert "Scribed to Live" in _scribe(project, "notes", '{"topic": "keys"}').stdout
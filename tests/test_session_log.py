@@ -0,0 +1,69 @@
+import gzip
+import json
+import pytest
+from gap.core.session_log import SessionLog, get_session_log, segment_paths
+
+
+def read_entries(log: SessionLog):
+    entries = []
+    for path in segment_paths(log.log_dir, log.session_id):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            entries.extend(json.loads(line) for line in f)
+    return entries
+
+
+def test_entries_are_batched_and_flushed(tmp_path):
+    log = SessionLog(tmp_path, session_id="s1")
+    for i in range(500):
+        log.log({"type": "llm_interaction", "n": i})
+    log.flush()
+
+    entries = read_entries(log)
+    assert [e["n"] for e in entries] == list(range(500))
+    assert all(e["session_id"] == "s1" and "timestamp" in e for e in entries)
+    log.close()
+
+
+def test_caller_entry_is_not_mutated(tmp_path):
+    log = SessionLog(tmp_path, session_id="s2")
+    entry = {"type": "human_interaction"}
+    log.log(entry)
+    log.close()
+    assert entry == {"type": "human_interaction"}
+
+
+def test_rotation_compresses_closed_segments(tmp_path):
+    log = SessionLog(tmp_path, session_id="s3", max_bytes=4096, batch_size=16)
+    for i in range(1000):
+        log.log({"type": "llm_interaction", "n": i, "prompt": "x" * 40})
+    log.close()
+
+    segments = segment_paths(log.log_dir, "s3")
+    assert len(segments) > 2
+    assert all(p.name.endswith(".gz") for p in segments[:-1])
+    assert [e["n"] for e in read_entries(log)] == list(range(1000))
+
+
+def test_shared_session_per_root(tmp_path):
+    a = get_session_log(tmp_path)
+    b = get_session_log(tmp_path)
+    assert a is b
+    a.close()
+    assert get_session_log(tmp_path) is not a
+
+
+def test_invalid_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        SessionLog(tmp_path, fsync="sometimes")
+
+
+def test_writer_failure_is_raised_not_hung(tmp_path):
+    (tmp_path / ".gap").write_text("not a directory")
+    log = SessionLog(tmp_path, session_id="s4")
+    log.log({"type": "llm_interaction"})
+    with pytest.raises(RuntimeError, match="writer failed"):
+        log.flush()
+    with pytest.raises(RuntimeError, match="writer failed"):
+        log.log({"type": "llm_interaction"})
+    log.close()
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.agent.spec_context import (  # noqa: E402
+    MAX_CHUNK_TOKENS,
+    BM25Index,
+    SpecContextBuilder,
+    chunk_markdown,
+)
+
+SPEC = """# Overview
+The service stores invoices.
+
+## Billing
+Invoices are billed monthly. Billing retries failed payments.
+
+## Auth
+Users log in with tokens.
+"""
+
+
+def test_chunks_follow_headings_and_split_oversized_sections():
+    chunks = chunk_markdown("design.md", SPEC)
+    assert [c.text.splitlines()[0] for c in chunks] == ["# Overview", "## Billing", "## Auth"]
+    assert [c.order for c in chunks] == [0, 1, 2]
+
+    paragraph = "word " * 200 + "\n\n"
+    big = chunk_markdown("big.md", "# Big\n" + paragraph * 6)
+    assert len(big) > 1
+    assert all(c.tokens <= MAX_CHUNK_TOKENS + 10 for c in big)
+
+
+def test_bm25_ranks_the_most_relevant_chunk_first():
+    index = BM25Index(chunk_markdown("design.md", SPEC))
+    ranked = [c.text.splitlines()[0] for _, c in index.score("billing retries")]
+    assert ranked == ["## Billing"]
+    ranked = [c.text.splitlines()[0] for _, c in index.score("invoices tokens")]
+    assert set(ranked) == {"# Overview", "## Billing", "## Auth"}
+    assert index.score("nothing matches") == []
+
+
+def test_build_packs_ranked_chunks_within_budget(tmp_path):
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "design.md").write_text(SPEC)
+    (specs / "notes.md").write_text("# Notes\n" + "filler text " * 100 + "\n")
+    builder = SpecContextBuilder(specs, token_budget=10_000)
+
+    everything = builder.build("billing")
+    assert everything.index("--- SPEC: design.md ---") < everything.index("--- SPEC: notes.md ---")
+
+    small = builder.build("billing", token_budget=40)
+    assert "## Billing" in small and "# Notes" not in small
+    assert len(small) // 4 <= 40
+    assert builder.build("billing", token_budget=0) == ""
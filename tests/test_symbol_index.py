@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.agent.context import ContextManager  # noqa: E402
+from gated_agent_tui.agent.symbol_index import SymbolIndex, split_identifier, to_match_query  # noqa: E402
+
+
+def _has_fts5() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _has_fts5(), reason="SQLite built without FTS5")
+
+BILLING = '''
+class InvoiceBilling:
+    """Charges customers."""
+    def charge(self, amount):
+        """Bills the invoice amount."""
+
+
+def send_email(to):
+    """Notifies about the invoice."""
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/billing.py").write_text(BILLING)
+    (tmp_path / "src/util.py").write_text('def slugify(text):\n    """Makes a slug."""\n')
+    return tmp_path
+
+
+def _names(hits):
+    return [h["name"] for h in hits]
+
+
+def test_identifiers_are_split_for_search():
+    assert split_identifier("GatedLLM.log_session") == "gated llm log session"
+    assert to_match_query("Wire InvoiceBilling") == '"wire"* OR "invoice"* OR "billing"*'
+
+
+def test_name_matches_outrank_docstring_matches(project):
+    hits = ContextManager(project).query_symbols("invoice")
+    assert _names(hits)[0] == "InvoiceBilling"
+    assert "send_email" in _names(hits)  # docstring-only match, ranked below
+    assert _names(hits).index("send_email") > 0
+    assert hits[0]["path"] == os.path.join("src", "billing.py") and hits[0]["line"] == 2
+
+
+def test_sync_reindexes_only_changed_and_drops_deleted_files(project):
+    cm = ContextManager(project)
+    index = SymbolIndex(cm.index_path)
+    assert index.sync(cm.refresh_symbols()) == 2
+    assert index.sync(cm.refresh_symbols()) == 0
+
+    (project / "src/util.py").write_text('def slugify_title(text):\n    """Makes a longer slug."""\n')
+    assert index.sync(cm.refresh_symbols()) == 1
+    assert _names(index.search("slugify")) == ["slugify_title"]
+
+    (project / "src/billing.py").unlink()
+    assert index.sync(cm.refresh_symbols()) == 1
+    assert index.search("invoice") == []
+    index.close()
+
+
+def test_unsynced_queries_reuse_the_last_sync(project):
+    cm = ContextManager(project)
+    cm.sync_index()
+    (project / "src/new.py").write_text("def invoice_report():\n    pass\n")
+    assert "invoice_report" not in _names(cm.query_symbols("invoice", sync=False))
+    assert "invoice_report" in _names(cm.query_symbols("invoice"))
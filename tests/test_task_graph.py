@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core import flow  # noqa: E402
+from gated_agent_tui.core.flow import Task, TaskGraphError, load_task_graph, parse_tasks, partition_independent  # noqa: E402
+
+TASKS = """# Tasks
+
+## Phase 1: Bootstrap
+- [x] T-01: Create entry point (File: src/main.py)
+- [ ] T-02: Wire config (File: `src/config.py`) (Depends: T-01)
+- [ ] T-03: Ship it (Files: a.py, b.py) (Checkpoint)
+    - Depends: T-02, T-01
+- [ ] Not a task line because it has no id
+
+## Phase 2: Polish
+- [~] T-04: Docs (File: README.md) (After: T-99)
+- [-] T-05: Dropped (File: x.py)
+* [ ] T-06: Planning only
+"""
+
+
+def write(tmp_path, text=TASKS):
+    path = tmp_path / "tasks.md"
+    path.write_text(text)
+    return path
+
+
+def test_graph_fields(tmp_path):
+    graph = load_task_graph(write(tmp_path))
+    assert list(graph.tasks) == ["T-01", "T-02", "T-03", "T-04", "T-05", "T-06"]
+
+    t1, t2, t3, t4, t5, t6 = graph
+    assert (t1.status, t1.file, t1.phase) == ("completed", "src/main.py", "Phase 1: Bootstrap")
+    assert t2.file == "src/config.py" and t2.depends_on == ["T-01"]
+    assert t3.files == ["a.py", "b.py"] and t3.file == "a.py"
+    assert t3.depends_on == ["T-02", "T-01"] and t3.checkpoint
+    assert t3.title == "Ship it"
+    assert (t4.status, t4.phase) == ("in_progress", "Phase 2: Polish")
+    assert t5.status == "skipped"
+    assert t6.file is None
+
+    assert graph.checkpoints == ["T-03"]
+    assert graph.missing_dependencies() == [("T-04", "T-99")]
+    assert graph.phases["Phase 2: Polish"] == ["T-04", "T-05", "T-06"]
+
+
+def test_parse_tasks_returns_runnable_pending(tmp_path):
+    tasks = parse_tasks(write(tmp_path))
+    assert [t.id for t in tasks] == ["T-02", "T-03", "T-04"]
+
+
+def test_topological_order_and_cycles(tmp_path):
+    text = "- [ ] B: b (File: b) (Depends: A)\n- [ ] A: a (File: a)\n- [ ] C: c (File: c)\n"
+    graph = load_task_graph(write(tmp_path, text))
+    assert [t.id for t in graph.topological_order()] == ["A", "B", "C"]
+
+    cyclic = "- [ ] A: a (Depends: B)\n- [ ] B: b (Depends: A)\n- [ ] C: c\n"
+    with pytest.raises(TaskGraphError, match="A, B"):
+        load_task_graph(write(tmp_path, cyclic)).topological_order()
+
+
+def test_cache_returns_independent_copies(tmp_path):
+    path = write(tmp_path)
+    first = load_task_graph(path)
+    first.get("T-02").status = "completed"
+
+    second = load_task_graph(path)
+    assert second.digest == first.digest
+    assert second.get("T-02").status == "pending"
+
+    path.write_text(TASKS.replace("- [ ] T-02", "- [x] T-02"))
+    assert load_task_graph(path).get("T-02").status == "completed"
+
+
+def test_cache_keeps_only_the_latest_graph_per_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(flow, "_stat_cache", {})
+    monkeypatch.setattr(flow, "_graph_cache", {})
+    path = write(tmp_path)
+    shared = tmp_path / "copy"
+    shared.mkdir()
+    write(shared)  # same content: shares the parsed graph
+
+    for i in range(5):
+        path.write_text(TASKS + f"- [ ] T-1{i}: Extra (File: e{i}.py)\n")
+        load_task_graph(path)
+        load_task_graph(shared / "tasks.md")
+    assert len(flow._graph_cache) == 2
+
+    path.write_text(TASKS)
+    assert load_task_graph(path).digest == load_task_graph(shared / "tasks.md").digest
+    assert len(flow._graph_cache) == 1
+
+
+def test_missing_file_is_empty(tmp_path):
+    assert len(load_task_graph(tmp_path / "nope.md")) == 0
+
+
+def test_partition_independent_waves():
+    tasks = [
+        Task("A", "a.py"),
+        Task("B", "b.py"),
+        Task("C", "a.py"),                      # same file as A -> after A
+        Task("D", "d.py", depends_on=["B"]),    # depends on B -> after B
+        Task("E", "e.py", depends_on=["Z"]),    # unknown dependency is ignored
+        Task("F", "f.py", depends_on=["C"]),
+    ]
+    waves = [[t.id for t in wave] for wave in partition_independent(tasks)]
+    assert waves == [["A", "B", "E"], ["C", "D"], ["F"]]
+
+    for wave in partition_independent(tasks):
+        files = [f for t in wave for f in t.files]
+        assert len(files) == len(set(files))
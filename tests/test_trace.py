@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+
+import pytest
+
+from gap.core import trace
+from gap.core.trace import NOOP_SPAN, Tracer, span, trace_target, traced
+
+
+@pytest.fixture
+def tracer():
+    t = trace.get_tracer()
+    was_enabled = t.enabled
+    t.reset()
+    trace.enable()
+    yield t
+    t.enabled = was_enabled
+    t.reset()
+
+
+def test_disabled_spans_are_noops():
+    t = Tracer(enabled=False)
+    with t.span("x", bytes=10) as s:
+        s.set(tokens=5)
+    assert s is NOOP_SPAN
+    assert t.events == []
+
+
+@pytest.mark.parametrize("value, target", [
+    (None, None), ("", None), ("0", None), ("false", None), ("Off", None),
+    ("1", ""), ("true", ""), ("YES", ""),
+    ("out/run.trace.json", "out/run.trace.json"),
+])
+def test_gap_trace_flags_and_paths(value, target):
+    assert trace_target(value) == target
+
+
+def test_spans_and_decorator_record_durations_and_attributes(tracer):
+    @traced("work", cat="test")
+    def work():
+        time.sleep(0.01)
+        return 42
+
+    assert work() == 42
+    with span("llm.chat", cat="llm", model="m") as s:
+        s.set(tokens=120)
+    with span("llm.chat", cat="llm") as s:
+        s.set(tokens=30)
+
+    names = [e[0] for e in tracer.events]
+    assert names == ["work", "llm.chat", "llm.chat"]
+
+    rows = {r["name"]: r for r in tracer.summary()}
+    assert rows["work"]["calls"] == 1 and rows["work"]["total"] >= 0.01
+    assert rows["llm.chat"]["calls"] == 2 and rows["llm.chat"]["tokens"] == 150
+    assert "llm.chat" in tracer.format_summary()
+
+
+def test_errors_are_tagged_and_reraised(tracer):
+    with pytest.raises(ValueError):
+        with span("boom"):
+            raise ValueError("x")
+    assert tracer.events[-1][-1] == {"error": "ValueError"}
+
+
+def test_chrome_trace_export(tracer, tmp_path):
+    def worker(i):
+        with span("write", cat="io", bytes=i):
+            time.sleep(0.001)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    path = tracer.write_chrome_trace(tmp_path / "out/trace.json")
+    data = json.loads(path.read_text())
+    events = data["traceEvents"]
+    assert len(events) == 4
+    assert {e["ph"] for e in events} == {"X"}
+    assert all(e["dur"] >= 1000 for e in events)  # microseconds
+    assert len({e["tid"] for e in events}) == 4
+    assert sorted(e["args"]["bytes"] for e in events) == [0, 1, 2, 3]
@@ -0,0 +1,183 @@
+import random
+
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from gap.core.manifest import load_manifest
+from gap.core.traceability import TraceabilityAuditor, tokenize
+from gap.main import app
+
+MANIFEST = """
+kind: project
+name: demo
+version: 0.1.0
+description: Demo
+flow:
+  - step: requirements
+    artifact: docs/requirements.md
+  - step: design
+    artifact: docs/design.md
+    needs: [requirements]
+  - step: tasks
+    artifact: docs/tasks.md
+    needs: [design]
+"""
+
+REQUIREMENTS = """# Requirements
+*   **R-01**: THE system SHALL log in.
+*   **R-02**: THE system SHALL log out.
+"""
+
+DESIGN = """# Design
+*   **P-01**: Sessions are signed. — *(Validates: R-01, R-02)*
+*   **P-02**: Tokens expire.
+    - *Validates: R-07*
+*   **P-03**: Unlinked property.
+"""
+
+TASKS = """# Tasks
+- [ ] T-01: Sign sessions
+  - File: src/session.py
+  - **Traces to**: P-01
+- [ ] T-02: Expire tokens (Traces to: P-02, R-02)
+- [ ] T-03: Stray task
+  - Depends: T-01
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "manifest.yaml").write_text(MANIFEST)
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "requirements.md").write_text(REQUIREMENTS)
+    (docs / "design.md").write_text(DESIGN)
+    (docs / "tasks.md").write_text(TASKS)
+    return tmp_path
+
+
+def _audit(root, **kwargs):
+    return TraceabilityAuditor(root, load_manifest(root / "manifest.yaml"), **kwargs)
+
+
+def test_tokenize_attributes_citations_to_blocks():
+    index = tokenize(TASKS)
+    assert index.defs == {"T-01": [2], "T-02": [5], "T-03": [6]}
+    assert index.cites == [("T-01", "traces", "P-01", 4), ("T-02", "traces", "P-02", 5), ("T-02", "traces", "R-02", 5)]
+    assert tokenize("<!-- id: G-ALPHA -->\nHTTP-2 is not an ID\n").defs == {"G-ALPHA": [1]}
+
+
+def test_audit_rules(project):
+    violations = _audit(project).audit()
+    found = {(v.rule, v.subject, v.target) for v in violations}
+    assert found == {
+        ("unknown_citation", "P-02", "R-07"),
+        ("orphan", "P-03", None),
+        ("orphan", "T-03", None),
+    }
+    error = next(v for v in violations if v.severity == "error")
+    assert (error.path, error.line) == ("docs/design.md", 4)
+
+
+def test_index_cache_skips_unchanged_files(project):
+    first = _audit(project)
+    first.audit()
+    assert first.stats["tokenized"] == 3
+    assert (project / ".gap/cache/trace.json").exists()
+
+    second = _audit(project)
+    assert len(second.audit()) == 3
+    assert second.stats["tokenized"] == 0
+
+    # same content, new mtime: hash matches, no re-tokenization
+    (project / "docs/design.md").write_text(DESIGN)
+    (project / "docs/tasks.md").write_text(TASKS.replace("Stray task", "Stray task (Traces to: R-01)"))
+    third = _audit(project)
+    assert {v.subject for v in third.audit()} == {"P-02", "P-03"}
+    assert third.stats["tokenized"] == 1
+
+
+def test_cli(project):
+    result = CliRunner().invoke(app, ["check", "trace", str(project / "manifest.yaml")])
+    assert result.exit_code == 1
+    assert "cites unknown ID: 'R-07'" in result.stdout
+
+    (project / "docs/design.md").write_text(DESIGN.replace("R-07", "R-02"))
+    result = CliRunner().invoke(app, ["check", "trace", str(project / "manifest.yaml")])
+    assert result.exit_code == 0, result.stdout
+    assert "2 warnings" in result.stdout
+
+
+def test_incremental_recheck_reports_delta(project):
+    _audit(project).audit()
+
+    # T-03 gains a link, P-02's bad citation is fixed by adding R-07, a new bad citation appears
+    (project / "docs/requirements.md").write_text(REQUIREMENTS + "*   **R-07**: THE system SHALL rotate keys.\n")
+    (project / "docs/tasks.md").write_text(
+        "# Tasks\n\n" + TASKS.replace("Stray task", "Stray task (Traces to: P-01)")
+        .replace("- [ ] T-01", "- [ ] T-04: New (Traces to: P-99)\n- [ ] T-01")
+    )
+    auditor = _audit(project)
+    violations = auditor.audit()
+
+    assert auditor.stats["incremental"]
+    assert auditor.stats["rechecked"] < 10
+    assert {v.key for v in violations} == {v.key for v in _audit(project, use_cache=False).audit()}
+    assert {(v.rule, v.subject, v.target) for v in auditor.new} == {("unknown_citation", "T-04", "P-99")}
+    assert {(v.rule, v.subject) for v in auditor.resolved} == {("unknown_citation", "P-02"), ("orphan", "T-03")}
+
+    again = _audit(project)
+    assert len(again.audit()) == len(violations)
+    assert (again.stats["rechecked"], again.new, again.resolved) == (0, [], [])
+
+
+def test_removing_a_property_rechecks_its_citers(project):
+    _audit(project).audit()
+    (project / "docs/design.md").write_text(DESIGN.replace("*   **P-01**", "*   **P-11**"))
+    auditor = _audit(project)
+    auditor.audit()
+    assert {(v.subject, v.target) for v in auditor.new} == {("T-01", "P-01")}
+
+
+def test_carried_violations_follow_shifted_lines(project):
+    _audit(project).audit()
+    (project / "docs/design.md").write_text("\n\n" + DESIGN)
+    auditor = _audit(project)
+    violations = auditor.audit()
+    assert (auditor.stats["rechecked"], auditor.new, auditor.resolved) == (0, [], [])
+    lines = {v.subject: v.line for v in violations if v.path == "docs/design.md"}
+    assert lines == {"P-02": 6, "P-03": 7}
+    assert "design.md:6" in next(v.message for v in violations if v.subject == "P-02")
+
+
+def test_repeated_citations_are_tracked_as_a_multiset(project):
+    tasks = project / "docs/tasks.md"
+    tasks.write_text(TASKS + "- [ ] T-09: Repeats (Traces to: R-01)\n  - Traces to: T-01\n  - Traces to: T-01\n")
+    _audit(project).audit()
+
+    tasks.write_text(TASKS + "- [ ] T-09: Repeats (Traces to: R-01)\n  - Traces to: R-01\n\n  - Traces to: T-01\n")
+    auditor = _audit(project)
+    violations = auditor.audit()
+    expected = _audit(project, use_cache=False).audit()
+    assert sorted((v.key, v.line) for v in violations) == sorted((v.key, v.line) for v in expected)
+    assert [(v.subject, v.target) for v in auditor.resolved] == [("T-09", "T-01")]
+    assert auditor.new == []
+
+
+def test_incremental_matches_full_audit_under_random_edits(project):
+    rng = random.Random(3)
+    pools = {"requirements": ["R-01"], "design": ["R-01", "R-02", "R-09"], "tasks": ["R-01", "P-01", "P-02", "T-01"]}
+    prefixes = {"requirements": "R", "design": "P", "tasks": "T"}
+    for _ in range(60):
+        step = rng.choice(list(prefixes))
+        lines = ["# Doc"]
+        for _ in range(rng.randint(1, 5)):
+            lines.append(f"- [ ] {prefixes[step]}-0{rng.randint(1, 4)}: item")
+            for _ in range(rng.randint(0, 2)):
+                lines.append(f"  - Traces to: {rng.choice(pools[step])}")
+        (project / f"docs/{step}.md").write_text("\n".join(lines) + "\n")
+
+        got = _audit(project).audit()
+        expected = _audit(project, use_cache=False).audit()
+        assert sorted((v.key, v.line, v.message) for v in got) == sorted((v.key, v.line, v.message) for v in expected)
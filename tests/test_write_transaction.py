@@ -0,0 +1,95 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "reference_implementation"))
+from gated_agent_tui.core.bridge import FileSystemBridge  # noqa: E402
+
+
+@pytest.fixture
+def bridge(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/a.py").write_text("old a\n")
+    return FileSystemBridge(tmp_path, acl_whitelist={"src/**"})
+
+
+def _staging(root):
+    return root / ".gap/staging"
+
+
+def test_commit_publishes_and_close_cleans_staging(bridge):
+    with bridge.transaction(fsync=False) as tx:
+        tx.write("src/a.py", "new a\n")
+        tx.write("src/pkg/b.py", "new b\n")
+    assert tx.state == "closed"
+    assert (bridge.root / "src/a.py").read_text() == "new a\n"
+    assert (bridge.root / "src/pkg/b.py").read_text() == "new b\n"
+    assert not (_staging(bridge.root) / tx.id).exists()
+
+
+def test_blocked_path_is_rejected_before_staging(bridge):
+    tx = bridge.transaction(fsync=False)
+    assert tx.write("src/a.py", "new a\n")
+    assert not tx.write("secrets.env", "KEY=1\n")
+    assert not tx.write("../outside.py", "x\n")
+    assert not (tx.staging / "new/secrets.env").exists()
+
+    assert not tx.commit()
+    assert tx.state == "rolled_back"
+    assert (bridge.root / "src/a.py").read_text() == "old a\n"
+    assert not (bridge.root / "secrets.env").exists()
+    tx.close()
+    assert not tx.staging.exists()
+
+
+def test_failed_publish_restores_previous_tree(bridge, monkeypatch):
+    (bridge.root / "src/c.py").write_text("old c\n")
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if Path(dst) == bridge.root / "src/c.py" and "/new/" in str(src):
+            raise OSError("disk full")
+        return real_replace(src, dst)
+
+    tx = bridge.transaction(fsync=False)
+    tx.write("src/a.py", "new a\n")
+    tx.write("src/new_dir/b.py", "new b\n")
+    tx.write("src/c.py", "new c\n")
+    monkeypatch.setattr(os, "replace", failing_replace)
+    assert not tx.commit()
+    monkeypatch.undo()
+
+    assert tx.state == "rolled_back"
+    assert (bridge.root / "src/a.py").read_text() == "old a\n"
+    assert (bridge.root / "src/c.py").read_text() == "old c\n"
+    assert not (bridge.root / "src/new_dir").exists()
+    tx.close()
+    assert not tx.staging.exists()
+
+
+def test_rollback_after_commit_undoes_it(bridge):
+    tx = bridge.transaction(fsync=False)
+    tx.write("src/a.py", "new a\n")
+    tx.write("src/pkg/b.py", "new b\n")
+    assert tx.commit()
+    assert (bridge.root / "src/a.py").read_text() == "new a\n"
+
+    tx.rollback()
+    assert (bridge.root / "src/a.py").read_text() == "old a\n"
+    assert not (bridge.root / "src/pkg").exists()
+    tx.close()
+    assert tx.state == "rolled_back"
+    assert not tx.staging.exists()
+
+
+def test_exception_in_block_rolls_back(bridge):
+    with pytest.raises(RuntimeError):
+        with bridge.transaction(fsync=False) as tx:
+            tx.write("src/a.py", "new a\n")
+            raise RuntimeError("agent crashed")
+    assert (bridge.root / "src/a.py").read_text() == "old a\n"
+    assert not tx.staging.exists()
+    with pytest.raises(RuntimeError):
+        tx.write("src/a.py", "again\n")